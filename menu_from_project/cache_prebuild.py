@@ -0,0 +1,254 @@
+#! python3  # noqa: E265
+
+"""
+Prebuild project menu caches without QGIS interface, at deploy time or in nightly
+jobs, so that the first QGIS launch on a workstation doesn't read the projects.
+
+Run with QGIS Python environment, the folder containing the plugin in PYTHONPATH:
+
+.. code-block:: bash
+
+    # projects of an exported QGIS settings file
+    QT_QPA_PLATFORM=offscreen python -m menu_from_project.cache_prebuild \\
+        --settings QGIS3.ini
+    # projects from their URI, cache written in a shared cache directory
+    QT_QPA_PLATFORM=offscreen python -m menu_from_project.cache_prebuild \\
+        https://example.com/catalog.qgz --cache-dir /mnt/share/menu_from_project
+
+Projects are identified by their id in settings, the cache of a project given
+only by its URI uses an id computed from the URI. Such a cache is only found in a
+shared cache directory, where it is looked up by project URI: local caches of a
+workstation use ids of its settings.
+
+Remote projects are downloaded or exported in the profile running the prebuild:
+their paths are stored relative to the project download directory, and resolved
+in the profile of the workstation using the cache.
+"""
+
+# Standard library
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+# PyQGIS
+from qgis.core import QgsApplication, QgsSettings
+from qgis.PyQt.QtCore import QSettings
+
+# project
+from menu_from_project.datamodel.project import Project, ProjectCacheConfig
+from menu_from_project.datamodel.project_config import MenuGroupConfig
+from menu_from_project.logic.cache_manager import CacheManager, get_uri_project_id
+from menu_from_project.logic.cache_store import CACHE_STORAGE_SQLITE, get_cache_store
+from menu_from_project.logic.embedded_groups import EmbeddedGroupConfigs
+from menu_from_project.logic.project_load import (
+    download_remote_files,
+    load_project_config,
+    read_cache_validations,
+)
+from menu_from_project.logic.qgs_manager import document_cache
+from menu_from_project.logic.tools import guess_type_from_uri
+from menu_from_project.toolbelt.preferences import (
+    PlgOptionsManager,
+    PlgSettingsStructure,
+)
+
+# ############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+@dataclass
+class PrebuildResult:
+    """Result of a project cache prebuild"""
+
+    project: Project
+    duration: float
+    nb_layers: int = 0
+    error: str = ""
+
+
+# ############################################################################
+# ########## Functions #############
+# ##################################
+
+
+def get_uri_project(uri: str) -> Project:
+    """Create a project from its URI, with an id computed from the URI
+
+    :param uri: project URI
+    :type uri: str
+    :return: project with cache enabled
+    :rtype: Project
+    """
+    return Project(
+        id=get_uri_project_id(uri),
+        name=Path(uri).stem,
+        location="new",
+        file=uri,
+        type_storage=guess_type_from_uri(uri),
+        cache_config=ProjectCacheConfig(enable=True),
+    )
+
+
+def count_layers(group_config: MenuGroupConfig) -> int:
+    """Return number of layers in a group and its subgroups
+
+    :param group_config: group configuration
+    :type group_config: MenuGroupConfig
+    :return: number of layers
+    :rtype: int
+    """
+    return sum(
+        count_layers(child) if isinstance(child, MenuGroupConfig) else 1
+        for child in group_config.childs
+    )
+
+
+def prebuild_caches(
+    projects: List[Project],
+    settings: PlgSettingsStructure,
+    cache_dir: Optional[Path] = None,
+    max_workers: Optional[int] = None,
+    force: bool = False,
+) -> List[PrebuildResult]:
+    """Build the cache of projects in parallel. An up to date cache is kept unless
+    a rebuild is forced.
+
+    :param projects: projects to cache
+    :type projects: List[Project]
+    :param settings: plugin settings
+    :type settings: PlgSettingsStructure
+    :param cache_dir: directory of project cache files, defaults to the cache \
+    directory of current QGIS profile (or SQLite store if enabled in settings)
+    :type cache_dir: Optional[Path], optional
+    :param max_workers: number of projects read concurrently, defaults to settings
+    :type max_workers: Optional[int], optional
+    :param force: rebuild caches even if up to date, defaults to False
+    :type force: bool, optional
+    :return: prebuild result of each project, in projects order
+    :rtype: List[PrebuildResult]
+    """
+    cache_store = None
+    if cache_dir is None and settings.cache_storage == CACHE_STORAGE_SQLITE:
+        cache_store = get_cache_store()
+    if force:
+        cache_manager = CacheManager(None, cache_store=cache_store, cache_dir=cache_dir)
+        for project in projects:
+            cache_manager.clear_project_cache(project)
+
+    downloaded_files = download_remote_files(projects)
+    embedded_groups = EmbeddedGroupConfigs()
+    cache_validations = read_cache_validations(projects, downloaded_files)
+
+    def prebuild_cache(project: Project) -> PrebuildResult:
+        start = time.perf_counter()
+        try:
+            project_config = load_project_config(
+                project,
+                settings,
+                downloaded_files.get(project.id),
+                embedded_groups,
+                cache_store,
+                cache_dir,
+                cache_validations,
+            )
+        except Exception as e:
+            return PrebuildResult(project, time.perf_counter() - start, error=str(e))
+        if not project_config:
+            return PrebuildResult(
+                project,
+                time.perf_counter() - start,
+                error="can't define project configuration",
+            )
+        return PrebuildResult(
+            project,
+            time.perf_counter() - start,
+            nb_layers=count_layers(project_config.root_group),
+        )
+
+    with ThreadPoolExecutor(
+        max_workers=max(1, max_workers or settings.load_max_workers)
+    ) as executor:
+        return list(executor.map(prebuild_cache, projects))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Prebuild project caches from command line
+
+    :param argv: command line arguments, defaults to sys.argv
+    :type argv: Optional[List[str]], optional
+    :return: exit code, 1 if a project cache can't be built
+    :rtype: int
+    """
+    parser = argparse.ArgumentParser(
+        description="Prebuild project menu caches without QGIS interface.",
+        epilog="A project URI not found in settings gets an id computed from the "
+        "URI. Workstations only find its cache in a shared cache directory "
+        "(--cache-dir), where caches are also looked up by project URI.",
+    )
+    parser.add_argument("uris", nargs="*", help="project URIs, all projects if empty")
+    parser.add_argument(
+        "--settings", type=Path, help="exported QGIS settings (INI file)"
+    )
+    parser.add_argument("--cache-dir", type=Path, help="cache directory")
+    parser.add_argument("--workers", type=int, help="projects read concurrently")
+    parser.add_argument(
+        "--force", action="store_true", help="rebuild caches even if up to date"
+    )
+    args = parser.parse_args(argv)
+
+    app = None
+    if QgsApplication.instance() is None:
+        app = QgsApplication([], False)
+        app.initQgis()
+
+    try:
+        settings = PlgOptionsManager.get_plg_settings(
+            QgsSettings(str(args.settings), QSettings.Format.IniFormat)
+            if args.settings
+            else None
+        )
+        document_cache.set_max_bytes(settings.document_cache_max_size_mb * 1024 * 1024)
+
+        projects = [project for project in settings.projects if project.valid]
+        if args.uris:
+            projects_by_uri = {project.file: project for project in projects}
+            projects = [
+                projects_by_uri.get(uri) or get_uri_project(uri) for uri in args.uris
+            ]
+
+        start = time.perf_counter()
+        results = prebuild_caches(
+            projects, settings, args.cache_dir, args.workers, args.force
+        )
+        duration = time.perf_counter() - start
+    finally:
+        if app:
+            app.exitQgis()
+
+    for result in results:
+        if result.error:
+            status = f"ERROR {result.error}"
+        else:
+            status = f"{result.nb_layers} layers"
+        print(
+            f"{result.duration:8.2f} s  {result.project.name} "
+            f"({result.project.id}) : {status}"
+        )
+    nb_errors = sum(1 for result in results if result.error)
+    print(
+        f"{len(results)} projects in {duration:.2f} s "
+        f"(sum of project times {sum(result.duration for result in results):.2f} s)"
+        f", {nb_errors} errors"
+    )
+    return 1 if nb_errors else 0
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    raise SystemExit(main())
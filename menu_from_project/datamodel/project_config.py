@@ -1,6 +1,8 @@
 # standard
+import threading
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from functools import cached_property
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 # PyQGIS
 from qgis.core import QgsMapLayerType, QgsWkbTypes
@@ -27,6 +29,20 @@ class MenuLayerConfig:
     version: str = ""
     format: str = ""
 
+    def __post_init__(self) -> None:
+        # Tooltip resolved for current metadata sources, not part of configuration
+        self.resolved_tooltip: Optional[LayerTooltip] = None
+
+
+@dataclass(frozen=True)
+class LayerTooltip:
+    """Layer title, abstract and tooltip resolved from layer metadata sources."""
+
+    source_md: Tuple[str, ...]
+    title: str
+    abstract: str
+    tooltip: str
+
 
 @dataclass
 class MenuGroupConfig:
@@ -57,6 +73,53 @@ class MenuGroupConfig:
                 layer_dict[layer.version] = [layer]
         return layer_dict
 
+    @cached_property
+    def layer_index(self) -> Dict[str, List[MenuLayerConfig]]:
+        """Layer configurations of the group childs by name, computed once.
+        Childs must not be modified afterwards.
+
+        :return: dict of layer configuration list by name, in childs order
+        :rtype: Dict[str, List[MenuLayerConfig]]
+        """
+        layer_index = {}
+        for child in self.childs:
+            if isinstance(child, MenuLayerConfig):
+                if child.name in layer_index:
+                    layer_index[child.name].append(child)
+                else:
+                    layer_index[child.name] = [child]
+        return layer_index
+
+    @cached_property
+    def layer_versions(self) -> Dict[str, Dict[str, List[MenuLayerConfig]]]:
+        """Layer configurations by version of layer names available several times
+        in the group childs (several versions or formats), computed once
+
+        :return: dict of layer list by version, by layer name
+        :rtype: Dict[str, Dict[str, List[MenuLayerConfig]]]
+        """
+        return {
+            name: self.sort_layer_list_by_version(layer_name_list)
+            for name, layer_name_list in self.layer_index.items()
+            if len(layer_name_list) > 1
+        }
+
+    @cached_property
+    def menu_childs(self) -> List[Any]:
+        """Childs displayed for the group: subgroups and first layer configuration
+        of each layer name, in childs order, computed once
+
+        :return: list of MenuLayerConfig and MenuGroupConfig
+        :rtype: List[Any]
+        """
+        layer_index = self.layer_index
+        return [
+            child
+            for child in self.childs
+            if not isinstance(child, MenuLayerConfig)
+            or layer_index[child.name][0] is child
+        ]
+
     def get_layer_configs_from_name(self, name: str) -> List[MenuLayerConfig]:
         """Get layer configurations by name
 
@@ -66,37 +129,150 @@ class MenuGroupConfig:
         :return: list of layer configuration
         :rtype: List[MenuLayerConfig]
         """
-        return [
-            layer
-            for layer in self.childs
-            if isinstance(layer, MenuLayerConfig) and layer.name == name
-        ]
+        return self.layer_index.get(name, [])
 
     @classmethod
-    def from_dict(cls, data: dict) -> "MenuGroupConfig":
+    def from_dict(cls, data: dict, lazy: bool = False) -> "MenuGroupConfig":
         """Convert dictionary data into MenuGroupConfig object.
 
         :param data: input data , typiclly loaded from a JSON file.
         :type data: dict
+        :param lazy: subgroups childs are converted on first access, defaults to False
+        :type lazy: bool, optional
 
         :return: MenuGroupConfig dataclass instanciated
         :rtype: MenuGroupConfig
         """
-        childs = []
-        for child in data["childs"]:
-            if "childs" in child:
-                childs.append(cls.from_dict(child))
-            else:
-                childs.append(MenuLayerConfig(**child))
         res = cls(
             name=data["name"],
             filename=data["filename"],
             embedded=data["embedded"],
-            childs=childs,
+            childs=childs_from_dict(data["childs"], lazy),
         )
         return res
 
 
+class LazyMenuGroupConfig(MenuGroupConfig):
+    """Group configuration whose childs are decoded from their cached source on
+    first access, when a menu or a browser item of the group is opened.
+
+    Two groups not yet decoded are compared with their source.
+
+    :param name: group name
+    :type name: str
+    :param filename: project filename
+    :type filename: str
+    :param embedded: True if group is embedded from another project
+    :type embedded: bool
+    :param source: cached childs, as stored in cache
+    :type source: Any
+    :param decode_childs: function returning childs from source
+    :type decode_childs: Callable[[Any], List[Any]]
+    """
+
+    # Childs can be accessed from menus (main thread) and browser (populate thread)
+    _decode_lock = threading.Lock()
+
+    def __init__(
+        self,
+        name: str,
+        filename: str,
+        embedded: bool,
+        source: Any,
+        decode_childs: Callable[[Any], List[Any]],
+    ) -> None:
+        self.name = name
+        self.filename = filename
+        self.embedded = embedded
+        self.source = source
+        self.decode_childs = decode_childs
+        self._childs: Optional[List[Any]] = None
+
+    @property
+    def loaded(self) -> bool:
+        """True if childs are decoded"""
+        return self._childs is not None
+
+    @property
+    def childs(self) -> List[Any]:
+        """Childs of the group, decoded on first access"""
+        if self._childs is None:
+            with self._decode_lock:
+                if self._childs is None:
+                    self._childs = self.decode_childs(self.source)
+                    # Source is no longer needed
+                    self.source = None
+        return self._childs
+
+    @childs.setter
+    def childs(self, childs: List[Any]) -> None:
+        self._childs = childs
+        self.source = None
+        for index in ("layer_index", "layer_versions", "menu_childs"):
+            self.__dict__.pop(index, None)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, MenuGroupConfig):
+            return NotImplemented
+        if (self.name, self.filename, self.embedded) != (
+            other.name,
+            other.filename,
+            other.embedded,
+        ):
+            return False
+        if (
+            isinstance(other, LazyMenuGroupConfig)
+            and not self.loaded
+            and not other.loaded
+            and self.decode_childs is other.decode_childs
+        ):
+            return self.source == other.source
+        return self.childs == other.childs
+
+
+def childs_from_dict(data: List[dict], lazy: bool = False) -> List[Any]:
+    """Convert dictionary data into group childs
+
+    :param data: childs data, typically loaded from a JSON file.
+    :type data: List[dict]
+    :param lazy: subgroups childs are converted on first access, defaults to False
+    :type lazy: bool, optional
+
+    :return: list of MenuLayerConfig and MenuGroupConfig
+    :rtype: List[Any]
+    """
+    childs = []
+    for child in data:
+        if "childs" not in child:
+            childs.append(MenuLayerConfig(**child))
+        elif lazy:
+            childs.append(
+                LazyMenuGroupConfig(
+                    name=child["name"],
+                    filename=child["filename"],
+                    embedded=child["embedded"],
+                    source=child["childs"],
+                    decode_childs=lazy_childs_from_dict,
+                )
+            )
+        else:
+            childs.append(MenuGroupConfig.from_dict(child))
+    return childs
+
+
+def lazy_childs_from_dict(data: List[dict]) -> List[Any]:
+    """Convert dictionary data into group childs, subgroups childs are converted on
+    first access
+
+    :param data: childs data, typically loaded from a JSON file.
+    :type data: List[dict]
+
+    :return: list of MenuLayerConfig and MenuGroupConfig
+    :rtype: List[Any]
+    """
+    return childs_from_dict(data, lazy=True)
+
+
 @dataclass
 class MenuProjectConfig:
     """Class to store configuration for project menu creation."""
@@ -107,11 +283,14 @@ class MenuProjectConfig:
     root_group: MenuGroupConfig
 
     @classmethod
-    def from_dict(cls, data: dict) -> "MenuProjectConfig":
+    def from_dict(cls, data: dict, lazy: bool = False) -> "MenuProjectConfig":
         """Convert dictionary data into MenuProjectConfig object.
 
         :param data: input data , typiclly loaded from a JSON file.
         :type data: dict
+        :param lazy: only top-level groups are converted, childs of subgroups are \
+        converted on first access, defaults to False
+        :type lazy: bool, optional
 
         :return: MenuProjectConfig dataclass instanciated
         :rtype: MenuProjectConfig
@@ -121,6 +300,6 @@ class MenuProjectConfig:
             filename=data["filename"],
             uri=data["uri"],
             project_name=data["project_name"],
-            root_group=MenuGroupConfig.from_dict(data["root_group"]),
+            root_group=MenuGroupConfig.from_dict(data["root_group"], lazy),
         )
         return res
@@ -0,0 +1,71 @@
+#! python3  # noqa: E265
+
+"""
+Atomic file writes, so that other QGIS instances sharing the same profile never
+read a partially written cache file.
+
+Content is written to a temporary file in the destination folder and renamed over
+the destination, which is atomic on the same file system.
+"""
+
+# Standard library
+import os
+import tempfile
+from pathlib import Path
+
+# ############################################################################
+# ########## Globals ###############
+# ##################################
+
+# Process umask, read once: changing it is not thread safe
+_umask = os.umask(0)
+os.umask(_umask)
+# Mode of created files, as if created with open(): temporary files are only
+# readable by their owner
+DEFAULT_FILE_MODE = 0o666 & ~_umask
+
+# ############################################################################
+# ########## Functions #############
+# ##################################
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Write bytes in a file, replaced only once fully written. The mode of the
+    replaced file is kept, default file mode is used for a new file.
+
+    :param path: file path
+    :type path: Path
+    :param data: file content
+    :type data: bytes
+    """
+    path = Path(path)
+    fd, temporary_path = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            mode = path.stat().st_mode & 0o7777
+        except OSError:
+            mode = DEFAULT_FILE_MODE
+        os.chmod(temporary_path, mode)
+        os.replace(temporary_path, path)
+    except BaseException:
+        Path(temporary_path).unlink(missing_ok=True)
+        raise
+
+
+def atomic_write_text(path: Path, text: str, encoding: str = "UTF-8") -> None:
+    """Write text in a file, replaced only once fully written
+
+    :param path: file path
+    :type path: Path
+    :param text: file content
+    :type text: str
+    :param encoding: text encoding, defaults to "UTF-8"
+    :type encoding: str, optional
+    """
+    atomic_write_bytes(path, text.encode(encoding))
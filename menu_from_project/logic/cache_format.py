@@ -0,0 +1,465 @@
+#! python3  # noqa: E265
+
+"""
+Compact format of project menu configuration cache.
+
+Layout: magic bytes, format version (uint16), then a UTF-8 JSON payload:
+
+- project: [project_name, filename, uri, root_group_name, root_group_filename,
+  root_group_embedded, root_group_childs]
+
+Childs of a group are a block made of a string table and lists of integers
+referencing it:
+
+- group: [GROUP_NODE, name, filename, embedded, childs]
+- layer: [LAYER_NODE, name, layer_id, filename, visible, expanded, embedded,
+  is_spatial, layer_type, metadata_abstract, metadata_title, layer_notes,
+  abstract, title, geometry_type, version, format]
+
+Strings are stored once in the table of each block. Layer and geometry types are
+stored as integers, -1 for None. Filenames in the download directory of the project
+(downloaded or exported remote projects) are stored relative to it, and resolved
+against the download directory of the workstation reading the cache.
+
+Cache files can be shared by several workstations: the whole payload is checked
+when decoded, an invalid payload is ignored as a cache in another version. As
+each group has its own block, a configuration can be decoded lazily: only
+top-level groups are decoded, childs of a subgroup are decoded when the subgroup
+is first used.
+"""
+
+# Standard library
+import json
+import struct
+from functools import lru_cache, partial
+from operator import itemgetter
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# PyQGIS
+from qgis.core import QgsMapLayerType, QgsWkbTypes
+
+# project
+from menu_from_project.datamodel.project_config import (
+    LazyMenuGroupConfig,
+    MenuGroupConfig,
+    MenuLayerConfig,
+    MenuProjectConfig,
+)
+
+# ############################################################################
+# ########## Globals ###############
+# ##################################
+
+CACHE_FORMAT_MAGIC = b"MFPC"
+# Increase version on each layout change: older caches are ignored and rebuilt
+CACHE_FORMAT_VERSION = 3
+CACHE_FORMAT_HEADER = struct.Struct("<4sH")
+
+GROUP_NODE = 0
+LAYER_NODE = 1
+
+# Prefix of filenames relative to project download directory
+DOWNLOADS_PREFIX = "downloads:"
+
+# Positions of string indexes, booleans and enums in group and layer nodes
+GROUP_NODE_SIZE = 5
+GROUP_STRINGS = (1, 2)
+LAYER_NODE_SIZE = 17
+LAYER_STRINGS = (1, 2, 3, 9, 10, 11, 12, 13, 15, 16)
+LAYER_BOOLEANS = (4, 5, 6, 7)
+LAYER_ENUMS = ((8, QgsMapLayerType), (14, QgsWkbTypes.GeometryType))
+
+_group_strings = itemgetter(*GROUP_STRINGS)
+_layer_strings = itemgetter(*LAYER_STRINGS)
+_layer_booleans = itemgetter(*LAYER_BOOLEANS)
+
+# Enum values already converted, by enum type and integer value
+_enum_values: Dict[Tuple[Any, int], Any] = {}
+
+# ############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class _StringTable:
+    """Index of unique strings"""
+
+    def __init__(self) -> None:
+        self.strings: List[str] = []
+        self._index: Dict[str, int] = {}
+
+    def add(self, value: str) -> int:
+        """Return index of a string, added if not already in table
+
+        :param value: string
+        :type value: str
+        :return: index in table
+        :rtype: int
+        """
+        index = self._index.get(value)
+        if index is None:
+            index = len(self.strings)
+            self.strings.append(value)
+            self._index[value] = index
+        return index
+
+
+# ############################################################################
+# ########## Functions #############
+# ##################################
+
+
+def enum_to_int(value: Any) -> int:
+    """Return integer value of an enum, -1 for None
+
+    :param value: enum value
+    :type value: Any
+    :return: integer value
+    :rtype: int
+    """
+    if value is None:
+        return -1
+    return int(getattr(value, "value", value))
+
+
+def int_to_enum(value: int, enum_type: Any) -> Any:
+    """Return enum value of an integer, None for -1
+
+    :param value: integer value
+    :type value: int
+    :param enum_type: enum type
+    :type enum_type: Any
+    :raises ValueError: value is not in enum
+    :return: enum value
+    :rtype: Any
+    """
+    if value < 0:
+        return None
+    key = (enum_type, value)
+    enum_value = _enum_values.get(key)
+    if enum_value is None:
+        enum_value = _enum_values[key] = enum_type(value)
+    return enum_value
+
+
+def to_cache_filename(filename: str, download_dir: Optional[str]) -> str:
+    """Return filename stored in cache, relative to project download directory if
+    the file is in it
+
+    :param filename: path to file
+    :type filename: str
+    :param download_dir: project download directory
+    :type download_dir: Optional[str]
+    :return: filename stored in cache
+    :rtype: str
+    """
+    if download_dir and filename.startswith(download_dir):
+        relative = filename[len(download_dir) :]
+        if len(relative) > 1 and relative[0] in ("/", "\\"):
+            return DOWNLOADS_PREFIX + relative[1:].replace("\\", "/")
+    return filename
+
+
+def from_cache_filename(filename: str, download_dir: Optional[str]) -> str:
+    """Return path to file from filename stored in cache
+
+    :param filename: filename stored in cache
+    :type filename: str
+    :param download_dir: project download directory
+    :type download_dir: Optional[str]
+    :return: path to file
+    :rtype: str
+    """
+    if download_dir and filename.startswith(DOWNLOADS_PREFIX):
+        return str(Path(download_dir, filename[len(DOWNLOADS_PREFIX) :]))
+    return filename
+
+
+def _check_childs(block: Any) -> None:
+    """Check structure of an encoded childs block and of its subgroups blocks
+
+    :param block: encoded childs
+    :type block: Any
+    :raises ValueError: block is invalid
+    """
+    if not isinstance(block, list) or len(block) != 2:
+        raise ValueError("invalid childs block")
+    strings, nodes = block
+    if not isinstance(strings, list) or not isinstance(nodes, list):
+        raise ValueError("invalid childs block")
+    if not all(type(string) is str for string in strings):
+        raise ValueError("invalid string table")
+    nb_strings = len(strings)
+    for node in nodes:
+        if type(node) is not list or not node:
+            raise ValueError("invalid node")
+        if node[0] == LAYER_NODE and len(node) == LAYER_NODE_SIZE:
+            indexes = _layer_strings(node)
+            booleans = _layer_booleans(node)
+        elif node[0] == GROUP_NODE and len(node) == GROUP_NODE_SIZE:
+            indexes = _group_strings(node)
+            booleans = (node[3],)
+        else:
+            raise ValueError("invalid node")
+        for index in indexes:
+            if type(index) is not int or not 0 <= index < nb_strings:
+                raise ValueError("invalid string index")
+        for boolean in booleans:
+            if type(boolean) is not bool:
+                raise ValueError("invalid boolean")
+        if node[0] == GROUP_NODE:
+            _check_childs(node[4])
+            continue
+        for position, enum_type in LAYER_ENUMS:
+            if type(node[position]) is not int:
+                raise ValueError("invalid enum")
+            int_to_enum(node[position], enum_type)
+
+
+def _encode_childs(group: MenuGroupConfig, download_dir: Optional[str]) -> List[Any]:
+    """Encode childs of a group configuration in a block
+
+    :param group: group configuration
+    :type group: MenuGroupConfig
+    :param download_dir: project download directory
+    :type download_dir: Optional[str]
+    :return: encoded childs
+    :rtype: List[Any]
+    """
+    table = _StringTable()
+    add = table.add
+    childs = []
+    for child in group.childs:
+        if isinstance(child, MenuGroupConfig):
+            if (
+                isinstance(child, LazyMenuGroupConfig)
+                and not child.loaded
+                and isinstance(child.decode_childs, partial)
+                and child.decode_childs.func is _decode_childs
+            ):
+                # Childs not decoded since cache read: checked block is kept
+                childs_block = child.source
+            else:
+                childs_block = _encode_childs(child, download_dir)
+            childs.append(
+                [
+                    GROUP_NODE,
+                    add(child.name),
+                    add(to_cache_filename(child.filename, download_dir)),
+                    bool(child.embedded),
+                    childs_block,
+                ]
+            )
+        else:
+            childs.append(
+                [
+                    LAYER_NODE,
+                    add(child.name),
+                    add(child.layer_id),
+                    add(to_cache_filename(child.filename, download_dir)),
+                    bool(child.visible),
+                    bool(child.expanded),
+                    bool(child.embedded),
+                    bool(child.is_spatial),
+                    enum_to_int(child.layer_type),
+                    add(child.metadata_abstract),
+                    add(child.metadata_title),
+                    add(child.layer_notes),
+                    add(child.abstract),
+                    add(child.title),
+                    enum_to_int(child.geometry_type),
+                    add(child.version),
+                    add(child.format),
+                ]
+            )
+    return [table.strings, childs]
+
+
+def encode_project_menu_config(
+    project_config: MenuProjectConfig, download_dir: Optional[Path] = None
+) -> bytes:
+    """Encode a project menu configuration in binary cache format
+
+    :param project_config: project menu configuration
+    :type project_config: MenuProjectConfig
+    :param download_dir: project download directory, filenames in it are stored \
+    relative to it, defaults to None
+    :type download_dir: Optional[Path], optional
+    :return: encoded configuration
+    :rtype: bytes
+    """
+    root_group = project_config.root_group
+    download_dir = str(download_dir) if download_dir else None
+    project = [
+        project_config.project_name,
+        to_cache_filename(project_config.filename, download_dir),
+        project_config.uri,
+        root_group.name,
+        to_cache_filename(root_group.filename, download_dir),
+        bool(root_group.embedded),
+        _encode_childs(root_group, download_dir),
+    ]
+    payload = json.dumps(project, ensure_ascii=False, separators=(",", ":")).encode(
+        "UTF-8"
+    )
+    return (
+        CACHE_FORMAT_HEADER.pack(CACHE_FORMAT_MAGIC, CACHE_FORMAT_VERSION) + payload
+    )
+
+
+def _decode_childs(
+    block: List[Any], lazy: bool, download_dir: Optional[str]
+) -> List[Any]:
+    """Decode childs of a group configuration from a checked block
+
+    :param block: encoded childs
+    :type block: List[Any]
+    :param lazy: childs of subgroups are decoded on first access
+    :type lazy: bool
+    :param download_dir: project download directory
+    :type download_dir: Optional[str]
+    :return: list of MenuLayerConfig and MenuGroupConfig
+    :rtype: List[Any]
+    """
+    strings, nodes = block
+    childs = []
+    append = childs.append
+    for child in nodes:
+        if child[0] == GROUP_NODE:
+            _, name, filename, embedded, childs_block = child
+            if lazy:
+                append(
+                    LazyMenuGroupConfig(
+                        name=strings[name],
+                        filename=from_cache_filename(strings[filename], download_dir),
+                        embedded=embedded,
+                        source=childs_block,
+                        decode_childs=get_lazy_childs_decoder(download_dir),
+                    )
+                )
+            else:
+                append(
+                    MenuGroupConfig(
+                        name=strings[name],
+                        filename=from_cache_filename(strings[filename], download_dir),
+                        embedded=embedded,
+                        childs=_decode_childs(childs_block, lazy, download_dir),
+                    )
+                )
+            continue
+        (
+            _,
+            name,
+            layer_id,
+            filename,
+            visible,
+            expanded,
+            embedded,
+            is_spatial,
+            layer_type,
+            metadata_abstract,
+            metadata_title,
+            layer_notes,
+            abstract,
+            title,
+            geometry_type,
+            version,
+            layer_format,
+        ) = child
+        append(
+            MenuLayerConfig(
+                name=strings[name],
+                layer_id=strings[layer_id],
+                filename=from_cache_filename(strings[filename], download_dir),
+                visible=visible,
+                expanded=expanded,
+                embedded=embedded,
+                is_spatial=is_spatial,
+                layer_type=int_to_enum(layer_type, QgsMapLayerType),
+                metadata_abstract=strings[metadata_abstract],
+                metadata_title=strings[metadata_title],
+                layer_notes=strings[layer_notes],
+                abstract=strings[abstract],
+                title=strings[title],
+                geometry_type=int_to_enum(geometry_type, QgsWkbTypes.GeometryType),
+                version=strings[version],
+                format=strings[layer_format],
+            )
+        )
+    return childs
+
+
+@lru_cache(maxsize=None)
+def get_lazy_childs_decoder(
+    download_dir: Optional[str],
+) -> Callable[[List[Any]], List[Any]]:
+    """Return function decoding childs of a group configuration from a checked
+    block, childs of subgroups are decoded on first access.
+
+    The same function is returned for a download directory: groups not decoded are
+    compared with their source.
+
+    :param download_dir: project download directory
+    :type download_dir: Optional[str]
+    :return: function decoding childs from a block
+    :rtype: Callable[[List[Any]], List[Any]]
+    """
+    return partial(_decode_childs, lazy=True, download_dir=download_dir)
+
+
+def decode_project_menu_config(
+    data: bytes, lazy: bool = False, download_dir: Optional[Path] = None
+) -> Optional[MenuProjectConfig]:
+    """Decode a project menu configuration from binary cache format
+
+    :param data: encoded configuration
+    :type data: bytes
+    :param lazy: only top-level groups are decoded, childs of subgroups are \
+    decoded on first access, defaults to False
+    :type lazy: bool, optional
+    :param download_dir: project download directory, filenames stored relative to \
+    it are resolved against it, defaults to None
+    :type download_dir: Optional[Path], optional
+    :return: project menu configuration, None if data is not in current format version
+    :rtype: Optional[MenuProjectConfig]
+    """
+    if len(data) < CACHE_FORMAT_HEADER.size:
+        return None
+    magic, version = CACHE_FORMAT_HEADER.unpack_from(data)
+    if magic != CACHE_FORMAT_MAGIC or version != CACHE_FORMAT_VERSION:
+        return None
+    try:
+        project = json.loads(data[CACHE_FORMAT_HEADER.size :].decode("UTF-8"))
+        if not isinstance(project, list) or len(project) != 7:
+            return None
+        (
+            project_name,
+            filename,
+            uri,
+            root_group_name,
+            root_group_filename,
+            root_group_embedded,
+            root_group_childs,
+        ) = project
+        strings = (project_name, filename, uri, root_group_name, root_group_filename)
+        if not all(isinstance(string, str) for string in strings):
+            return None
+        if type(root_group_embedded) is not bool:
+            return None
+        # Whole payload is checked: lazy decode of subgroups can't fail
+        _check_childs(root_group_childs)
+        download_dir = str(download_dir) if download_dir else None
+        return MenuProjectConfig(
+            project_name=project_name,
+            filename=from_cache_filename(filename, download_dir),
+            uri=uri,
+            root_group=MenuGroupConfig(
+                name=root_group_name,
+                filename=from_cache_filename(root_group_filename, download_dir),
+                embedded=root_group_embedded,
+                childs=_decode_childs(root_group_childs, lazy, download_dir),
+            ),
+        )
+    except (ValueError, TypeError, RecursionError):
+        return None
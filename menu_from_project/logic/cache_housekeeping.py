@@ -0,0 +1,255 @@
+#! python3  # noqa: E265
+
+"""
+Housekeeping of project caches: removal of caches of projects no longer in
+settings, of unused downloads and least recently used caches over a size limit.
+
+Files downloaded for projects in settings are never evicted: layers are loaded
+from them while menus are displayed.
+"""
+
+# Standard library
+import shutil
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Set
+
+# PyQGIS
+from qgis.PyQt.QtCore import QLockFile
+
+# project
+from menu_from_project.datamodel.project import Project
+from menu_from_project.logic.cache_manager import (
+    CACHE_VALIDATION_DIR,
+    PROJECT_DOWNLOAD_DIR,
+    CacheManager,
+    get_local_cache_dir,
+)
+from menu_from_project.logic.cache_store import (
+    get_cache_store,
+    get_default_cache_store_path,
+)
+from menu_from_project.logic.http_download import (
+    VALIDATORS_SUFFIX,
+    get_last_validation,
+)
+from menu_from_project.logic.qgs_manager import cache_folder
+
+# ############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+@dataclass
+class CacheCleanReport:
+    """What was removed by a cache housekeeping"""
+
+    removed_projects: List[str] = field(default_factory=list)
+    evicted_projects: List[str] = field(default_factory=list)
+    nb_removed_files: int = 0
+    reclaimed_bytes: int = 0
+
+    def __str__(self) -> str:
+        return (
+            f"{len(self.removed_projects)} unknown project caches removed, "
+            f"{len(self.evicted_projects)} least recently used caches evicted, "
+            f"{self.nb_removed_files} files removed, "
+            f"{self.reclaimed_bytes / (1024 * 1024):.1f} MB reclaimed"
+        )
+
+
+# ############################################################################
+# ########## Functions #############
+# ##################################
+
+
+def get_size(path: Path) -> int:
+    """Return size of a file, or of all files in a directory
+
+    :param path: file or directory path
+    :type path: Path
+    :return: size in bytes
+    :rtype: int
+    """
+    try:
+        if path.is_file():
+            return path.stat().st_size
+        return sum(child.stat().st_size for child in path.rglob("*") if child.is_file())
+    except OSError:
+        return 0
+
+
+def get_menu_cache_paths(project_dir: Path) -> List[Path]:
+    """Return files and directories of a project cache directory, except project
+    download directory
+
+    :param project_dir: project cache directory
+    :type project_dir: Path
+    :return: paths of menu cache
+    :rtype: List[Path]
+    """
+    try:
+        return [
+            path for path in project_dir.iterdir() if path.name != PROJECT_DOWNLOAD_DIR
+        ]
+    except OSError:
+        return []
+
+
+def _remove(path: Path, report: CacheCleanReport) -> bool:
+    """Remove a file or a directory, reclaimed size added to report
+
+    :param path: file or directory path
+    :type path: Path
+    :param report: housekeeping report
+    :type report: CacheCleanReport
+    :return: True if path was removed
+    :rtype: bool
+    """
+    size = get_size(path)
+    try:
+        if path.is_dir():
+            shutil.rmtree(path)
+        else:
+            path.unlink()
+    except OSError:
+        return False
+    report.reclaimed_bytes += size
+    return True
+
+
+def clean_cache(
+    projects: List[Project], max_size_mb: int = 0, min_age_days: int = 1
+) -> CacheCleanReport:
+    """Clean cache of current QGIS profile:
+
+    - remove caches and locks of projects not in settings
+    - remove downloaded cache validation files not used by projects
+    - remove temporary files left by interrupted writes older than min_age_days, \
+      and files of the fallback download folder not validated for min_age_days
+    - evict least recently used project menu caches while total size of project \
+      menu caches is over max_size_mb. Size of a project menu cache is the size of \
+      its directory without downloaded files, plus its estimated size in SQLite \
+      store. Downloaded files and caches locked by a refresh are kept.
+
+    :param projects: projects in settings
+    :type projects: List[Project]
+    :param max_size_mb: maximum size of project caches in MB, no limit if 0, \
+    defaults to 0
+    :type max_size_mb: int, optional
+    :param min_age_days: minimal age of removed temporary files, defaults to 1
+    :type min_age_days: int, optional
+    :return: report of removed caches and reclaimed space
+    :rtype: CacheCleanReport
+    """
+    report = CacheCleanReport()
+    cache_dir = get_local_cache_dir()
+    project_ids: Set[str] = {project.id for project in projects}
+    max_mtime = time.time() - min_age_days * 86400
+
+    # Projects no longer in settings
+    cache_store = None
+    if get_default_cache_store_path().exists():
+        cache_store = get_cache_store()
+        for project_id in cache_store.get_project_ids():
+            if project_id not in project_ids:
+                cache_store.remove_project(project_id)
+                report.removed_projects.append(project_id)
+
+    project_dirs = []
+    if cache_dir.is_dir():
+        for path in cache_dir.iterdir():
+            if path.is_dir() and path.name != CACHE_VALIDATION_DIR:
+                if path.name in project_ids:
+                    project_dirs.append(path)
+                elif _remove(path, report):
+                    if path.name not in report.removed_projects:
+                        report.removed_projects.append(path.name)
+            elif path.suffix == ".lock" and path.stem not in project_ids:
+                _remove(path, report)
+
+    # Cache validation files no longer used
+    validation_paths = {
+        CacheManager.get_cache_validation_path(validation_uri)
+        for validation_uri in {
+            project.cache_config.cache_validation_uri for project in projects
+        }
+        if validation_uri.startswith("http")
+    }
+    validation_dir = cache_dir / CACHE_VALIDATION_DIR
+    if validation_dir.is_dir():
+        for path in validation_dir.iterdir():
+            if path.name.startswith("."):
+                # file being written
+                continue
+            downloaded_path = path.with_name(path.name.removesuffix(VALIDATORS_SUFFIX))
+            if downloaded_path not in validation_paths and _remove(path, report):
+                report.nb_removed_files += 1
+
+    # Files left by interrupted writes
+    for path in cache_dir.rglob(".*.tmp"):
+        try:
+            is_old = path.is_file() and path.stat().st_mtime < max_mtime
+        except OSError:
+            continue
+        if is_old and _remove(path, report):
+            report.nb_removed_files += 1
+
+    # Files of the fallback download folder, with their validators, by last
+    # validation: a file still available on server is not downloaded again
+    for path in cache_folder.glob("*"):
+        downloaded_path = path.with_name(path.name.removesuffix(VALIDATORS_SUFFIX))
+        is_old = path.is_file() and get_last_validation(downloaded_path) < max_mtime
+        if is_old and _remove(path, report):
+            report.nb_removed_files += 1
+
+    # Least recently used project caches over size limit
+    if max_size_mb > 0:
+        sizes: Dict[str, int] = {}
+        last_uses: Dict[str, float] = {}
+        for path in project_dirs:
+            sizes[path.name] = sum(
+                get_size(menu_cache_path)
+                for menu_cache_path in get_menu_cache_paths(path)
+            )
+            try:
+                last_uses[path.name] = path.stat().st_mtime
+            except OSError:
+                last_uses[path.name] = 0
+        stored_sizes: Dict[str, int] = {}
+        if cache_store:
+            for project_id, last_use, size in cache_store.get_project_usages():
+                if project_id in project_ids:
+                    stored_sizes[project_id] = size
+                    sizes[project_id] = sizes.get(project_id, 0) + size
+                    last_uses[project_id] = max(last_uses.get(project_id, 0), last_use)
+        total_size = sum(sizes.values())
+        projects_by_id = {project.id: project for project in projects}
+        cache_manager = CacheManager(None)
+        for project_id in sorted(sizes, key=last_uses.get):
+            if total_size <= max_size_mb * 1024 * 1024:
+                break
+            lock_file = QLockFile(
+                str(cache_manager.get_project_lock_path(projects_by_id[project_id]))
+            )
+            if not lock_file.tryLock(0):
+                continue
+            try:
+                removed = False
+                if project_id in stored_sizes:
+                    # Freed pages are reused by next writes in the database
+                    cache_store.remove_project(project_id)
+                    report.reclaimed_bytes += stored_sizes[project_id]
+                    removed = True
+                project_dir = cache_dir / project_id
+                if project_dir in project_dirs:
+                    for path in get_menu_cache_paths(project_dir):
+                        removed = _remove(path, report) or removed
+                if removed:
+                    total_size -= sizes[project_id]
+                    report.evicted_projects.append(project_id)
+            finally:
+                lock_file.unlock()
+
+    return report
@@ -1,22 +1,99 @@
 # standard
+import hashlib
 import json
 import os
 import shutil
-import tempfile
+import uuid
+from contextlib import contextmanager, nullcontext
 from dataclasses import asdict
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Optional
+from typing import Callable, Dict, Iterator, List, Optional
+from urllib.parse import urlparse
 
 # PyQGIS
-from qgis.core import QgsApplication, QgsFileDownloader, QgsMessageLog
+from qgis.core import QgsApplication, QgsMessageLog
 from qgis.gui import QgisInterface
-from qgis.PyQt.QtCore import QCoreApplication, QEventLoop, QUrl
+from qgis.PyQt.QtCore import QCoreApplication, QLockFile
 
 # project
 from menu_from_project.__about__ import __title__
 from menu_from_project.datamodel.project import Project
-from menu_from_project.datamodel.project_config import MenuProjectConfig
+from menu_from_project.datamodel.project_config import (
+    MenuGroupConfig,
+    MenuProjectConfig,
+)
+from menu_from_project.logic.atomic_file import atomic_write_bytes, atomic_write_text
+from menu_from_project.logic.cache_format import (
+    decode_project_menu_config,
+    encode_project_menu_config,
+)
+from menu_from_project.logic.cache_store import SqliteCacheStore
+from menu_from_project.logic.http_download import conditional_download
+
+# Folder of downloaded cache validation files, in local cache directory
+CACHE_VALIDATION_DIR = "cache_validation"
+# Folder of downloaded and exported project files, in project cache directory
+PROJECT_DOWNLOAD_DIR = "downloads"
+
+
+def compute_source_digest(filenames: List[str]) -> Optional[str]:
+    """Compute a digest of the content of project source files
+
+    :param filenames: paths to project files
+    :type filenames: List[str]
+    :return: sha256 hex digest, None if a file is not available
+    :rtype: Optional[str]
+    """
+    digest = hashlib.sha256()
+    for filename in filenames:
+        try:
+            with open(filename, "rb") as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    digest.update(chunk)
+        except OSError:
+            return None
+    return digest.hexdigest()
+
+
+def get_uri_project_id(uri: str) -> str:
+    """Return id of a project known only by its URI, computed from the URI. Used
+    for caches prebuilt without QGIS settings.
+
+    :param uri: project URI
+    :type uri: str
+    :return: project id
+    :rtype: str
+    """
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, uri))
+
+
+def get_local_cache_dir() -> Path:
+    """Return the cache directory of current QGIS profile
+
+    :return: path to local cache directory
+    :rtype: Path
+    """
+    return Path(QgsApplication.qgisSettingsDirPath()) / "cache" / "menu_from_project"
+
+
+def get_embedded_filenames(group_config: MenuGroupConfig) -> List[str]:
+    """Get filenames of embedded projects used in a group configuration
+
+    :param group_config: group configuration
+    :type group_config: MenuGroupConfig
+    :return: sorted list of embedded project filenames
+    :rtype: List[str]
+    """
+    filenames = set()
+    if group_config.embedded:
+        filenames.add(group_config.filename)
+    for child in group_config.childs:
+        if isinstance(child, MenuGroupConfig):
+            filenames.update(get_embedded_filenames(child))
+        elif child.embedded:
+            filenames.add(child.filename)
+    return sorted(filenames)
 
 
 class CacheManager:
@@ -27,15 +104,62 @@ class CacheManager:
     """
 
     DATETIME_FORMAT: str = "%d/%m/%Y %H:%M:%S"
-
-    def __init__(self, iface: QgisInterface) -> None:
+    # Time to wait for a project refresh by another QGIS instance
+    LOCK_TIMEOUT_MS: int = 120000
+    # Lock of an instance refreshing a project for longer is considered as stale
+    LOCK_STALE_TIME_MS: int = 600000
+
+    def __init__(
+        self,
+        iface: QgisInterface,
+        downloaded_files: Optional[Dict[str, str]] = None,
+        json_export: bool = False,
+        cache_store: Optional[SqliteCacheStore] = None,
+        cache_dir: Optional[Path] = None,
+        read_only: bool = False,
+        shared_cache_dir: Optional[Path] = None,
+        cache_validations: Optional[Dict[str, dict]] = None,
+    ) -> None:
         """Class initialization.
 
         :param iface: An interface instance that will be passed to this class which \
         provides the hook by which you can manipulate the QGIS application at run time.
         :type iface: QgsInterface
+        :param downloaded_files: local path of remote files already downloaded, by uri
+        :type downloaded_files: Optional[Dict[str, str]]
+        :param json_export: export menu configuration as JSON next to binary cache, \
+        for debug
+        :type json_export: bool
+        :param cache_store: SQLite store used instead of project cache files
+        :type cache_store: Optional[SqliteCacheStore]
+        :param cache_dir: directory of project cache files, defaults to the cache \
+        directory of current QGIS profile
+        :type cache_dir: Optional[Path]
+        :param read_only: cache is only read, cache lifetime is not extended
+        :type read_only: bool
+        :param shared_cache_dir: directory of a read-only cache shared by several \
+        workstations, used before the local cache if up to date
+        :type shared_cache_dir: Optional[Path]
+        :param cache_validations: content of cache validation files already read, by \
+        uri. Shared between cache managers of a refresh, completed when a file is read
+        :type cache_validations: Optional[Dict[str, dict]]
         """
         self.iface = iface
+        self.downloaded_files = downloaded_files or {}
+        self.json_export = json_export
+        self.cache_store = cache_store
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.read_only = read_only
+        self.cache_validations = {} if cache_validations is None else cache_validations
+        self.shared_cache = None
+        if shared_cache_dir:
+            self.shared_cache = CacheManager(
+                iface,
+                downloaded_files,
+                cache_dir=shared_cache_dir,
+                read_only=True,
+                cache_validations=self.cache_validations,
+            )
 
     def tr(self, message: str) -> str:
         """Get the translation for a string using Qt translation API.
@@ -57,26 +181,16 @@ class CacheManager:
         )
 
     def clear_project_cache(self, project: Project) -> None:
-        """Clear project cache directory
+        """Clear project cache directory, and project cache in SQLite store if used
 
         :param project: project
         :type project: Project
         """
-        project_cache_dir = self.get_project_cache_dir(project)
-        shutil.rmtree(project_cache_dir)
-
-    def downloadError(self, errorMessages: List[str]):
-        """Display error messages that occurs during download
-
-        :param errorMessages: error messages
-        :type errorMessages: List[str]
-        """
-        for err in errorMessages:
-            QgsMessageLog.logMessage(
-                "Download error. " + err,
-                "Layers menu from project",
-                notifyUser=True,
-            )
+        if self.cache_store:
+            self.cache_store.remove_project(project.id)
+        project_cache_dir = (self.cache_dir or get_local_cache_dir()) / project.id
+        if project_cache_dir.exists():
+            shutil.rmtree(project_cache_dir)
 
     def _try_load_cache_validation_file(
         self, cache_validation_file: str, cache_validation_uri: str
@@ -90,19 +204,40 @@ class CacheManager:
         :return: dict from json data in file
         :rtype: dict
         """
-        with open(cache_validation_file, encoding="UTF-8") as f:
-            try:
-                data = json.load(f)
-                return data
-            except json.JSONDecodeError as e:
-                self.log(
-                    f"Invalid content in cache validation file '{cache_validation_uri}' : {e}. Can't check cache context."
-                )
+        # Small file, read in memory at once
+        content = Path(cache_validation_file).read_bytes()
+        try:
+            return json.loads(content)
+        except json.JSONDecodeError as e:
+            self.log(
+                f"Invalid content in cache validation file '{cache_validation_uri}' : {e}. Can't check cache context."
+            )
         return {}
 
+    @staticmethod
+    def get_cache_validation_path(cache_validation_uri: str) -> Path:
+        """Return local path where a remote cache validation file is downloaded,
+        shared by all projects using the same cache validation uri
+
+        :param cache_validation_uri: cache validation uri
+        :type cache_validation_uri: str
+        :return: path to downloaded file
+        :rtype: Path
+        """
+        filename = urlparse(cache_validation_uri).path.rpartition("/")[2]
+        uri_digest = hashlib.sha256(cache_validation_uri.encode()).hexdigest()[:16]
+        download_folder = get_local_cache_dir() / CACHE_VALIDATION_DIR
+        download_folder.mkdir(parents=True, exist_ok=True)
+        return download_folder / f"{uri_digest}_{filename or 'cache_validation'}"
+
     def get_cache_validation(self, cache_validation_uri: str) -> dict:
         """Read dict for cache validation for cache validation uri
-        If uri if an url with http, the file is downloaded in a temporary dir
+        If uri if an url with http, the file is downloaded in a folder shared by
+        projects. A previous download is revalidated with ETag / Last-Modified
+        validators, unless the file was already downloaded.
+
+        The file is read once: its content is shared by all cache managers using the
+        same cache validations.
 
         If the file is not available (downloaded or local), an empty dict is returned
 
@@ -113,29 +248,25 @@ class CacheManager:
         :return: dict for cache validation
         :rtype: dict
         """
+        if cache_validation_uri in self.cache_validations:
+            return self.cache_validations[cache_validation_uri]
+
         data = {}
         if cache_validation_uri.startswith("http"):
             # download it
-            with tempfile.NamedTemporaryFile() as f:
-                temp_file_path = f.name
-
-            loop = QEventLoop()
-            project_download = QgsFileDownloader(
-                url=QUrl(cache_validation_uri),
-                outputFileName=temp_file_path,
-                delayStart=True,
-            )
-            project_download.downloadExited.connect(loop.quit)
-            project_download.downloadError.connect(self.downloadError)
-            project_download.startDownload()
-            loop.exec()
+            if cache_validation_uri in self.downloaded_files:
+                download_file_path = Path(self.downloaded_files[cache_validation_uri])
+            else:
+                download_file_path = self.get_cache_validation_path(
+                    cache_validation_uri
+                )
+                conditional_download(cache_validation_uri, download_file_path)
 
-            if Path(temp_file_path).exists():
+            if download_file_path.exists():
                 data = self._try_load_cache_validation_file(
-                    cache_validation_file=temp_file_path,
+                    cache_validation_file=str(download_file_path),
                     cache_validation_uri=cache_validation_uri,
                 )
-                os.remove(temp_file_path)
             else:
                 self.log(
                     f"Error when downloading cache validation file '{cache_validation_uri}'. Can't check cache context."
@@ -150,6 +281,7 @@ class CacheManager:
                 self.log(
                     f"Cache validation file '{cache_validation_uri}' doesn't exist. Can't check cache context."
                 )
+        self.cache_validations[cache_validation_uri] = data
         return data
 
     def get_available_cache_info(self, project: Project) -> dict:
@@ -160,6 +292,9 @@ class CacheManager:
         :return: cache info in dict
         :rtype: dict
         """
+        if self.cache_store:
+            return self.cache_store.get_cache_info(project.id)
+
         cache_info = {}
         cache_path = self.get_project_cache_dir(project)
         cache_info_path = cache_path / "cache_info.json"
@@ -168,11 +303,19 @@ class CacheManager:
                 cache_info = json.load(f)
         return cache_info
 
-    def check_if_cache_enabled(self, project: Project) -> bool:
+    def check_if_cache_enabled(
+        self, project: Project, get_project_path: Optional[Callable[[], str]] = None
+    ) -> bool:
         """Check if cache is enabled for project
 
+        When refresh days period is over, cache lifetime is extended if the digest
+        of project source files didn't change.
+
         :param project: project
         :type project: Project
+        :param get_project_path: function returning a local path to project file, \
+        used to check source digest, defaults to None
+        :type get_project_path: Optional[Callable[[], str]], optional
         :return: True if cache is enabled, False otherwise
         :rtype: bool
         """
@@ -193,11 +336,21 @@ class CacheManager:
             cache_last_refresh = None
 
         # Check refresh days period
+        extend_cache = False
         if cache_last_refresh and cache_config.refresh_days_period:
             refresh_date = cache_last_refresh + timedelta(
                 days=cache_config.refresh_days_period
             )
-            if datetime.now() > refresh_date:
+            if datetime.now() > refresh_date and self.check_source_digest(
+                cache_info, get_project_path
+            ):
+                self.log(
+                    self.tr(
+                        f"Project {project.name} unchanged since {cache_last_refresh}, cache lifetime extended."
+                    )
+                )
+                extend_cache = True
+            elif datetime.now() > refresh_date:
                 self.log(
                     self.tr(
                         f"Cache is not up to date since {refresh_date} for project {project.name}."
@@ -229,55 +382,355 @@ class CacheManager:
                     )
                     return False
 
+        if extend_cache and not self.read_only:
+            self.save_cache_info(project, cache_info)
+
         return True
 
-    def get_project_menu_config(self, project: Project) -> Optional[MenuProjectConfig]:
+    def check_source_digest(
+        self, cache_info: dict, get_project_path: Optional[Callable[[], str]]
+    ) -> bool:
+        """Check if digest of project source files is the one stored in cache info
+
+        :param cache_info: cache info
+        :type cache_info: dict
+        :param get_project_path: function returning a local path to project file
+        :type get_project_path: Optional[Callable[[], str]]
+        :return: True if project source files didn't change, False otherwise
+        :rtype: bool
+        """
+        if not get_project_path or "source_digest" not in cache_info:
+            return False
+        try:
+            filenames = [get_project_path()] + cache_info.get("source_files", [])
+        except Exception as e:
+            self.log(self.tr(f"Can't get project file to check cache : {e}"))
+            return False
+        source_digest = compute_source_digest(filenames)
+        return (
+            source_digest is not None
+            and source_digest == cache_info["source_digest"]
+        )
+
+    def get_project_menu_config(
+        self, project: Project, get_project_path: Optional[Callable[[], str]] = None
+    ) -> Optional[MenuProjectConfig]:
         """Get menu project configuration from cache for a project
 
+        :param project: dict of information about the project
+        :type project: Project
+        :param get_project_path: function returning a local path to project file, \
+        used to check source digest, defaults to None
+        :type get_project_path: Optional[Callable[[], str]], optional
+        :return: menu project configuration from cache, None if no cache available
+        :rtype: Optional[MenuProjectConfig]
+        """
+        if not self.check_if_cache_enabled(project, get_project_path):
+            if self.read_only:
+                self.log(
+                    self.tr(
+                        f"Read-only cache {self.cache_dir} not used for project "
+                        f"{project.name}."
+                    )
+                )
+            else:
+                self.log(
+                    self.tr(
+                        f"Cache disabled for project {project.name}. Reloading data."
+                    )
+                )
+            return None
+        return self.read_cached_project_menu_config(project)
+
+    def read_cached_project_menu_config(
+        self, project: Project
+    ) -> Optional[MenuProjectConfig]:
+        """Read menu project configuration from cache, without checking if the cache
+        is up to date
+
         :param project: dict of information about the project
         :type project: Project
         :return: menu project configuration from cache, None if no cache available
         :rtype: Optional[MenuProjectConfig]
         """
+        if self.cache_store:
+            return self.cache_store.get_project_menu_config(project.id)
+
         cache_path = self.get_project_cache_dir(project)
-        if not self.check_if_cache_enabled(project):
+        binary_cache_path = cache_path / "project_config.bin"
+        if binary_cache_path.exists():
+            # Subgroups are decoded when used
+            # Downloaded files are resolved in local download directory
+            project_config = decode_project_menu_config(
+                binary_cache_path.read_bytes(),
+                lazy=True,
+                download_dir=self.get_project_download_dir(project, create=False),
+            )
+            if project_config:
+                return project_config
             self.log(
-                self.tr(f"Cache disabled for project {project.name}. Reloading data.")
+                self.tr(f"Invalid cache format for project {project.name}. Ignored.")
             )
             return None
 
+        # cache saved by previous versions
         json_cache_path = cache_path / "project_config.json"
         if json_cache_path.exists():
             with open(json_cache_path, "r", encoding="UTF-8") as f:
                 data = json.load(f)
-            return MenuProjectConfig.from_dict(data)
+            return MenuProjectConfig.from_dict(data, lazy=True)
         return None
 
+    def get_stale_project_menu_config(
+        self, project: Project
+    ) -> Optional[MenuProjectConfig]:
+        """Get menu project configuration from local cache, or from shared cache if
+        no local cache is available, even if the cache is not up to date. No file is
+        downloaded.
+
+        :param project: dict of information about the project
+        :type project: Project
+        :return: menu project configuration from cache, None if no cache available
+        :rtype: Optional[MenuProjectConfig]
+        """
+        project_config = self.read_cached_project_menu_config(project)
+        if not project_config and self.shared_cache:
+            project_config = self.shared_cache.read_cached_project_menu_config(project)
+        return project_config
+
+    def get_or_create_project_menu_config(
+        self,
+        project: Project,
+        read_project_config: Callable[[], Optional[MenuProjectConfig]],
+        get_project_path: Optional[Callable[[], str]] = None,
+    ) -> Optional[MenuProjectConfig]:
+        """Get menu project configuration from cache, or read it from project and
+        save it in cache if no cache is available.
+
+        A shared cache is used first if available and up to date. Otherwise, local
+        project cache is locked: if another QGIS instance is refreshing the project,
+        its result is waited for and reused.
+
+        :param project: dict of information about the project
+        :type project: Project
+        :param read_project_config: function reading menu project configuration \
+        from project
+        :type read_project_config: Callable[[], Optional[MenuProjectConfig]]
+        :param get_project_path: function returning a local path to project file, \
+        used for source digest, defaults to None
+        :type get_project_path: Optional[Callable[[], str]], optional
+        :return: menu project configuration
+        :rtype: Optional[MenuProjectConfig]
+        """
+        if self.shared_cache and project.cache_config.enable:
+            project_config = self.shared_cache.get_project_menu_config(
+                project, get_project_path
+            )
+            if project_config:
+                self.download_missing_project_file(project_config, get_project_path)
+                return project_config
+
+        project_lock = (
+            self.lock_project_cache(project)
+            if project.cache_config.enable
+            else nullcontext()
+        )
+        with project_lock:
+            project_config = self.get_project_menu_config(project, get_project_path)
+            if project_config:
+                self.touch_project_cache(project)
+                self.download_missing_project_file(project_config, get_project_path)
+                return project_config
+
+            project_config = read_project_config()
+            if project_config:
+                self.save_project_menu_config(
+                    project,
+                    project_config,
+                    get_project_path() if get_project_path else None,
+                )
+        return project_config
+
+    def download_missing_project_file(
+        self,
+        project_config: MenuProjectConfig,
+        get_project_path: Optional[Callable[[], str]],
+    ) -> None:
+        """Download or export a remote project whose cached configuration is used,
+        if not available in local download directory: layers are loaded from it.
+
+        :param project_config: menu project configuration from cache
+        :type project_config: MenuProjectConfig
+        :param get_project_path: function returning a local path to project file, \
+        downloaded or exported if needed
+        :type get_project_path: Optional[Callable[[], str]]
+        """
+        if not get_project_path or Path(project_config.filename).exists():
+            return
+        try:
+            get_project_path()
+        except Exception as e:
+            self.log(
+                self.tr(
+                    f"Can't get project file {project_config.uri} used to load "
+                    f"layers : {e}"
+                )
+            )
+
     def save_project_menu_config(
-        self, project: Project, project_config: MenuProjectConfig
+        self,
+        project: Project,
+        project_config: MenuProjectConfig,
+        project_path: Optional[str] = None,
     ) -> None:
-        """Save menu project configuration in cache
+        """Save menu project configuration in cache, in binary cache format. A JSON
+        export is also written if enabled.
+
+        If a local path to project file is given, a digest of project and embedded
+        project files is stored in cache info.
 
         :param project: dict of information about the project
         :type project: Project
         :param project_config: menu project configuration
         :type project_config: MenuProjectConfig
+        :param project_path: local path to project file, defaults to None
+        :type project_path: Optional[str], optional
         """
-        cache_path = self.get_project_cache_dir(project)
-        json_cache_path = cache_path / "project_config.json"
-        with open(json_cache_path, "w", encoding="UTF-8") as f:
-            json.dump(asdict(project_config), f, indent=4)
+        cache_info = {}
+        if project_path:
+            source_files = get_embedded_filenames(project_config.root_group)
+            source_digest = compute_source_digest([project_path] + source_files)
+            if source_digest:
+                cache_info = {
+                    "source_digest": source_digest,
+                    "source_files": source_files,
+                }
+
+        if self.cache_store:
+            self.cache_store.save_project_menu_config(
+                project.id, project_config, self._with_last_refresh(cache_info)
+            )
+        else:
+            cache_path = self.get_project_cache_dir(project)
+            binary_cache_path = cache_path / "project_config.bin"
+            atomic_write_bytes(
+                binary_cache_path,
+                encode_project_menu_config(
+                    project_config,
+                    self.get_project_download_dir(project, create=False),
+                ),
+            )
+            self.save_cache_info(project, cache_info)
 
-        cache_info_path = cache_path / "cache_info.json"
-        with open(cache_info_path, "w", encoding="UTF-8") as f:
-            json.dump(
-                {"last_refresh": datetime.now().strftime(self.DATETIME_FORMAT)},
-                f,
-                indent=4,
+        # JSON is only a debug export, not read if binary cache is available
+        if self.json_export:
+            atomic_write_text(
+                self.get_project_cache_dir(project) / "project_config.json",
+                json.dumps(asdict(project_config), indent=4),
+            )
+        elif not self.cache_store:
+            (self.get_project_cache_dir(project) / "project_config.json").unlink(
+                missing_ok=True
             )
 
+    def save_cache_info(self, project: Project, cache_info: dict) -> None:
+        """Save cache info with current date as last refresh
+
+        :param project: dict of information about the project
+        :type project: Project
+        :param cache_info: cache info
+        :type cache_info: dict
+        """
+        if self.cache_store:
+            self.cache_store.save_cache_info(
+                project.id, self._with_last_refresh(cache_info)
+            )
+            return
+
+        cache_info_path = self.get_project_cache_dir(project) / "cache_info.json"
+        atomic_write_text(
+            cache_info_path, json.dumps(self._with_last_refresh(cache_info), indent=4)
+        )
+
+    def _with_last_refresh(self, cache_info: dict) -> dict:
+        """Return cache info with current date as last refresh
+
+        :param cache_info: cache info
+        :type cache_info: dict
+        :return: cache info with last refresh
+        :rtype: dict
+        """
+        return {
+            **cache_info,
+            "last_refresh": datetime.now().strftime(self.DATETIME_FORMAT),
+        }
+
+    @contextmanager
+    def lock_project_cache(self, project: Project) -> Iterator[bool]:
+        """Lock project cache against other QGIS instances, while the project is
+        refreshed. Wait for a refresh by another instance if the lock is already
+        taken.
+
+        Lock is advisory: cache files can still be read by other instances, their
+        writes are atomic.
+
+        :param project: project
+        :type project: Project
+        :return: context manager giving True if lock was acquired, False if waiting \
+        time exceeded
+        :rtype: Iterator[bool]
+        """
+        lock_file = QLockFile(str(self.get_project_lock_path(project)))
+        lock_file.setStaleLockTime(self.LOCK_STALE_TIME_MS)
+        locked = lock_file.tryLock(self.LOCK_TIMEOUT_MS)
+        if not locked:
+            self.log(
+                self.tr(
+                    f"Cache of project {project.name} still locked by another "
+                    "instance. Refreshing anyway."
+                )
+            )
+        try:
+            yield locked
+        finally:
+            if locked:
+                lock_file.unlock()
+
+    def touch_project_cache(self, project: Project) -> None:
+        """Mark project cache as used now, for least recently used eviction of
+        caches: project in SQLite store, or project cache directory
+
+        :param project: project
+        :type project: Project
+        """
+        if self.cache_store:
+            self.cache_store.touch_project(project.id)
+            return
+        try:
+            os.utime(self.get_project_cache_dir(project))
+        except OSError:
+            pass
+
+    def get_project_lock_path(self, project: Project) -> Path:
+        """Get project cache lock file path, outside of project cache directory so
+        that the lock is kept when the cache is cleared. Project cache directory is
+        not created: it is not used by SQLite store.
+
+        :param project: project
+        :type project: Project
+        :return: path to project cache lock file
+        :rtype: Path
+        """
+        cache_dir = self.cache_dir or get_local_cache_dir()
+        if not self.read_only:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+        return cache_dir / f"{project.id}.lock"
+
     def get_project_cache_dir(self, project: Project) -> Path:
-        """Get local project cache directory
+        """Get project cache directory, created unless cache is read-only.
+
+        A read-only cache without directory for the project id is looked up with
+        the id computed from project URI, as prebuilt for projects given by URI.
 
         :param project: dict of information about the project
         :type project: Project
@@ -285,23 +738,31 @@ class CacheManager:
         :return: path to project cache directory
         :rtype: Path
         """
-        cache_path = Path(QgsApplication.qgisSettingsDirPath())
-        cache_path = cache_path / "cache" / "menu_from_project" / project.id
-        cache_path.mkdir(parents=True, exist_ok=True)
+        cache_dir = self.cache_dir or get_local_cache_dir()
+        cache_path = cache_dir / project.id
+        if not self.read_only:
+            cache_path.mkdir(parents=True, exist_ok=True)
+        elif not cache_path.exists() and project.file:
+            uri_cache_path = cache_dir / get_uri_project_id(project.file)
+            if uri_cache_path.exists():
+                cache_path = uri_cache_path
 
         return cache_path
 
-    def get_project_download_dir(self, project: Project) -> Path:
-        """Get local project cache download directory
+    def get_project_download_dir(self, project: Project, create: bool = True) -> Path:
+        """Get local project cache download directory, in the cache directory of
+        current QGIS profile even for a read-only cache
 
         :param project: dict of information about the project
         :type project: Project
+        :param create: create directory if it doesn't exist, defaults to True
+        :type create: bool, optional
 
         :return: path to project cache directory
         :rtype: Path
         """
-        cache_path = self.get_project_cache_dir(project)
-        cache_path = cache_path / "downloads"
-        cache_path.mkdir(parents=True, exist_ok=True)
+        cache_path = get_local_cache_dir() / project.id / PROJECT_DOWNLOAD_DIR
+        if create:
+            cache_path.mkdir(parents=True, exist_ok=True)
 
         return cache_path
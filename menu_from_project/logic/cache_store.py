@@ -0,0 +1,505 @@
+#! python3  # noqa: E265
+
+"""
+SQLite store of project menu configuration cache.
+
+A single database holds projects, groups and layers of all cached projects, with
+refresh metadata. The configuration of a project is replaced in one transaction.
+"""
+
+# Standard library
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# PyQGIS
+from qgis.core import QgsApplication, QgsMapLayerType, QgsWkbTypes
+
+# project
+from menu_from_project.datamodel.project_config import (
+    MenuGroupConfig,
+    MenuLayerConfig,
+    MenuProjectConfig,
+)
+from menu_from_project.logic.cache_format import enum_to_int, int_to_enum
+
+# ############################################################################
+# ########## Globals ###############
+# ##################################
+
+CACHE_STORAGE_FILES = "files"
+CACHE_STORAGE_SQLITE = "sqlite"
+
+# Time to wait for a write by another QGIS instance, in seconds
+CACHE_STORE_BUSY_TIMEOUT = 30.0
+
+# Increase version on each schema change: older databases are recreated
+CACHE_STORE_SCHEMA_VERSION = 2
+
+CACHE_STORE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    id TEXT PRIMARY KEY,
+    project_name TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    uri TEXT NOT NULL,
+    cache_info TEXT NOT NULL,
+    last_use REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS groups (
+    id INTEGER PRIMARY KEY,
+    project_id TEXT NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    parent_id INTEGER,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    embedded INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS groups_project_idx ON groups(project_id);
+CREATE TABLE IF NOT EXISTS layers (
+    project_id TEXT NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    group_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    layer_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    visible INTEGER NOT NULL,
+    expanded INTEGER NOT NULL,
+    embedded INTEGER NOT NULL,
+    is_spatial INTEGER NOT NULL,
+    layer_type INTEGER NOT NULL,
+    metadata_abstract TEXT NOT NULL,
+    metadata_title TEXT NOT NULL,
+    layer_notes TEXT NOT NULL,
+    abstract TEXT NOT NULL,
+    title TEXT NOT NULL,
+    geometry_type INTEGER NOT NULL,
+    version TEXT NOT NULL,
+    format TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS layers_project_idx ON layers(project_id, layer_id);
+"""
+
+LAYER_COLUMNS = (
+    "layer_id, name, filename, visible, expanded, embedded, is_spatial, layer_type, "
+    "metadata_abstract, metadata_title, layer_notes, abstract, title, "
+    "geometry_type, version, format"
+)
+
+# Stores shared by cache managers, by database path
+_stores: Dict[str, "SqliteCacheStore"] = {}
+_stores_lock = threading.Lock()
+
+# ############################################################################
+# ########## Functions #############
+# ##################################
+
+
+def get_default_cache_store_path() -> Path:
+    """Return path of the cache database in QGIS profile
+
+    :return: path to cache database
+    :rtype: Path
+    """
+    cache_path = Path(QgsApplication.qgisSettingsDirPath()) / "cache"
+    return cache_path / "menu_from_project" / "cache.sqlite"
+
+
+def get_cache_store(path: Optional[Path] = None) -> "SqliteCacheStore":
+    """Return the cache store of a database, opened once and shared
+
+    :param path: path to cache database, defaults to database in QGIS profile
+    :type path: Optional[Path], optional
+    :return: cache store
+    :rtype: SqliteCacheStore
+    """
+    path = path or get_default_cache_store_path()
+    with _stores_lock:
+        if str(path) not in _stores:
+            _stores[str(path)] = SqliteCacheStore(path)
+        return _stores[str(path)]
+
+
+def _layer_from_row(row: Tuple) -> MenuLayerConfig:
+    """Create layer configuration from a row of layers table
+
+    :param row: row with LAYER_COLUMNS
+    :type row: Tuple
+    :return: layer configuration
+    :rtype: MenuLayerConfig
+    """
+    (
+        layer_id,
+        name,
+        filename,
+        visible,
+        expanded,
+        embedded,
+        is_spatial,
+        layer_type,
+        metadata_abstract,
+        metadata_title,
+        layer_notes,
+        abstract,
+        title,
+        geometry_type,
+        version,
+        layer_format,
+    ) = row
+    return MenuLayerConfig(
+        name=name,
+        layer_id=layer_id,
+        filename=filename,
+        visible=bool(visible),
+        expanded=bool(expanded),
+        embedded=bool(embedded),
+        is_spatial=bool(is_spatial),
+        layer_type=int_to_enum(layer_type, QgsMapLayerType),
+        metadata_abstract=metadata_abstract,
+        metadata_title=metadata_title,
+        layer_notes=layer_notes,
+        abstract=abstract,
+        title=title,
+        geometry_type=int_to_enum(geometry_type, QgsWkbTypes.GeometryType),
+        version=version,
+        format=layer_format,
+    )
+
+
+# ############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class SqliteCacheStore:
+    """Cache of project menu configurations in a SQLite database.
+
+    The connection is shared by threads, queries are serialized.
+
+    :param path: path to cache database
+    :type path: Path
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            str(self.path), timeout=CACHE_STORE_BUSY_TIMEOUT, check_same_thread=False
+        )
+        # Other QGIS instances can read while a project is replaced
+        self._connection.execute("PRAGMA journal_mode = WAL")
+        self._connection.execute("PRAGMA foreign_keys = ON")
+        self._create_schema()
+
+    def _create_schema(self) -> None:
+        """Create tables, database with another schema version is recreated"""
+        with self._lock, self._connection:
+            (version,) = self._connection.execute("PRAGMA user_version").fetchone()
+            if version != CACHE_STORE_SCHEMA_VERSION:
+                for table in ("layers", "groups", "projects"):
+                    self._connection.execute(f"DROP TABLE IF EXISTS {table}")
+            self._connection.executescript(CACHE_STORE_SCHEMA)
+            self._connection.execute(
+                f"PRAGMA user_version = {CACHE_STORE_SCHEMA_VERSION}"
+            )
+
+    def close(self) -> None:
+        """Close database connection"""
+        with _stores_lock:
+            _stores.pop(str(self.path), None)
+        with self._lock:
+            self._connection.close()
+
+    def get_cache_info(self, project_id: str) -> dict:
+        """Return cache info of a project, empty dict if project is not cached
+
+        :param project_id: project id
+        :type project_id: str
+        :return: cache info
+        :rtype: dict
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT cache_info FROM projects WHERE id = ?", (project_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else {}
+
+    def save_cache_info(self, project_id: str, cache_info: dict) -> None:
+        """Update cache info of a cached project
+
+        :param project_id: project id
+        :type project_id: str
+        :param cache_info: cache info
+        :type cache_info: dict
+        """
+        with self._lock, self._connection:
+            self._connection.execute(
+                "UPDATE projects SET cache_info = ? WHERE id = ?",
+                (json.dumps(cache_info), project_id),
+            )
+
+    def save_project_menu_config(
+        self, project_id: str, project_config: MenuProjectConfig, cache_info: dict
+    ) -> None:
+        """Replace cached configuration of a project in a single transaction
+
+        :param project_id: project id
+        :type project_id: str
+        :param project_config: menu project configuration
+        :type project_config: MenuProjectConfig
+        :param cache_info: cache info
+        :type cache_info: dict
+        """
+        groups: List[Tuple] = []
+        layers: List[Tuple] = []
+        self._flatten_group(
+            project_config.root_group, project_id, None, 0, groups, layers
+        )
+        with self._lock, self._connection:
+            # groups and layers are deleted in cascade
+            self._connection.execute("DELETE FROM projects WHERE id = ?", (project_id,))
+            self._connection.execute(
+                "INSERT INTO projects VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    project_id,
+                    project_config.project_name,
+                    project_config.filename,
+                    project_config.uri,
+                    json.dumps(cache_info),
+                    time.time(),
+                ),
+            )
+            # group ids are allocated from current max to keep them unique
+            (max_group_id,) = self._connection.execute(
+                "SELECT COALESCE(MAX(id), 0) FROM groups"
+            ).fetchone()
+            self._connection.executemany(
+                "INSERT INTO groups VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        group_id + max_group_id,
+                        project_id,
+                        None if parent_id is None else parent_id + max_group_id,
+                        *values,
+                    )
+                    for group_id, _, parent_id, *values in groups
+                ],
+            )
+            self._connection.executemany(
+                f"INSERT INTO layers (project_id, group_id, position, {LAYER_COLUMNS}) "
+                f"VALUES ({', '.join('?' * 19)})",
+                [
+                    (project_id, group_id + max_group_id, *values)
+                    for _, group_id, *values in layers
+                ],
+            )
+
+    def _flatten_group(
+        self,
+        group: MenuGroupConfig,
+        project_id: str,
+        parent_id: Optional[int],
+        position: int,
+        groups: List[Tuple],
+        layers: List[Tuple],
+    ) -> None:
+        """Append rows of a group and its childs, group ids start from 1
+
+        :param group: group configuration
+        :type group: MenuGroupConfig
+        :param project_id: project id
+        :type project_id: str
+        :param parent_id: parent group id, None for root group
+        :type parent_id: Optional[int]
+        :param position: position in parent group
+        :type position: int
+        :param groups: group rows
+        :type groups: List[Tuple]
+        :param layers: layer rows
+        :type layers: List[Tuple]
+        """
+        group_id = len(groups) + 1
+        groups.append(
+            (
+                group_id,
+                project_id,
+                parent_id,
+                position,
+                group.name,
+                group.filename,
+                bool(group.embedded),
+            )
+        )
+        for child_position, child in enumerate(group.childs):
+            if isinstance(child, MenuGroupConfig):
+                self._flatten_group(
+                    child, project_id, group_id, child_position, groups, layers
+                )
+            else:
+                layers.append(
+                    (
+                        project_id,
+                        group_id,
+                        child_position,
+                        child.layer_id,
+                        child.name,
+                        child.filename,
+                        bool(child.visible),
+                        bool(child.expanded),
+                        bool(child.embedded),
+                        bool(child.is_spatial),
+                        enum_to_int(child.layer_type),
+                        child.metadata_abstract,
+                        child.metadata_title,
+                        child.layer_notes,
+                        child.abstract,
+                        child.title,
+                        enum_to_int(child.geometry_type),
+                        child.version,
+                        child.format,
+                    )
+                )
+
+    def get_project_menu_config(self, project_id: str) -> Optional[MenuProjectConfig]:
+        """Return cached configuration of a project
+
+        :param project_id: project id
+        :type project_id: str
+        :return: menu project configuration, None if project is not cached
+        :rtype: Optional[MenuProjectConfig]
+        """
+        with self._lock:
+            project_row = self._connection.execute(
+                "SELECT project_name, filename, uri FROM projects WHERE id = ?",
+                (project_id,),
+            ).fetchone()
+            if not project_row:
+                return None
+            group_rows = self._connection.execute(
+                "SELECT id, parent_id, position, name, filename, embedded "
+                "FROM groups WHERE project_id = ? ORDER BY id",
+                (project_id,),
+            ).fetchall()
+            layer_rows = self._connection.execute(
+                f"SELECT group_id, position, {LAYER_COLUMNS} "
+                "FROM layers WHERE project_id = ?",
+                (project_id,),
+            ).fetchall()
+
+        # childs of each group, with their position
+        childs: Dict[int, List[Tuple[int, object]]] = {}
+        groups: Dict[int, MenuGroupConfig] = {}
+        root_group = None
+        for group_id, parent_id, position, name, filename, embedded in group_rows:
+            group = MenuGroupConfig(
+                name=name, filename=filename, childs=[], embedded=bool(embedded)
+            )
+            groups[group_id] = group
+            if parent_id is None:
+                root_group = group
+            else:
+                childs.setdefault(parent_id, []).append((position, group))
+        for group_id, position, *values in layer_rows:
+            childs.setdefault(group_id, []).append((position, _layer_from_row(values)))
+        for group_id, group_childs in childs.items():
+            group_childs.sort(key=lambda child: child[0])
+            groups[group_id].childs = [child for _, child in group_childs]
+
+        if root_group is None:
+            return None
+        project_name, filename, uri = project_row
+        return MenuProjectConfig(
+            project_name=project_name,
+            filename=filename,
+            uri=uri,
+            root_group=root_group,
+        )
+
+    def get_layer_config(
+        self, project_id: str, layer_id: str
+    ) -> Optional[MenuLayerConfig]:
+        """Return cached configuration of a layer from its id
+
+        :param project_id: project id
+        :type project_id: str
+        :param layer_id: layer id
+        :type layer_id: str
+        :return: layer configuration, None if layer is not cached
+        :rtype: Optional[MenuLayerConfig]
+        """
+        with self._lock:
+            row = self._connection.execute(
+                f"SELECT {LAYER_COLUMNS} FROM layers "
+                "WHERE project_id = ? AND layer_id = ?",
+                (project_id, layer_id),
+            ).fetchone()
+        return _layer_from_row(row) if row else None
+
+    def touch_project(self, project_id: str) -> None:
+        """Mark a cached project as used now, for least recently used eviction
+
+        :param project_id: project id
+        :type project_id: str
+        """
+        with self._lock, self._connection:
+            self._connection.execute(
+                "UPDATE projects SET last_use = ? WHERE id = ?",
+                (time.time(), project_id),
+            )
+
+    def get_project_usages(self) -> List[Tuple[str, float, int]]:
+        """Return last use and estimated size of cached projects. Size is the
+        length of stored texts, without database overhead.
+
+        :return: list of project id, last use timestamp and size in bytes
+        :rtype: List[Tuple[str, float, int]]
+        """
+        layer_size = " + ".join(
+            f"LENGTH({column})"
+            for column in (
+                "layer_id",
+                "name",
+                "filename",
+                "metadata_abstract",
+                "metadata_title",
+                "layer_notes",
+                "abstract",
+                "title",
+                "version",
+                "format",
+            )
+        )
+        with self._lock:
+            return self._connection.execute(
+                "SELECT id, last_use, "
+                "LENGTH(project_name) + LENGTH(filename) + LENGTH(uri) "
+                "+ LENGTH(cache_info) "
+                "+ COALESCE((SELECT SUM(LENGTH(name) + LENGTH(filename)) "
+                "FROM groups WHERE groups.project_id = projects.id), 0) "
+                f"+ COALESCE((SELECT SUM({layer_size}) "
+                "FROM layers WHERE layers.project_id = projects.id), 0) "
+                "FROM projects"
+            ).fetchall()
+
+    def get_project_ids(self) -> List[str]:
+        """Return ids of cached projects
+
+        :return: project ids
+        :rtype: List[str]
+        """
+        with self._lock:
+            rows = self._connection.execute("SELECT id FROM projects").fetchall()
+        return [project_id for (project_id,) in rows]
+
+    def remove_project(self, project_id: str) -> None:
+        """Remove cached configuration of a project
+
+        :param project_id: project id
+        :type project_id: str
+        """
+        with self._lock, self._connection:
+            # groups and layers are deleted in cascade
+            self._connection.execute("DELETE FROM projects WHERE id = ?", (project_id,))
@@ -0,0 +1,202 @@
+#! python3  # noqa: E265
+
+"""
+Memory bounded cache of QGIS project XML documents.
+"""
+
+# Standard library
+import os
+import threading
+import zipfile
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+# PyQGIS
+from qgis.PyQt import QtXml
+
+# ############################################################################
+# ########## Globals ###############
+# ##################################
+
+# Rough ratio between QDomDocument memory and XML text size
+DOM_SIZE_FACTOR = 5
+
+# ############################################################################
+# ########## Functions #############
+# ##################################
+
+
+def estimate_document_size(project_path: str) -> int:
+    """Estimate memory used by the QDomDocument of a project file.
+
+    Estimation is based on the size of .qgs XML content (uncompressed size for .qgz).
+
+    :param project_path: path to .qgs or .qgz file
+    :type project_path: str
+    :return: estimated size in bytes, 0 if file is not available
+    :rtype: int
+    """
+    try:
+        if Path(project_path).suffix.lower() == ".qgz":
+            with zipfile.ZipFile(project_path, "r") as zip_ref:
+                xml_size = sum(
+                    info.file_size
+                    for info in zip_ref.infolist()
+                    if info.filename.lower().endswith(".qgs")
+                )
+        else:
+            xml_size = os.path.getsize(project_path)
+    except (OSError, zipfile.BadZipFile):
+        return 0
+    return xml_size * DOM_SIZE_FACTOR
+
+
+def file_fingerprint(path: str) -> Optional[Tuple[int, int, int]]:
+    """Return a cheap fingerprint of a local file to detect changes.
+
+    :param path: path to file
+    :type path: str
+    :return: modification time (ns), size and inode, None if file is not available
+    :rtype: Optional[Tuple[int, int, int]]
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+# ############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+@dataclass
+class CachedDocument:
+    """Project XML document stored in cache."""
+
+    doc: QtXml.QDomDocument
+    project_path: str
+    size: int
+    map_layer_index: Optional[Dict[str, QtXml.QDomNode]] = None
+    fingerprint: Optional[Tuple[int, int, int]] = None
+
+
+class DocumentCache:
+    """LRU cache of project XML documents with a memory budget.
+
+    Least recently used documents are evicted when the estimated size of cached
+    documents exceeds the budget. The last stored document is always kept.
+
+    :param max_bytes: memory budget in bytes
+    :type max_bytes: int
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._documents: "OrderedDict[str, CachedDocument]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(
+        self, key: str, fingerprint: Optional[Tuple[int, int, int]] = None
+    ) -> Optional[CachedDocument]:
+        """Return cached document for a key, None if not available
+
+        If a fingerprint is given, a cached document with another fingerprint is
+        outdated: it is removed from cache and None is returned.
+
+        :param key: document key (project uri)
+        :type key: str
+        :param fingerprint: current fingerprint of document source, defaults to None
+        :type fingerprint: Optional[Tuple[int, int, int]], optional
+        :return: cached document
+        :rtype: Optional[CachedDocument]
+        """
+        with self._lock:
+            document = self._documents.get(key)
+            if document and fingerprint and document.fingerprint != fingerprint:
+                del self._documents[key]
+                self.size -= document.size
+                self.invalidations += 1
+                document = None
+            if document is None:
+                self.misses += 1
+                return None
+            self._documents.move_to_end(key)
+            self.hits += 1
+            return document
+
+    def put(self, key: str, document: CachedDocument) -> None:
+        """Store a document in cache and evict least recently used documents if needed
+
+        :param key: document key (project uri)
+        :type key: str
+        :param document: document to store
+        :type document: CachedDocument
+        """
+        with self._lock:
+            previous = self._documents.pop(key, None)
+            if previous:
+                self.size -= previous.size
+            self._documents[key] = document
+            self.size += document.size
+            self._evict()
+
+    def remove(self, key: str) -> None:
+        """Remove a document from cache
+
+        :param key: document key (project uri)
+        :type key: str
+        """
+        with self._lock:
+            document = self._documents.pop(key, None)
+            if document:
+                self.size -= document.size
+
+    def clear(self) -> None:
+        """Remove all documents from cache"""
+        with self._lock:
+            self._documents.clear()
+            self.size = 0
+
+    def set_max_bytes(self, max_bytes: int) -> None:
+        """Define memory budget, documents are evicted if needed
+
+        :param max_bytes: memory budget in bytes
+        :type max_bytes: int
+        """
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def stats(self) -> Dict[str, int]:
+        """Return cache counters
+
+        :return: dict with hits, misses, evictions, invalidations, entries, size and max_bytes
+        :rtype: Dict[str, int]
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "entries": len(self._documents),
+                "size": self.size,
+                "max_bytes": self.max_bytes,
+            }
+
+    def _evict(self) -> None:
+        """Evict least recently used documents until budget is respected.
+        Must be called with lock acquired."""
+        while self.size > self.max_bytes and len(self._documents) > 1:
+            _, document = self._documents.popitem(last=False)
+            self.size -= document.size
+            self.evictions += 1
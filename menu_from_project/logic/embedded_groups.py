@@ -0,0 +1,103 @@
+#! python3  # noqa: E265
+
+"""
+Embedded group configurations resolved during a refresh.
+"""
+
+# Standard library
+import os
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+# PyQGIS
+from qgis.core import QgsMessageLog
+
+# project
+from menu_from_project.__about__ import __title__
+from menu_from_project.datamodel.project_config import MenuGroupConfig
+
+# ############################################################################
+# ########## Functions #############
+# ##################################
+
+
+def canonical_path(filename: str) -> str:
+    """Return canonical path of a local project file, to identify a project
+    referenced with different relative paths.
+
+    :param filename: path to project file
+    :type filename: str
+    :return: canonical path
+    :rtype: str
+    """
+    return os.path.normcase(os.path.realpath(filename))
+
+
+# ############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class EmbeddedGroupConfigs:
+    """Embedded group configurations by canonical project file and group name.
+
+    A group embedded many times is read only once. Can be shared by threads reading
+    projects: groups being resolved are tracked by thread to detect projects
+    embedding each other.
+    """
+
+    def __init__(self) -> None:
+        self.configs: Dict[Tuple[str, str], Optional[MenuGroupConfig]] = {}
+        self._local = threading.local()
+
+    def _resolving(self) -> List[Tuple[str, str]]:
+        """Return groups being resolved by current thread
+
+        :return: list of (canonical file, group name)
+        :rtype: List[Tuple[str, str]]
+        """
+        if not hasattr(self._local, "resolving"):
+            self._local.resolving = []
+        return self._local.resolving
+
+    def get(
+        self,
+        filename: str,
+        group_name: str,
+        read_group: Callable[[], Optional[MenuGroupConfig]],
+    ) -> Optional[MenuGroupConfig]:
+        """Return configuration of an embedded group, read_group is called only if
+        the group was not already resolved.
+
+        None is returned if the group is already being resolved: projects embed each
+        other.
+
+        :param filename: embedded filename
+        :type filename: str
+        :param group_name: embedded group name
+        :type group_name: str
+        :param read_group: function reading group configuration
+        :type read_group: Callable[[], Optional[MenuGroupConfig]]
+        :return: Optional menu group configuration
+        :rtype: Optional[MenuGroupConfig]
+        """
+        key = (canonical_path(filename), group_name)
+        if key in self.configs:
+            return self.configs[key]
+
+        resolving = self._resolving()
+        if key in resolving:
+            QgsMessageLog.logMessage(
+                f"Menu from layer: embedded group '{group_name}' of {filename} embeds itself. Group ignored.",
+                __title__,
+                notifyUser=True,
+            )
+            return None
+
+        resolving.append(key)
+        try:
+            config = read_group()
+        finally:
+            resolving.pop()
+        self.configs[key] = config
+        return config
@@ -0,0 +1,328 @@
+#! python3  # noqa: E265
+
+"""
+Concurrent HTTP downloads revalidated with ETag / Last-Modified validators.
+"""
+
+# Standard library
+import json
+import os
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import Deque, Dict, List, Optional
+
+# PyQGIS
+from qgis.core import QgsMessageLog, QgsNetworkAccessManager
+from qgis.PyQt.QtCore import QEventLoop, QObject, QUrl, pyqtSignal
+from qgis.PyQt.QtNetwork import QNetworkReply, QNetworkRequest
+
+# project
+from menu_from_project.__about__ import __title__
+from menu_from_project.logic.atomic_file import atomic_write_bytes, atomic_write_text
+
+# ############################################################################
+# ########## Globals ###############
+# ##################################
+
+# Suffix of the file storing validators next to a downloaded file
+VALIDATORS_SUFFIX = ".validators.json"
+
+HTTP_OK = 200
+HTTP_NOT_MODIFIED = 304
+
+DEFAULT_MAX_CONNECTIONS_PER_HOST = 4
+DEFAULT_TIMEOUT_MS = 30000
+
+# ############################################################################
+# ########## Functions #############
+# ##################################
+
+
+def get_validators_path(filepath: Path) -> Path:
+    """Return path of the file storing validators of a downloaded file
+
+    :param filepath: downloaded file
+    :type filepath: Path
+    :return: path to validators file
+    :rtype: Path
+    """
+    return filepath.with_name(filepath.name + VALIDATORS_SUFFIX)
+
+
+def read_validators(filepath: Path) -> Dict[str, str]:
+    """Read validators stored for a downloaded file.
+
+    Validators are ignored if the downloaded file is not available anymore.
+
+    :param filepath: downloaded file
+    :type filepath: Path
+    :return: dict with "etag" and "last_modified" keys if available
+    :rtype: Dict[str, str]
+    """
+    validators_path = get_validators_path(filepath)
+    if not filepath.exists() or not validators_path.exists():
+        return {}
+    try:
+        with open(validators_path, encoding="UTF-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def get_last_validation(filepath: Path) -> float:
+    """Return time of last download or revalidation of a downloaded file
+
+    :param filepath: downloaded file
+    :type filepath: Path
+    :return: timestamp, 0 if file is not available
+    :rtype: float
+    """
+    last_validation = 0.0
+    for path in (filepath, get_validators_path(filepath)):
+        try:
+            last_validation = max(last_validation, path.stat().st_mtime)
+        except OSError:
+            continue
+    return last_validation
+
+
+def write_validators(filepath: Path, validators: Dict[str, str]) -> None:
+    """Store validators of a downloaded file. File is removed if no validators are
+    available.
+
+    :param filepath: downloaded file
+    :type filepath: Path
+    :param validators: dict with "etag" and "last_modified" keys if available
+    :type validators: Dict[str, str]
+    """
+    validators_path = get_validators_path(filepath)
+    if not validators:
+        validators_path.unlink(missing_ok=True)
+        return
+    atomic_write_text(validators_path, json.dumps(validators, indent=4))
+
+
+def create_conditional_request(
+    url: str, filepath: Path, timeout: int
+) -> QNetworkRequest:
+    """Create a request for an URL, with validators of a previous download.
+
+    :param url: URL to download
+    :type url: str
+    :param filepath: local file
+    :type filepath: Path
+    :param timeout: transfer timeout in milliseconds
+    :type timeout: int
+    :return: network request
+    :rtype: QNetworkRequest
+    """
+    request = QNetworkRequest(QUrl(url))
+    request.setAttribute(
+        QNetworkRequest.Attribute.RedirectPolicyAttribute,
+        QNetworkRequest.RedirectPolicy.NoLessSafeRedirectPolicy,
+    )
+    request.setAttribute(
+        QNetworkRequest.Attribute.CacheLoadControlAttribute,
+        QNetworkRequest.CacheLoadControl.AlwaysNetwork,
+    )
+    request.setAttribute(QNetworkRequest.Attribute.CacheSaveControlAttribute, False)
+    request.setTransferTimeout(timeout)
+    validators = read_validators(filepath)
+    if "etag" in validators:
+        request.setRawHeader(b"If-None-Match", validators["etag"].encode())
+    if "last_modified" in validators:
+        request.setRawHeader(
+            b"If-Modified-Since", validators["last_modified"].encode()
+        )
+    return request
+
+
+def conditional_download(
+    url: str, filepath: Path, timeout: int = DEFAULT_TIMEOUT_MS
+) -> bool:
+    """Download an URL into a local file, using validators of a previous download.
+
+    If-None-Match / If-Modified-Since headers are sent when validators are available.
+    On a 304 response the local copy is kept. On error, an available local copy is
+    also kept.
+
+    :param url: URL to download
+    :type url: str
+    :param filepath: local file
+    :type filepath: Path
+    :param timeout: transfer timeout in milliseconds, defaults to DEFAULT_TIMEOUT_MS
+    :type timeout: int, optional
+    :return: True if the local file was written, False if the local copy is kept
+    :rtype: bool
+    """
+    download_manager = DownloadManager(timeout=timeout)
+    download = download_manager.add(url, filepath)
+    download_manager.wait()
+    return download.modified
+
+
+# ############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+@dataclass
+class Download:
+    """Download of an URL into a local file"""
+
+    url: str
+    filepath: Path
+    finished: bool = False
+    modified: bool = False
+    error: str = ""
+    reply: Optional[QNetworkReply] = field(default=None, repr=False)
+
+
+class DownloadManager(QObject):
+    """Run many downloads concurrently with QgsNetworkAccessManager.
+
+    Downloads are started when added, with a limit of connections per host. Requests
+    use validators of previous downloads. wait() runs a single event loop until all
+    downloads are finished.
+
+    :param max_connections_per_host: maximum number of requests in flight for a host
+    :type max_connections_per_host: int
+    :param timeout: transfer timeout in milliseconds
+    :type timeout: int
+    """
+
+    # number of finished downloads, total number of downloads
+    progress = pyqtSignal(int, int)
+
+    def __init__(
+        self,
+        max_connections_per_host: int = DEFAULT_MAX_CONNECTIONS_PER_HOST,
+        timeout: int = DEFAULT_TIMEOUT_MS,
+        parent: Optional[QObject] = None,
+    ) -> None:
+        super().__init__(parent)
+        self.max_connections_per_host = max(1, max_connections_per_host)
+        self.timeout = timeout
+        self.downloads: List[Download] = []
+        self._pending: Dict[str, Deque[Download]] = defaultdict(deque)
+        self._running: Dict[str, int] = defaultdict(int)
+        self._loop: Optional[QEventLoop] = None
+
+    def add(self, url: str, filepath: Path) -> Download:
+        """Add a download, started as soon as a connection is available for its host
+
+        :param url: URL to download
+        :type url: str
+        :param filepath: local file
+        :type filepath: Path
+        :return: download, updated when finished
+        :rtype: Download
+        """
+        download = Download(url=url, filepath=Path(filepath))
+        self.downloads.append(download)
+        host = QUrl(url).host()
+        self._pending[host].append(download)
+        self._start_pending(host)
+        return download
+
+    def nb_finished(self) -> int:
+        """Return number of finished downloads
+
+        :return: number of finished downloads
+        :rtype: int
+        """
+        return sum(1 for download in self.downloads if download.finished)
+
+    def wait(self) -> None:
+        """Wait until all downloads are finished"""
+        if self.nb_finished() < len(self.downloads):
+            self._loop = QEventLoop()
+            self._loop.exec()
+            self._loop = None
+
+    def _start_pending(self, host: str) -> None:
+        """Start pending downloads of a host while connections are available
+
+        :param host: host
+        :type host: str
+        """
+        pending = self._pending[host]
+        while pending and self._running[host] < self.max_connections_per_host:
+            download = pending.popleft()
+            self._running[host] += 1
+            request = create_conditional_request(
+                download.url, download.filepath, self.timeout
+            )
+            download.reply = QgsNetworkAccessManager.instance().get(request)
+            download.reply.finished.connect(partial(self._on_finished, download))
+
+    def _on_finished(self, download: Download) -> None:
+        """Save downloaded content and start next download of the host
+
+        :param download: finished download
+        :type download: Download
+        """
+        reply = download.reply
+        self._save_reply(download, reply)
+        reply.deleteLater()
+        download.reply = None
+        download.finished = True
+
+        host = QUrl(download.url).host()
+        self._running[host] -= 1
+        self._start_pending(host)
+
+        nb_finished = self.nb_finished()
+        self.progress.emit(nb_finished, len(self.downloads))
+        if self._loop and nb_finished == len(self.downloads):
+            self._loop.quit()
+
+    @staticmethod
+    def _save_reply(download: Download, reply: QNetworkReply) -> None:
+        """Write reply content and validators in local file. The local copy is kept
+        on a 304 response, on error or on any other response than 200.
+
+        :param download: download
+        :type download: Download
+        :param reply: network reply
+        :type reply: QNetworkReply
+        """
+        if reply.error() != QNetworkReply.NetworkError.NoError:
+            download.error = reply.errorString()
+            QgsMessageLog.logMessage(
+                f"Download error. {download.url} : {download.error}",
+                __title__,
+                notifyUser=True,
+            )
+            return
+
+        status = reply.attribute(QNetworkRequest.Attribute.HttpStatusCodeAttribute)
+        if status == HTTP_NOT_MODIFIED and download.filepath.exists():
+            # Local copy is still valid: validation time is kept on validators
+            try:
+                os.utime(get_validators_path(download.filepath))
+            except OSError:
+                pass
+            return
+        if status != HTTP_OK:
+            download.error = f"unexpected HTTP status {status}"
+            QgsMessageLog.logMessage(
+                f"Download error. {download.url} : {download.error}",
+                __title__,
+                notifyUser=True,
+            )
+            return
+
+        atomic_write_bytes(download.filepath, bytes(reply.readAll()))
+        download.modified = True
+
+        validators = {}
+        etag = bytes(reply.rawHeader(b"ETag")).decode()
+        if etag:
+            validators["etag"] = etag
+        last_modified = bytes(reply.rawHeader(b"Last-Modified")).decode()
+        if last_modified:
+            validators["last_modified"] = last_modified
+        write_validators(download.filepath, validators)
@@ -28,7 +28,6 @@ from menu_from_project.logic.qgs_manager import (
     is_absolute,
     project_trusted,
 )
-from menu_from_project.logic.xml_utils import getFirstChildByTagNameValue
 
 # PyQGIS
 from menu_from_project.toolbelt.preferences import PlgOptionsManager
@@ -37,11 +36,16 @@ from menu_from_project.toolbelt.preferences import PlgOptionsManager
 class LayerLoad:
     """Layer loader."""
 
-    def __init__(self) -> None:
-        """Class initialization."""
+    def __init__(self, qgs_dom_manager: Optional[QgsDomManager] = None) -> None:
+        """Class initialization. Settings are read when the loader is created, \
+        loaders must be created when the user asks for a layer load.
+
+        :param qgs_dom_manager: manager to get qgs doc, a new one is created if not defined
+        :type qgs_dom_manager: Optional[QgsDomManager], optional
+        """
         self.canvas = iface.mapCanvas()
-        self.plg_settings = PlgOptionsManager()
-        self.qgs_dom_manager = QgsDomManager()
+        self.settings = PlgOptionsManager.get_settings_snapshot()
+        self.qgs_dom_manager = qgs_dom_manager or QgsDomManager()
         self.mapLayerIds = {}
 
     # TODO: until a log manager is implemented
@@ -90,15 +94,13 @@ class LayerLoad:
         """
         theLayer = None
 
-        settings = self.plg_settings.get_plg_settings()
+        settings = self.settings
 
         # is project in relative path ?
         absolute = is_absolute(doc)
         trusted = project_trusted(doc)
 
-        node = getFirstChildByTagNameValue(
-            doc.documentElement(), "maplayer", "id", layerId
-        )
+        node = self.qgs_dom_manager.getMapLayerDomFromQgs(uri, layerId)
         if node:
             node = node.cloneNode()
 
@@ -274,7 +276,7 @@ class LayerLoad:
 
     def fixForm(
         self,
-        doc: QtXml.QDomDocument,
+        uri: str,
         newLayerId: str,
         oldRelationId: str,
         newRelationId: str,
@@ -283,8 +285,8 @@ class LayerLoad:
 
         Principle: reading the source XML document, updating identifiers, updating editFormConfig
 
-        :param doc: The QGIS project as XML document.
-        :type doc: QtXml.QDomDocument
+        :param uri: path to QgsProject file of the XML document
+        :type uri: str
         :param newLayerId: id of created new layer
         :type newLayerId: str
         :param oldRelationId: id of old relation
@@ -295,9 +297,7 @@ class LayerLoad:
         theLayer = QgsProject.instance().mapLayer(newLayerId)
         oldLayerId = self.mapLayerIds[newLayerId]
 
-        layerNode = getFirstChildByTagNameValue(
-            doc.documentElement(), "maplayer", "id", oldLayerId
-        )
+        layerNode = self.qgs_dom_manager.getMapLayerDomFromQgs(uri, oldLayerId)
         if not layerNode:
             self.log("{} not found for form relation fix".format(oldLayerId))
 
@@ -324,13 +324,11 @@ class LayerLoad:
                 editFormConfig.readXml(layerNode, QgsReadWriteContext())
                 theLayer.setEditFormConfig(editFormConfig)
 
-    def buildProjectRelation(
-        self, doc: QtXml.QDomDocument, relDict: Dict[str, str]
-    ) -> None:
+    def buildProjectRelation(self, uri: str, relDict: Dict[str, str]) -> None:
         """Build project relation and add it to QgsProject
 
-        :param doc: The QGIS project as XML document.
-        :type doc: QtXml.QDomDocument
+        :param uri: path to QgsProject file where the relation is defined
+        :type uri: str
         :param relDict: relation dictionnary
         :type relDict: Dict[str, str]
         """
@@ -359,7 +357,7 @@ class LayerLoad:
                 # Adapter le formulaire de la couche referencedLayer
                 try:
                     self.fixForm(
-                        doc,
+                        uri,
                         relDict["referencedLayer"],
                         oldRelationId,
                         newRelationId,
@@ -472,7 +470,7 @@ class LayerLoad:
         QgsApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
         self.mapLayerIds = {}
 
-        settings = self.plg_settings.get_plg_settings()
+        settings = self.settings
 
         try:
             if settings.optionCreateGroup:
@@ -495,7 +493,7 @@ class LayerLoad:
                 0,
             )
             for relDict in relationsToBuild:
-                self.buildProjectRelation(doc, relDict)
+                self.buildProjectRelation(layer_config.filename, relDict)
 
             # is joined layers exists ?
             if settings.optionOpenLinks and layer and isinstance(layer, QgsVectorLayer):
@@ -505,7 +503,7 @@ class LayerLoad:
                             layer_config.filename, doc, j.joinLayerId(), group
                         )
                         for relDict in joinRelations:
-                            self.buildProjectRelation(doc, relDict)
+                            self.buildProjectRelation(layer_config.filename, relDict)
 
                         if joinLayer:
                             j.setJoinLayerId(joinLayer.id())
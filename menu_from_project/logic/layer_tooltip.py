@@ -0,0 +1,111 @@
+#! python3  # noqa: E265
+
+"""
+Resolution of layer title, abstract and tooltip from layer metadata sources.
+
+Tooltips are resolved in the task loading project configurations and stored with
+the layer configuration, menus and browser only assign them. They are resolved
+again only when metadata sources order changes.
+"""
+
+# Standard library
+from typing import Sequence
+
+# project
+from menu_from_project.datamodel.project_config import (
+    LayerTooltip,
+    LazyMenuGroupConfig,
+    MenuGroupConfig,
+    MenuLayerConfig,
+)
+
+# ############################################################################
+# ########## Globals ###############
+# ##################################
+
+SOURCE_MD_OGC = "ogc"
+SOURCE_MD_LAYER = "layer"
+SOURCE_MD_NOTE = "note"
+
+# ############################################################################
+# ########## Functions #############
+# ##################################
+
+
+def resolve_layer_tooltip(
+    layer_config: MenuLayerConfig, source_md: Sequence[str]
+) -> LayerTooltip:
+    """Define layer title, abstract and tooltip from layer configuration and
+    metadata sources order
+
+    :param layer_config: layer configuration
+    :type layer_config: MenuLayerConfig
+    :param source_md: metadata sources, by priority
+    :type source_md: Sequence[str]
+    :return: resolved title, abstract and tooltip
+    :rtype: LayerTooltip
+    """
+    abstract = ""
+    title = ""
+    for oSource in source_md:
+        if oSource == SOURCE_MD_OGC:
+            abstract = layer_config.abstract if abstract == "" else abstract
+            title = title or layer_config.title
+
+        if oSource == SOURCE_MD_LAYER:
+            abstract = layer_config.metadata_abstract if abstract == "" else abstract
+            title = title or layer_config.metadata_title
+
+        if oSource == SOURCE_MD_NOTE:
+            abstract = layer_config.layer_notes if abstract == "" else abstract
+
+    if (abstract != "") and (title == ""):
+        tooltip = "<p>{}</p>".format(abstract)
+    else:
+        if abstract != "" or title != "":
+            tooltip = "<b>{}</b><br/>{}".format(title, abstract)
+        else:
+            tooltip = ""
+    return LayerTooltip(
+        source_md=tuple(source_md), title=title, abstract=abstract, tooltip=tooltip
+    )
+
+
+def get_layer_tooltip(
+    layer_config: MenuLayerConfig, source_md: Sequence[str]
+) -> LayerTooltip:
+    """Return layer tooltip stored with layer configuration, resolved if not
+    available for metadata sources order
+
+    :param layer_config: layer configuration
+    :type layer_config: MenuLayerConfig
+    :param source_md: metadata sources, by priority
+    :type source_md: Sequence[str]
+    :return: resolved title, abstract and tooltip
+    :rtype: LayerTooltip
+    """
+    resolved = layer_config.resolved_tooltip
+    if resolved is None or resolved.source_md != tuple(source_md):
+        resolved = resolve_layer_tooltip(layer_config, source_md)
+        layer_config.resolved_tooltip = resolved
+    return resolved
+
+
+def resolve_group_tooltips(
+    group_config: MenuGroupConfig, source_md: Sequence[str]
+) -> None:
+    """Resolve tooltips of layers in a group and its subgroups. Childs of lazy
+    groups not decoded yet are resolved when displayed.
+
+    :param group_config: group configuration
+    :type group_config: MenuGroupConfig
+    :param source_md: metadata sources, by priority
+    :type source_md: Sequence[str]
+    """
+    for child in group_config.childs:
+        if isinstance(child, LazyMenuGroupConfig) and not child.loaded:
+            continue
+        if isinstance(child, MenuGroupConfig):
+            resolve_group_tooltips(child, source_md)
+        elif isinstance(child, MenuLayerConfig):
+            get_layer_tooltip(child, source_md)
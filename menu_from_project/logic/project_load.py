@@ -0,0 +1,188 @@
+#! python3  # noqa: E265
+
+"""
+Load of projects menu configuration, from cache or from projects. Used by the
+plugin and by the headless cache prebuild.
+"""
+
+# Standard library
+from dataclasses import replace
+from functools import partial
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# PyQGIS
+from qgis.core import QgsMessageLog
+
+# project
+from menu_from_project.__about__ import __title__
+from menu_from_project.datamodel.project import Project
+from menu_from_project.datamodel.project_config import MenuProjectConfig
+from menu_from_project.logic.cache_manager import CacheManager
+from menu_from_project.logic.cache_store import SqliteCacheStore
+from menu_from_project.logic.embedded_groups import EmbeddedGroupConfigs
+from menu_from_project.logic.http_download import DownloadManager
+from menu_from_project.logic.project_stream_read import read_project_menu_config
+from menu_from_project.logic.qgs_manager import QgsDomManager, get_download_filepath
+from menu_from_project.logic.tools import guess_type_from_uri
+from menu_from_project.toolbelt.preferences import PlgSettingsStructure
+
+# ############################################################################
+# ########## Functions #############
+# ##################################
+
+
+def download_remote_files(
+    projects: List[Project],
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> Dict[str, Dict[str, str]]:
+    """Download remote projects and cache validation files concurrently.
+    Previous downloads are revalidated. A cache validation file used by several
+    projects is downloaded once.
+
+    :param projects: projects to load
+    :type projects: List[Project]
+    :param progress: function called with number of finished downloads and number \
+    of downloads, defaults to None
+    :type progress: Optional[Callable[[int, int], None]], optional
+    :return: local path of downloaded files by uri, by project id
+    :rtype: Dict[str, Dict[str, str]]
+    """
+    cache_manager = CacheManager(None)
+    download_manager = DownloadManager()
+    if progress:
+        download_manager.progress.connect(progress)
+
+    downloaded_files = {}
+    validation_files = {}
+    for project in projects:
+        files = {}
+        if guess_type_from_uri(project.file) == "http":
+            try:
+                files[project.file] = get_download_filepath(
+                    project.file, cache_manager.get_project_download_dir(project)
+                )
+                download_manager.add(project.file, files[project.file])
+            except ValueError as e:
+                QgsMessageLog.logMessage(str(e), __title__, notifyUser=True)
+        validation_uri = project.cache_config.cache_validation_uri
+        if project.cache_config.enable and validation_uri.startswith("http"):
+            if validation_uri not in validation_files:
+                validation_files[validation_uri] = (
+                    cache_manager.get_cache_validation_path(validation_uri)
+                )
+                download_manager.add(validation_uri, validation_files[validation_uri])
+            files[validation_uri] = validation_files[validation_uri]
+        if files:
+            downloaded_files[project.id] = {
+                uri: str(filepath) for uri, filepath in files.items()
+            }
+
+    download_manager.wait()
+    return downloaded_files
+
+
+def read_cache_validations(
+    projects: List[Project], downloaded_files: Dict[str, Dict[str, str]]
+) -> Dict[str, dict]:
+    """Read each distinct cache validation file of projects once
+
+    :param projects: projects to load
+    :type projects: List[Project]
+    :param downloaded_files: local path of downloaded files by uri, by project id
+    :type downloaded_files: Dict[str, Dict[str, str]]
+    :return: content of cache validation files, by uri
+    :rtype: Dict[str, dict]
+    """
+    cache_validations = {}
+    for project in projects:
+        validation_uri = project.cache_config.cache_validation_uri
+        if project.cache_config.enable and validation_uri:
+            CacheManager(
+                None,
+                downloaded_files.get(project.id),
+                cache_validations=cache_validations,
+            ).get_cache_validation(validation_uri)
+    return cache_validations
+
+
+def apply_project_name(
+    project: Project, project_config: MenuProjectConfig
+) -> MenuProjectConfig:
+    """Return project config with project name of settings. A cached config keeps
+    the name given when it was cached: a renamed project is not read again. Name
+    defined from project file is kept if project has no name.
+
+    :param project: project
+    :type project: Project
+    :param project_config: project menu config
+    :type project_config: MenuProjectConfig
+    :return: project menu config with project name
+    :rtype: MenuProjectConfig
+    """
+    if not project.name or project.name == project_config.project_name:
+        return project_config
+    return replace(project_config, project_name=project.name)
+
+
+def load_project_config(
+    project: Project,
+    settings: PlgSettingsStructure,
+    downloaded_files: Optional[Dict[str, str]] = None,
+    embedded_groups: Optional[EmbeddedGroupConfigs] = None,
+    cache_store: Optional[SqliteCacheStore] = None,
+    cache_dir: Optional[Path] = None,
+    cache_validations: Optional[Dict[str, dict]] = None,
+) -> Optional[MenuProjectConfig]:
+    """Load a project config from cache, or from project if no cache is available.
+    Can be run in a worker thread.
+
+    :param project: project to load
+    :type project: Project
+    :param settings: plugin settings
+    :type settings: PlgSettingsStructure
+    :param downloaded_files: local path of remote files already downloaded, by uri
+    :type downloaded_files: Optional[Dict[str, str]]
+    :param embedded_groups: embedded group configurations shared by projects
+    :type embedded_groups: Optional[EmbeddedGroupConfigs]
+    :param cache_store: SQLite cache store, project cache files used if None
+    :type cache_store: Optional[SqliteCacheStore]
+    :param cache_dir: directory of project cache files, defaults to the cache \
+    directory of current QGIS profile
+    :type cache_dir: Optional[Path]
+    :param cache_validations: content of cache validation files already read, by uri
+    :type cache_validations: Optional[Dict[str, dict]]
+    :return: project menu config
+    :rtype: Optional[MenuProjectConfig]
+    """
+    cache_manager = CacheManager(
+        None,
+        downloaded_files,
+        json_export=settings.debug_mode,
+        cache_store=cache_store,
+        cache_dir=cache_dir,
+        shared_cache_dir=(
+            Path(settings.shared_cache_dir) if settings.shared_cache_dir else None
+        ),
+        cache_validations=cache_validations,
+    )
+    # A dedicated manager is used: its project is specific to this thread
+    qgs_dom_manager = QgsDomManager(
+        project=project,
+        downloaded_files=downloaded_files,
+        embedded_groups=embedded_groups,
+    )
+    # Get project configuration from cache, an expired cache is kept if project
+    # files didn't change. Otherwise, create it from QgsProject and save it in
+    # cache
+    project_config = cache_manager.get_or_create_project_menu_config(
+        project,
+        partial(
+            read_project_menu_config,
+            project,
+            qgs_dom_manager,
+            settings.project_read_engine,
+        ),
+        partial(qgs_dom_manager.get_project_path, project.file),
+    )
+    return apply_project_name(project, project_config) if project_config else None
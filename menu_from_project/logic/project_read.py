@@ -1,5 +1,6 @@
 # standard
 import re
+from functools import lru_cache, partial
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
@@ -24,7 +25,6 @@ from menu_from_project.datamodel.project_config import (
 )
 from menu_from_project.logic.qgs_manager import (
     QgsDomManager,
-    create_map_layer_dict,
     get_project_title,
     is_absolute,
 )
@@ -107,8 +107,26 @@ def init_gdal_extension_list() -> List[Tuple[str, List[str]]]:
     return result
 
 
-OGR_EXTENSION_LIST = init_ogr_extension_list()
-GDAL_EXTENSION_LIST = init_gdal_extension_list()
+@lru_cache(maxsize=None)
+def get_ogr_extension_list() -> List[Tuple[str, List[str]]]:
+    """Return OGR extension list, defined on first use: QGIS providers must be
+    loaded
+
+    :return: list of provider name and usable extensions
+    :rtype: List[Tuple[str, List[str]]]
+    """
+    return init_ogr_extension_list()
+
+
+@lru_cache(maxsize=None)
+def get_gdal_extension_list() -> List[Tuple[str, List[str]]]:
+    """Return GDAL extension list, defined on first use: QGIS providers must be
+    loaded
+
+    :return: list of provider name and usable extensions
+    :rtype: List[Tuple[str, List[str]]]
+    """
+    return init_gdal_extension_list()
 
 
 def get_embedded_project_from_layer_tree(
@@ -396,11 +414,11 @@ def get_layer_menu_config(
     ds = datasourceNode.firstChild().toText().data()
     if provider == "ogr":
         provider = define_provider_name_from_extension_list(
-            provider, ds, OGR_EXTENSION_LIST
+            provider, ds, get_ogr_extension_list()
         )
     elif provider == "gdal":
         provider = define_provider_name_from_extension_list(
-            provider, ds, GDAL_EXTENSION_LIST
+            provider, ds, get_gdal_extension_list()
         )
     elif provider == "wms":
         provider = define_provider_name_wms_datasource(provider, ds)
@@ -432,6 +450,30 @@ def get_embedded_group_config(
 ) -> Optional[MenuGroupConfig]:
     """Get group menu configuration for an embedded group name
 
+    Configurations are memoised by qgs_dom_manager: a group embedded many times is
+    read once.
+
+    :param filename: embedded filename
+    :type filename: str
+    :param group_name: embedded group name
+    :type group_name: str
+    :param qgs_dom_manager: manager to get qgs doc for embedded project
+    :type qgs_dom_manager: QgsDomManager
+    :return: Optional menu group configuration
+    :rtype: Optional[MenuGroupConfig]
+    """
+    return qgs_dom_manager.embedded_groups.get(
+        filename,
+        group_name,
+        partial(read_embedded_group_config, filename, group_name, qgs_dom_manager),
+    )
+
+
+def read_embedded_group_config(
+    filename: str, group_name: str, qgs_dom_manager: QgsDomManager
+) -> Optional[MenuGroupConfig]:
+    """Read group menu configuration for an embedded group name
+
     :param filename: embedded filename
     :type filename: str
     :param group_name: embedded group name
@@ -454,8 +496,8 @@ def get_embedded_group_config(
                 name = element.attribute("name")
                 # Get only group with same name
                 if child.nodeName() == "layer-tree-group" and name == group_name:
-                    # Create dict of maplayer nodes
-                    maplayer_dict = create_map_layer_dict(doc)
+                    # Get dict of maplayer nodes
+                    maplayer_dict = qgs_dom_manager.get_map_layer_index(filename)
 
                     return get_group_menu_config(
                         node=child,
@@ -568,8 +610,8 @@ def get_project_menu_config(
         layer_tree_roots = doc.elementsByTagName("layer-tree-group")
         if layer_tree_roots.length() > 0:
             if node := layer_tree_roots.item(0):
-                # Create dict of maplayer nodes
-                maplayer_dict = create_map_layer_dict(doc)
+                # Get dict of maplayer nodes
+                maplayer_dict = qgs_dom_manager.get_map_layer_index(uri)
                 # Parse node for group and layers
                 menu_project_config = MenuProjectConfig(
                     project_name=name,
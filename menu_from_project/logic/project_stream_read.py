@@ -0,0 +1,747 @@
+#! python3  # noqa: E265
+
+"""
+Streaming reader of QGIS projects.
+
+The whole .qgs XML is read as a stream of events: only the layer tree and the few
+fields used by the menus are kept for each maplayer, everything else (symbology,
+forms, layouts...) is released as soon as it is parsed. The produced
+MenuProjectConfig is the same as the one built from a QDomDocument.
+"""
+
+# Standard library
+import xml.etree.ElementTree as ET
+from dataclasses import asdict, dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# PyQGIS
+from qgis.core import QgsMessageLog
+from qgis.PyQt.QtCore import QFileInfo
+
+# project
+from menu_from_project.__about__ import __title__
+from menu_from_project.datamodel.project import Project
+from menu_from_project.datamodel.project_config import (
+    MenuGroupConfig,
+    MenuLayerConfig,
+    MenuProjectConfig,
+)
+from menu_from_project.logic.embedded_groups import (
+    EmbeddedGroupConfigs,
+    canonical_path,
+)
+from menu_from_project.logic.project_read import (
+    LMFP_FORMAT_KEYWORD,
+    define_name_and_version_from_layer_name,
+    define_provider_name_from_extension_list,
+    define_provider_name_wms_datasource,
+    get_gdal_extension_list,
+    get_layer_type_from_geometry_str,
+    get_ogr_extension_list,
+    get_project_menu_config,
+)
+from menu_from_project.logic.qgs_manager import QgsDomManager, open_project_file
+
+# ############################################################################
+# ########## Globals ###############
+# ##################################
+
+READ_ENGINE_DOM = "dom"
+READ_ENGINE_STREAM = "stream"
+READ_ENGINE_VERIFY = "verify"
+
+# maplayer children needed for menu configuration, others are dropped while parsing
+MAPLAYER_KEPT_TAGS = (
+    "id",
+    "title",
+    "abstract",
+    "userNotes",
+    "provider",
+    "datasource",
+    "resourceMetadata",
+)
+
+# ############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+@dataclass
+class ScannedMapLayer:
+    """Fields of a maplayer node used for menu configuration."""
+
+    geometry: str = ""
+    type: str = ""
+    title: str = ""
+    abstract: str = ""
+    layer_notes: str = ""
+    metadata_title: str = ""
+    metadata_abstract: str = ""
+    metadata_format: Optional[str] = None
+    provider: str = ""
+    datasource: str = ""
+
+
+@dataclass
+class ScannedProject:
+    """Content of a QGIS project needed for menu configuration."""
+
+    title: Optional[str] = None
+    absolute: bool = False
+    layer_tree: Optional[ET.Element] = None
+    maplayers: Dict[str, ScannedMapLayer] = field(default_factory=dict)
+    _parents: Optional[Dict[ET.Element, ET.Element]] = field(
+        default=None, repr=False
+    )
+
+    def parent(self, node: ET.Element) -> Optional[ET.Element]:
+        """Return parent of a layer tree node, None for the layer tree root
+
+        :param node: layer tree node
+        :type node: ET.Element
+        :return: parent node
+        :rtype: Optional[ET.Element]
+        """
+        if self._parents is None:
+            self._parents = {
+                child: parent
+                for parent in self.layer_tree.iter()
+                for child in parent
+            }
+        return self._parents.get(node)
+
+
+class ProjectScanner:
+    """Scan QGIS project files, each file is read only once.
+
+    Used for a project and all its embedded projects.
+
+    :param embedded_groups: embedded group configurations, defaults to None
+    :type embedded_groups: Optional[EmbeddedGroupConfigs], optional
+    """
+
+    def __init__(
+        self, embedded_groups: Optional[EmbeddedGroupConfigs] = None
+    ) -> None:
+        self.scans: Dict[str, ScannedProject] = {}
+        self.embedded_groups = embedded_groups or EmbeddedGroupConfigs()
+
+    def get_scan(self, filename: str) -> ScannedProject:
+        """Return scanned content of a project file
+
+        :param filename: path to .qgs or .qgz file
+        :type filename: str
+        :return: scanned project
+        :rtype: ScannedProject
+        """
+        key = canonical_path(filename)
+        if key not in self.scans:
+            self.scans[key] = scan_project(filename)
+        return self.scans[key]
+
+
+# ############################################################################
+# ########## Functions #############
+# ##################################
+
+
+def _text(elem: Optional[ET.Element]) -> str:
+    """Return data of first text child, as QDomNode.firstChild().toText().data()
+
+    QDom strips whitespace only text nodes.
+
+    :param elem: element
+    :type elem: Optional[ET.Element]
+    :return: text
+    :rtype: str
+    """
+    if elem is None or not elem.text or not elem.text.strip():
+        return ""
+    return elem.text
+
+
+def _all_text(elem: ET.Element) -> str:
+    """Return all text of element, as QDomElement.text()
+
+    :param elem: element
+    :type elem: ET.Element
+    :return: text
+    :rtype: str
+    """
+    return "".join(text for text in elem.itertext() if text.strip())
+
+
+def _get_metadata_format(md: ET.Element) -> Optional[str]:
+    """Get format defined in metadata keywords if available
+
+    :param md: resourceMetadata element
+    :type md: ET.Element
+    :return: format from keyword with LMFP_FORMAT vocabulary
+    :rtype: Optional[str]
+    """
+    for keywords in md.iter("keywords"):
+        if keywords.get("vocabulary") == LMFP_FORMAT_KEYWORD:
+            keyword = next(keywords.iter("keyword"), None)
+            if keyword is not None:
+                return _all_text(keyword)
+    return None
+
+
+def _scan_maplayer(elem: ET.Element) -> ScannedMapLayer:
+    """Read menu configuration fields of a maplayer element
+
+    :param elem: maplayer element
+    :type elem: ET.Element
+    :return: scanned maplayer
+    :rtype: ScannedMapLayer
+    """
+    result = ScannedMapLayer(
+        geometry=elem.get("geometry", ""),
+        type=elem.get("type", ""),
+        title=_text(elem.find("title")),
+        abstract=_text(elem.find("abstract")),
+        provider=_text(elem.find("provider")),
+        datasource=_text(elem.find("datasource")),
+    )
+    notes = elem.find("userNotes")
+    if notes is not None and "value" in notes.attrib:
+        result.layer_notes = notes.get("value")
+
+    md = elem.find("resourceMetadata")
+    if md is not None:
+        result.metadata_title = _text(md.find("title"))
+        result.metadata_abstract = _text(md.find("abstract"))
+        result.metadata_format = _get_metadata_format(md)
+    return result
+
+
+def scan_project(filename: str) -> ScannedProject:
+    """Scan a QGIS project file without building the whole XML document.
+
+    Only the first layer-tree-group (with all its childs), the maplayer fields used
+    for menu configuration, the project title and path mode are kept.
+
+    :param filename: path to .qgs or .qgz file
+    :type filename: str
+    :return: scanned project
+    :rtype: ScannedProject
+    """
+    result = ScannedProject()
+    stack: List[ET.Element] = []
+    root_tag = ""
+    tree_depth = 0
+    tree_done = False
+    maplayer_depth = 0
+    properties_depth = 0
+    properties_count = 0
+    first_properties_absolute = False
+
+    with open_project_file(filename) as f:
+        for event, elem in ET.iterparse(f, events=("start", "end")):
+            if event == "start":
+                stack.append(elem)
+                if len(stack) == 1:
+                    root_tag = elem.tag
+                if elem.tag == "maplayer":
+                    maplayer_depth = len(stack)
+                elif elem.tag == "properties":
+                    properties_count += 1
+                    if properties_count == 1:
+                        properties_depth = len(stack)
+                if result.layer_tree is None and elem.tag == "layer-tree-group":
+                    result.layer_tree = elem
+                if result.layer_tree is not None and not tree_done:
+                    tree_depth += 1
+                continue
+
+            stack.pop()
+            parent = stack[-1] if stack else None
+
+            # First layer tree group is kept with all its childs
+            if tree_depth:
+                tree_depth -= 1
+                tree_done = tree_depth == 0
+                continue
+
+            # First properties is kept until path mode is read
+            if properties_depth and len(stack) >= properties_depth:
+                continue
+            if properties_depth and elem.tag == "properties":
+                first_properties_absolute = (
+                    _text(elem.find("Paths/Absolute")) == "true"
+                )
+                properties_depth = 0
+
+            if elem.tag == "title" and parent is not None and len(stack) == 1:
+                if result.title is None:
+                    result.title = _text(elem)
+
+            if parent is None:
+                continue
+
+            if elem.tag == "maplayer":
+                id_elem = elem.find("id")
+                if id_elem is not None:
+                    result.maplayers[_text(id_elem)] = _scan_maplayer(elem)
+                maplayer_depth = 0
+            elif maplayer_depth and len(stack) >= maplayer_depth:
+                # Inside a maplayer: only direct childs not needed are dropped
+                if len(stack) > maplayer_depth or elem.tag in MAPLAYER_KEPT_TAGS:
+                    continue
+
+            # Element is fully parsed and not needed anymore
+            elem.clear()
+            parent.remove(elem)
+
+    if root_tag != "qgis":
+        # No project title available
+        result.title = None
+    elif result.title is None:
+        result.title = ""
+    result.absolute = properties_count == 1 and first_properties_absolute
+    return result
+
+
+def _get_embedded_project_from_layer_tree(
+    node: ET.Element, scan: ScannedProject, init_filename: str, absolute_project: bool
+) -> str:
+    """Get embedded project path from layer tree node and its parents
+
+    :param node: layer tree node
+    :type node: ET.Element
+    :param scan: scanned project of layer tree
+    :type scan: ScannedProject
+    :param init_filename: initial filename of project
+    :type init_filename: str
+    :param absolute_project: True if project is absolute, False otherwise
+    :type absolute_project: bool
+    :return: path to embedded project
+    :rtype: str
+    """
+    filename = ""
+    customproperties = next(node.iter("customproperties"), None)
+    if customproperties is not None:
+        file_node = _get_custom_property(customproperties, "embedded_project")
+        if file_node is not None:
+            # get project file name
+            embedded_file = file_node.get("value", "")
+            if not absolute_project and (embedded_file.find(".") == 0):
+                filename = QFileInfo(init_filename).path() + "/" + embedded_file
+            else:
+                filename = QFileInfo(embedded_file).absoluteFilePath()
+        else:
+            layer_id = node.get("id", "")
+            QgsMessageLog.logMessage(
+                f"Menu from layer: Embeded project not found for {layer_id}",
+                __title__,
+                notifyUser=True,
+            )
+    parent = scan.parent(node)
+    if filename == "" and parent is not None:
+        return _get_embedded_project_from_layer_tree(
+            parent, scan, init_filename, absolute_project
+        )
+    return filename
+
+
+def _get_custom_property(
+    customproperties: ET.Element, key: str
+) -> Optional[ET.Element]:
+    """Get custom property element for a key, stored as property or Option
+
+    :param customproperties: customproperties element
+    :type customproperties: ET.Element
+    :param key: property key
+    :type key: str
+    :return: custom property element
+    :rtype: Optional[ET.Element]
+    """
+    for tag, attr in (("property", "key"), ("Option", "name")):
+        for elem in customproperties.iter(tag):
+            if elem.get(attr) == key:
+                return elem
+    return None
+
+
+def _read_embedded_properties(
+    node: ET.Element, scan: ScannedProject, init_filename: str, absolute_project: bool
+) -> Tuple[bool, str]:
+    """Read embedded properties of a layer tree node
+
+    :param node: layer tree node
+    :type node: ET.Element
+    :param scan: scanned project of layer tree
+    :type scan: ScannedProject
+    :param init_filename: initial filename of project
+    :type init_filename: str
+    :param absolute_project: True if project is absolute, False otherwise
+    :type absolute_project: bool
+    :return: Boolean indicating if the node is embedded and the filename of the project used
+    :rtype: Tuple[bool, str]
+    """
+    embedded = False
+    filename = init_filename
+
+    customproperties = next(node.iter("customproperties"), None)
+    if customproperties is not None:
+        embed_node = _get_custom_property(customproperties, "embedded")
+        if embed_node is not None and embed_node.get("value") == "1":
+            embedded = True
+            filename = _get_embedded_project_from_layer_tree(
+                node, scan, init_filename, absolute_project
+            )
+    return embedded, filename
+
+
+def _get_layer_menu_config(
+    node: ET.Element,
+    scan: ScannedProject,
+    scanner: ProjectScanner,
+    init_filename: str,
+    absolute_project: bool,
+) -> Optional[MenuLayerConfig]:
+    """Get layer menu configuration from a layer-tree-layer element
+
+    :param node: layer-tree-layer element
+    :type node: ET.Element
+    :param scan: scanned project of layer tree
+    :type scan: ScannedProject
+    :param scanner: scanner for embedded projects
+    :type scanner: ProjectScanner
+    :param init_filename: initial filename of project
+    :type init_filename: str
+    :param absolute_project: True if project is absolute, False otherwise
+    :type absolute_project: bool
+    :return: layer menu configuration
+    :rtype: Optional[MenuLayerConfig]
+    """
+    embedded, filename = _read_embedded_properties(
+        node, scan, init_filename, absolute_project
+    )
+    layer_id = node.get("id", "")
+
+    if embedded:
+        ml = scanner.get_scan(filename).maplayers.get(layer_id)
+    else:
+        ml = scan.maplayers.get(layer_id)
+
+    if not ml:
+        QgsMessageLog.logMessage(
+            f"Menu from layer: Can't find layer {layer_id} in qgs project. Layer won't be added to project.",
+            __title__,
+            notifyUser=True,
+        )
+        return None
+
+    layer_type, geometry_type, is_spatial = get_layer_type_from_geometry_str(
+        ml.geometry or ml.type
+    )
+    name, version = define_name_and_version_from_layer_name(node.get("name", ""))
+
+    provider = ml.provider
+    if provider == "ogr":
+        provider = define_provider_name_from_extension_list(
+            provider, ml.datasource, get_ogr_extension_list()
+        )
+    elif provider == "gdal":
+        provider = define_provider_name_from_extension_list(
+            provider, ml.datasource, get_gdal_extension_list()
+        )
+    elif provider == "wms":
+        provider = define_provider_name_wms_datasource(provider, ml.datasource)
+
+    if ml.metadata_format is not None:
+        provider = ml.metadata_format
+
+    return MenuLayerConfig(
+        name=name,
+        layer_id=layer_id,
+        filename=filename,
+        visible=node.get("checked", "") == "Qt::Checked",
+        expanded=node.get("expanded", "0") == "1",
+        embedded=embedded,
+        layer_type=layer_type,
+        metadata_abstract=ml.metadata_abstract,
+        metadata_title=ml.metadata_title,
+        abstract=ml.abstract,
+        is_spatial=is_spatial,
+        title=ml.title,
+        geometry_type=geometry_type,
+        layer_notes=ml.layer_notes,
+        version=version,
+        format=provider,
+    )
+
+
+def _get_embedded_group_config(
+    filename: str, group_name: str, scanner: ProjectScanner
+) -> Optional[MenuGroupConfig]:
+    """Get group menu configuration for an embedded group name, memoised by scanner
+
+    :param filename: embedded filename
+    :type filename: str
+    :param group_name: embedded group name
+    :type group_name: str
+    :param scanner: scanner for embedded projects
+    :type scanner: ProjectScanner
+    :return: Optional menu group configuration
+    :rtype: Optional[MenuGroupConfig]
+    """
+    return scanner.embedded_groups.get(
+        filename,
+        group_name,
+        partial(_read_embedded_group_config, filename, group_name, scanner),
+    )
+
+
+def _read_embedded_group_config(
+    filename: str, group_name: str, scanner: ProjectScanner
+) -> Optional[MenuGroupConfig]:
+    """Read group menu configuration for an embedded group name
+
+    :param filename: embedded filename
+    :type filename: str
+    :param group_name: embedded group name
+    :type group_name: str
+    :param scanner: scanner for embedded projects
+    :type scanner: ProjectScanner
+    :return: Optional menu group configuration
+    :rtype: Optional[MenuGroupConfig]
+    """
+    scan = scanner.get_scan(filename)
+    if scan.layer_tree is None:
+        return None
+    for child in scan.layer_tree:
+        if child.tag == "layer-tree-group" and child.get("name", "") == group_name:
+            return _get_group_menu_config(
+                node=child,
+                scan=scan,
+                scanner=scanner,
+                init_filename=filename,
+                absolute_project=scan.absolute,
+            )
+    return None
+
+
+def _get_group_menu_config(
+    node: ET.Element,
+    scan: ScannedProject,
+    scanner: ProjectScanner,
+    init_filename: str,
+    absolute_project: bool,
+) -> MenuGroupConfig:
+    """Get group menu configuration from a layer-tree-group element
+
+    :param node: layer-tree-group element
+    :type node: ET.Element
+    :param scan: scanned project of layer tree
+    :type scan: ScannedProject
+    :param scanner: scanner for embedded projects
+    :type scanner: ProjectScanner
+    :param init_filename: initial filename of project
+    :type init_filename: str
+    :param absolute_project: True if project is absolute, False otherwise
+    :type absolute_project: bool
+    :return: group menu configuration
+    :rtype: MenuGroupConfig
+    """
+    name = node.get("name", "")
+    embedded, filename = _read_embedded_properties(
+        node, scan, init_filename, absolute_project
+    )
+
+    childs = []
+
+    # If embedded group, add all layer and subgroup from the group of same name
+    if embedded:
+        embedded_group = _get_embedded_group_config(filename, name, scanner)
+        if embedded_group:
+            childs += embedded_group.childs
+
+    for child in node:
+        if child.tag == "layer-tree-group":
+            childs.append(
+                _get_group_menu_config(
+                    node=child,
+                    scan=scan,
+                    scanner=scanner,
+                    init_filename=init_filename,
+                    absolute_project=absolute_project,
+                )
+            )
+        elif child.tag == "layer-tree-layer":
+            layer_config = _get_layer_menu_config(
+                node=child,
+                scan=scan,
+                scanner=scanner,
+                init_filename=init_filename,
+                absolute_project=absolute_project,
+            )
+            if layer_config:
+                childs.append(layer_config)
+
+    return MenuGroupConfig(
+        name=name, embedded=embedded, filename=filename, childs=childs
+    )
+
+
+def get_project_menu_config_from_stream(
+    project: Project,
+    qgs_dom_manager: QgsDomManager,
+    embedded_groups: Optional[EmbeddedGroupConfigs] = None,
+) -> Optional[MenuProjectConfig]:
+    """Get project menu configuration for a project with a streaming read of project file
+
+    :param project: dict of information about the project
+    :type project: Project
+    :param qgs_dom_manager: manager to get local project file
+    :type qgs_dom_manager: QgsDomManager
+    :param embedded_groups: embedded group configurations, defaults to those of qgs_dom_manager
+    :type embedded_groups: Optional[EmbeddedGroupConfigs], optional
+    :return: Optional menu project configuration
+    :rtype: Optional[MenuProjectConfig]
+    """
+    try:
+        # Get path to QgsProject file, local / downloaded / from postgres database
+        uri = project.file
+        qgs_dom_manager.set_project(project)
+        filename = qgs_dom_manager.get_project_path(uri)
+
+        scanner = ProjectScanner(
+            embedded_groups or qgs_dom_manager.embedded_groups
+        )
+        scan = scanner.get_scan(filename)
+
+        # Define project name
+        name = project.name
+        if name == "":
+            name = scan.title
+        if name == "":
+            name = Path(filename).stem
+
+        if scan.layer_tree is not None:
+            menu_project_config = MenuProjectConfig(
+                project_name=name,
+                filename=filename,
+                uri=uri,
+                root_group=_get_group_menu_config(
+                    node=scan.layer_tree,
+                    scan=scan,
+                    scanner=scanner,
+                    init_filename=filename,
+                    absolute_project=scan.absolute,
+                ),
+            )
+            qgs_dom_manager.set_project(None)
+            return menu_project_config
+    except Exception as e:
+        QgsMessageLog.logMessage(
+            f"Menu from layer: Can't parse qgs project for {project.name} : {e}",
+            __title__,
+            notifyUser=True,
+        )
+    return None
+
+
+def diff_project_menu_configs(
+    expected: Any, actual: Any, path: str = "project"
+) -> List[str]:
+    """List differences between two project menu configurations
+
+    :param expected: reference configuration (or sub value)
+    :type expected: Any
+    :param actual: compared configuration (or sub value)
+    :type actual: Any
+    :param path: path of compared value, used in messages
+    :type path: str
+    :return: list of differences
+    :rtype: List[str]
+    """
+    if isinstance(expected, MenuProjectConfig):
+        expected = asdict(expected)
+    if isinstance(actual, MenuProjectConfig):
+        actual = asdict(actual)
+
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        differences = []
+        for key in expected.keys() | actual.keys():
+            differences += diff_project_menu_configs(
+                expected.get(key), actual.get(key), f"{path}.{key}"
+            )
+        return differences
+    if isinstance(expected, list) and isinstance(actual, list):
+        if len(expected) != len(actual):
+            return [f"{path}: {len(expected)} childs != {len(actual)} childs"]
+        differences = []
+        for i, (expected_child, actual_child) in enumerate(zip(expected, actual)):
+            differences += diff_project_menu_configs(
+                expected_child, actual_child, f"{path}[{i}]"
+            )
+        return differences
+    if expected != actual:
+        return [f"{path}: {expected!r} != {actual!r}"]
+    return []
+
+
+def verify_read_engines(
+    projects: List[Project], qgs_dom_manager: QgsDomManager
+) -> Dict[str, List[str]]:
+    """Read projects with QDom and streaming engines and list differences
+
+    :param projects: projects to check
+    :type projects: List[Project]
+    :param qgs_dom_manager: manager to get qgs doc for projects
+    :type qgs_dom_manager: QgsDomManager
+    :return: differences for each project uri, empty list if both engines give same configuration
+    :rtype: Dict[str, List[str]]
+    """
+    return {
+        project.file: diff_project_menu_configs(
+            get_project_menu_config(project, qgs_dom_manager),
+            get_project_menu_config_from_stream(
+                project, qgs_dom_manager, EmbeddedGroupConfigs()
+            ),
+        )
+        for project in projects
+    }
+
+
+def read_project_menu_config(
+    project: Project,
+    qgs_dom_manager: QgsDomManager,
+    engine: str = READ_ENGINE_STREAM,
+) -> Optional[MenuProjectConfig]:
+    """Get project menu configuration for a project with the selected read engine
+
+    - READ_ENGINE_STREAM: streaming read, without full XML document
+    - READ_ENGINE_DOM: QDomDocument read
+    - READ_ENGINE_VERIFY: both engines are used, differences are logged and QDomDocument configuration is returned
+
+    :param project: dict of information about the project
+    :type project: Project
+    :param qgs_dom_manager: manager to get qgs doc for project
+    :type qgs_dom_manager: QgsDomManager
+    :param engine: read engine, defaults to READ_ENGINE_STREAM
+    :type engine: str, optional
+    :return: Optional menu project configuration
+    :rtype: Optional[MenuProjectConfig]
+    """
+    if engine == READ_ENGINE_DOM:
+        return get_project_menu_config(project, qgs_dom_manager)
+
+    if engine == READ_ENGINE_VERIFY:
+        dom_config = get_project_menu_config(project, qgs_dom_manager)
+        stream_config = get_project_menu_config_from_stream(
+            project, qgs_dom_manager, EmbeddedGroupConfigs()
+        )
+        for difference in diff_project_menu_configs(dom_config, stream_config):
+            QgsMessageLog.logMessage(
+                f"Menu from layer: read engines differ for {project.name} : {difference}",
+                __title__,
+                notifyUser=False,
+            )
+        return dom_config
+
+    return get_project_menu_config_from_stream(project, qgs_dom_manager)
@@ -5,29 +5,24 @@ Functions used to manage QGIS Projects: read, extract, get properties.
 """
 
 # Standard library
-import os
+import re
+import time
 import zipfile
-from functools import lru_cache
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import IO, Dict, Iterable, Iterator, Optional, Tuple
 from urllib.parse import urlparse
 
 # PyQGIS
-from qgis.core import (
-    QgsApplication,
-    QgsFileDownloader,
-    QgsMessageLog,
-    QgsReadWriteContext,
-)
+from qgis.core import QgsApplication, QgsMessageLog, QgsProject, QgsReadWriteContext
 from qgis.PyQt import QtXml
 from qgis.PyQt.QtCore import (
+    QCoreApplication,
     QDir,
-    QEventLoop,
     QFile,
     QFileInfo,
     QIODevice,
-    QTemporaryDir,
-    QUrl,
+    QSaveFile,
 )
 from qgis.utils import iface
 
@@ -35,8 +30,18 @@ from qgis.utils import iface
 from menu_from_project.__about__ import __title__, __title_clean__
 from menu_from_project.datamodel.project import Project
 from menu_from_project.logic.cache_manager import CacheManager
+from menu_from_project.logic.document_cache import (
+    CachedDocument,
+    DocumentCache,
+    estimate_document_size,
+    file_fingerprint,
+)
+from menu_from_project.logic.embedded_groups import (
+    EmbeddedGroupConfigs,
+    canonical_path,
+)
+from menu_from_project.logic.http_download import conditional_download
 from menu_from_project.logic.tools import guess_type_from_uri
-from menu_from_project.logic.xml_utils import getFirstChildByTagNameValue
 
 # ############################################################################
 # ########## Globals ###############
@@ -46,6 +51,13 @@ from menu_from_project.logic.xml_utils import getFirstChildByTagNameValue
 cache_folder = Path.home() / f".cache/QGIS/{__title_clean__}"
 cache_folder.mkdir(exist_ok=True, parents=True)
 
+# Files extracted from .qgz archives by previous versions in temporary folders
+LEGACY_UNZIP_SUFFIXES = (".qgs", ".qgd", ".db")
+
+# Project XML documents shared by all QgsDomManager
+DEFAULT_DOCUMENT_CACHE_SIZE_MB = 512
+document_cache = DocumentCache(max_bytes=DEFAULT_DOCUMENT_CACHE_SIZE_MB * 1024 * 1024)
+
 
 # ############################################################################
 # ########## Functions #############
@@ -103,7 +115,8 @@ def create_map_layer_dict(doc: QtXml.QDomDocument) -> Dict[str, QtXml.QDomNode]:
     for node in (nodes.at(i) for i in range(nodes.size())):
         nd = node.namedItem("id")
         if nd:
-            r[nd.firstChild().toText().data()] = node
+            # First node is kept, as the layer found by a sequential lookup
+            r.setdefault(nd.firstChild().toText().data(), node)
 
     return r
 
@@ -124,7 +137,32 @@ def get_project_title(doc: QtXml.QDomDocument) -> str:
     return None
 
 
-@lru_cache()
+@contextmanager
+def open_project_file(filename: str) -> Iterator[IO[bytes]]:
+    """Open the .qgs XML content of a project file as a binary stream.
+
+    For a .qgz, the .qgs member is read directly from the archive: other members \
+    (auxiliary storage, styles database...) are not extracted.
+
+    :param filename: path to .qgs or .qgz file
+    :type filename: str
+    :yield: binary stream of .qgs content
+    :rtype: Iterator[IO[bytes]]
+    """
+    if Path(filename).suffix.lower() == ".qgz":
+        with zipfile.ZipFile(filename, "r") as zip_ref:
+            qgs_members = [
+                name for name in zip_ref.namelist() if name.lower().endswith(".qgs")
+            ]
+            if not qgs_members:
+                raise ValueError(f"No .qgs file in archive {filename}")
+            with zip_ref.open(qgs_members[0]) as f:
+                yield f
+    else:
+        with open(filename, "rb") as f:
+            yield f
+
+
 def read_from_file(uri: str) -> QtXml.QDomDocument:
     """Read a QGIS project (.qgs and .qgz) from a file path and returns d
 
@@ -144,20 +182,88 @@ def read_from_file(uri: str) -> QtXml.QDomDocument:
         doc.setContent(file)
 
     elif file.exists() and (QFileInfo(file).suffix() == "qgz"):
-        temporary_unzip = QTemporaryDir()
-        temporary_unzip.setAutoRemove(False)
-        with zipfile.ZipFile(uri, "r") as zip_ref:
-            zip_ref.extractall(temporary_unzip.path())
-
-        project_filename = QDir(temporary_unzip.path()).entryList(["*.qgs"])[0]
-        project_path = os.path.join(temporary_unzip.path(), project_filename)
-        xml = QFile(project_path)
-        if xml.open(QIODevice.OpenModeFlag.ReadOnly | QIODevice.OpenModeFlag.Text):
-            doc.setContent(xml)
+        with open_project_file(uri) as xml:
+            doc.setContent(xml.read())
 
     return doc
 
 
+def get_open_project_archive_dir() -> Optional[Path]:
+    """Return the temporary folder where QGIS extracted the open .qgz project.
+
+    QGIS core uses the same QTemporaryDir template as previous versions of the \
+    plugin, this folder must not be removed while the project is open.
+
+    :return: extraction folder of the open project, None if not a .qgz project
+    :rtype: Optional[Path]
+    """
+    project = QgsProject.instance()
+    if not project.isZipped():
+        return None
+    auxiliary_file = project.auxiliaryStorage().currentFileName()
+    if not auxiliary_file:
+        return None
+    return Path(auxiliary_file).parent
+
+
+def clean_legacy_unzip_folders(
+    min_age_days: int = 1, excluded_dirs: Iterable[Path] = ()
+) -> int:
+    """Remove temporary folders left by previous versions when reading .qgz files.
+
+    Only folders created with the default QTemporaryDir template and containing \
+    nothing else than extracted project files are removed. Folders holding a lock \
+    or journal file are in use and kept. The .qgs file is removed last so that a \
+    folder in use by another QGIS instance is not left without its project file.
+
+    :param min_age_days: minimal age of removed folders, defaults to 1
+    :type min_age_days: int, optional
+    :param excluded_dirs: folders to keep, e.g. the open project archive folder
+    :type excluded_dirs: Iterable[Path], optional
+    :return: number of removed folders
+    :rtype: int
+    """
+    app_name = QCoreApplication.applicationName() or "qt_temp"
+    pattern = re.compile(rf"^{re.escape(app_name)}-[A-Za-z0-9]{{6}}$")
+    max_mtime = time.time() - min_age_days * 86400
+    excluded = {canonical_path(str(path)) for path in excluded_dirs}
+
+    removed = 0
+    temp_dir = Path(QDir.tempPath())
+    try:
+        candidates = [path for path in temp_dir.iterdir() if pattern.match(path.name)]
+    except OSError:
+        return removed
+
+    for path in candidates:
+        try:
+            if (
+                not path.is_dir()
+                or path.stat().st_mtime > max_mtime
+                or canonical_path(str(path)) in excluded
+            ):
+                continue
+            content = list(path.iterdir())
+            if (
+                not content
+                or not all(
+                    child.is_file() and child.suffix.lower() in LEGACY_UNZIP_SUFFIXES
+                    for child in content
+                )
+                or not any(child.suffix.lower() == ".qgs" for child in content)
+            ):
+                continue
+            # Files opened by another process can't be removed on Windows
+            content.sort(key=lambda child: child.suffix.lower() == ".qgs")
+            for child in content:
+                child.unlink()
+            path.rmdir()
+            removed += 1
+        except OSError:
+            continue
+    return removed
+
+
 def read_from_database(
     uri: str, project_registry, download_folder: Path
 ) -> Tuple[QtXml.QDomDocument, str]:
@@ -169,37 +275,45 @@ def read_from_database(
     :return: a tuple with XML document and the filepath.
     :rtype: Tuple[QtXml.QDomDocument, str]
     """
+    project_file = export_from_database(uri, project_registry, download_folder)
+    doc = read_from_file(project_file)
+    return doc, project_file
+
+
+def export_from_database(uri: str, project_registry, download_folder: Path) -> str:
+    """Export a QGIS project stored into a (PostgreSQL) database to a local .qgz file.
+
+    :param uri: connection string to QGIS project stored into a database.
+    :type uri: str
+
+    :return: path to the exported .qgz file.
+    :rtype: str
+    """
     # uri PG
     project_storage = project_registry.projectStorageFromUri(uri)
     _, metadata = project_storage.readProjectStorageMetadata(uri)
 
     project_file = download_folder / f"{metadata.name}.qgz"
-    temporary_zip = QFile(str(project_file))
+    # Written in a temporary file, renamed once complete
+    temporary_zip = QSaveFile(str(project_file))
     temporary_zip.open(QIODevice.OpenModeFlag.WriteOnly)
 
     project_storage.readProject(uri, temporary_zip, QgsReadWriteContext())
-    temporary_zip.close()
+    temporary_zip.commit()
 
-    doc = read_from_file(str(project_file))
-    return doc, str(project_file)
+    return str(project_file)
 
 
-def downloadError(errorMessages):
-    for err in errorMessages:
-        QgsMessageLog.logMessage(
-            "Download error. " + str(err), "Layers menu from project", notifyUser=True
-        )
-
-
-@lru_cache()
-def read_from_http(uri: str, download_folder: Path):
-    """Read a QGIS project stored into on a remote web server accessible through HTTP.
+def get_download_filepath(uri: str, download_folder: Path) -> Path:
+    """Return the local path where a remote QGIS project is downloaded.
 
     :param uri: web URL to the QGIS project
     :type uri: str
+    :param download_folder: folder where the project is downloaded
+    :type download_folder: Path
 
-    :return: a tuple with XML document and the filepath.
-    :rtype: Tuple[QtXml.QDomDocument, str]
+    :return: path to the downloaded file.
+    :rtype: Path
     """
     # get filename from URL parts
     parsed = urlparse(uri)
@@ -209,19 +323,29 @@ def read_from_http(uri: str, download_folder: Path):
                 uri
             )
         )
-    cached_filepath = download_folder / parsed.path.rpartition("/")[2]
+    return download_folder / parsed.path.rpartition("/")[2]
+
+
+def download_from_http(uri: str, download_folder: Path) -> str:
+    """Download a QGIS project stored on a remote web server into a local folder.
+
+    A previous download is revalidated with ETag / Last-Modified validators and kept
+    if the remote project didn't change.
+
+    :param uri: web URL to the QGIS project
+    :type uri: str
+    :param download_folder: folder where the project is downloaded
+    :type download_folder: Path
+
+    :return: path to the downloaded file.
+    :rtype: str
+    """
+    cached_filepath = get_download_filepath(uri, download_folder)
 
     # download it
-    loop = QEventLoop()
-    project_download = QgsFileDownloader(
-        url=QUrl(uri), outputFileName=str(cached_filepath), delayStart=True
-    )
-    project_download.downloadExited.connect(loop.quit)
-    project_download.downloadError.connect(downloadError)
-    project_download.startDownload()
-    loop.exec()
+    conditional_download(uri, cached_filepath)
 
-    return read_from_file(str(cached_filepath)), str(cached_filepath)
+    return str(cached_filepath)
 
 
 class QgsDomManager:
@@ -229,14 +353,26 @@ class QgsDomManager:
     - file
     - postgres
     - url
-    Read xml document are stored in a dict.
+    Read xml document are stored in the shared memory bounded document cache.
+
+    Remote projects are downloaded once by manager. Files already downloaded
+    can be given at initialization.
+
+    Embedded group configurations can be shared by managers used in a refresh.
     """
 
-    def __init__(self, project: Optional[Dict[str, str]] = None) -> None:
-        self.docs = dict()
+    def __init__(
+        self,
+        project: Optional[Dict[str, str]] = None,
+        downloaded_files: Optional[Dict[str, str]] = None,
+        embedded_groups: Optional[EmbeddedGroupConfigs] = None,
+    ) -> None:
         self.project_registry = QgsApplication.projectStorageRegistry()
         self.project = project
         self.cache_manager = CacheManager(iface)
+        # local path of remote projects already downloaded or exported, by uri
+        self.downloaded_files = dict(downloaded_files or {})
+        self.embedded_groups = embedded_groups or EmbeddedGroupConfigs()
 
     # TODO: until a log manager is implemented
     @staticmethod
@@ -248,7 +384,7 @@ class QgsDomManager:
 
     def cache_clear(self) -> None:
         """Clear cache of QtXml.QDomDocument for uri"""
-        self.docs = dict()
+        document_cache.clear()
 
     def set_project(self, project: Optional[Project]) -> None:
         """Define project used to check cache in project cache directory
@@ -298,12 +434,37 @@ class QgsDomManager:
         :return: Tuple with XML document and the filepath.
         :rtype: (QDomDocument, str)
         """
+        cached = self._get_cached_document(uri)
+        if guess_type_from_uri(uri) == "file":
+            # document may be cached with another path to the same file
+            return cached.doc, uri
+        return cached.doc, cached.project_path
+
+    def _get_cached_document(self, uri: str) -> CachedDocument:
+        """Return the cached document of an URI, read if not available in cache.
+
+        :param uri: The URI to fetch.
+        :type uri: str
+
+        :return: cached document
+        :rtype: CachedDocument
+        """
         # determine storage type: file, database or http
         qgs_storage_type = guess_type_from_uri(uri)
 
-        # check if docs is already here
-        if uri in self.docs:
-            return self.docs[uri], uri
+        # check if docs is already here, local files are read again if changed
+        # a local file referenced with different paths is read once
+        key = uri
+        fingerprint = None
+        if qgs_storage_type == "file":
+            key = canonical_path(uri)
+            fingerprint = file_fingerprint(uri)
+        elif qgs_storage_type == "http":
+            # remote projects are read again only if download changed
+            fingerprint = file_fingerprint(self._download_from_http(uri))
+        cached = document_cache.get(key, fingerprint)
+        if cached:
+            return cached
 
         if qgs_storage_type == "file":
             doc = read_from_file(uri)
@@ -312,17 +473,81 @@ class QgsDomManager:
             doc, project_path = read_from_database(
                 uri, self.project_registry, self._get_download_folder()
             )
+            self.downloaded_files[uri] = project_path
         elif qgs_storage_type == "http":
-            doc, project_path = read_from_http(uri, self._get_download_folder())
+            project_path = self._download_from_http(uri)
+            doc = read_from_file(project_path)
         else:
             QgsMessageLog.logMessage(
                 f"Unrecognized project type: {uri}", __title__, notifyUser=True
             )
+            doc, project_path = QtXml.QDomDocument(), uri
 
         # store doc into the plugin registry
-        self.docs[uri] = doc
+        cached = CachedDocument(
+            doc=doc,
+            project_path=project_path,
+            size=estimate_document_size(project_path),
+            fingerprint=fingerprint,
+        )
+        document_cache.put(key, cached)
+
+        return cached
+
+    def get_project_path(self, uri: str) -> str:
+        """Return a local path to the project file of an URI, without parsing it.
+
+        Database projects are exported and HTTP projects downloaded in the download
+        folder. Used by readers working directly on the file content.
+
+        :param uri: The URI to fetch.
+        :type uri: str
+
+        :return: path to a local .qgs or .qgz file
+        :rtype: str
+        """
+        qgs_storage_type = guess_type_from_uri(uri)
+        if qgs_storage_type == "database":
+            if uri not in self.downloaded_files:
+                self.downloaded_files[uri] = export_from_database(
+                    uri, self.project_registry, self._get_download_folder()
+                )
+            return self.downloaded_files[uri]
+        elif qgs_storage_type == "http":
+            return self._download_from_http(uri)
+        return uri
+
+    def _download_from_http(self, uri: str) -> str:
+        """Download a remote project in the download folder, revalidating a previous
+        download. A project is downloaded only once by manager.
 
-        return doc, project_path
+        :param uri: web URL to the QGIS project
+        :type uri: str
+
+        :return: path to the downloaded file
+        :rtype: str
+        """
+        if uri not in self.downloaded_files:
+            self.downloaded_files[uri] = download_from_http(
+                uri, self._get_download_folder()
+            )
+        return self.downloaded_files[uri]
+
+    def get_map_layer_index(self, uri: str) -> Dict[str, QtXml.QDomNode]:
+        """Return the maplayer nodes of the XML document of an URI, by layer id.
+
+        The index is built at first call and kept with the cached document.
+
+        :param uri: The URI to fetch.
+        :type uri: str
+
+        :return: dict of layer id to layer node
+        :rtype: Dict[str, QtXml.QDomNode]
+        """
+        cached = self._get_cached_document(uri)
+        if cached.map_layer_index is None:
+            cached.map_layer_index = create_map_layer_dict(cached.doc)
+        return cached.map_layer_index
 
     def getMapLayerDomFromQgs(
         self, fileName: str, layerId: str
@@ -338,7 +563,4 @@ class QgsDomManager:
         :return: The XML node of the layer.
         :rtype: QDomNode
         """
-        doc, _ = self.getQgsDoc(fileName)
-        return getFirstChildByTagNameValue(
-            doc.documentElement(), "maplayer", "id", layerId
-        )
+        return self.get_map_layer_index(fileName).get(layerId)
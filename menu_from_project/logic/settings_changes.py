@@ -0,0 +1,130 @@
+#! python3  # noqa: E265
+
+"""
+Classification of plugin settings changes, so that applying settings only reloads
+the projects and rebuilds the menus affected by the changes.
+"""
+
+# Standard library
+from dataclasses import dataclass, field
+from typing import List
+
+# project
+from menu_from_project.datamodel.project import Project
+from menu_from_project.toolbelt.preferences import PlgSettingsStructure
+
+# ############################################################################
+# ########## Globals ###############
+# ##################################
+
+# Settings changing configuration of all projects
+RELOAD_SETTINGS = ("project_read_engine", "cache_storage", "shared_cache_dir")
+# Settings only used to display menus and browser
+DISPLAY_SETTINGS = ("optionTooltip", "optionLoadAll", "optionSourceMD", "browser_name")
+# Settings used to resolve layer tooltips stored with loaded configurations
+TOOLTIP_SETTINGS = ("optionTooltip", "optionSourceMD")
+
+# Project fields used to read project configuration, cached configuration is
+# obsolete if they change
+PROJECT_SOURCE_FIELDS = ("file", "type_storage")
+# Project fields used to load project configuration
+PROJECT_LOAD_FIELDS = ("valid", "cache_config")
+# Project fields defining where project menus are displayed
+PROJECT_LOCATION_FIELDS = ("location", "enable")
+
+# ############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+@dataclass
+class SettingsChanges:
+    """Changes between previous and current plugin settings"""
+
+    # All projects must be loaded again
+    reload_all: bool = False
+    # Display options changed: all menus are rebuilt
+    display: bool = False
+    # Projects added, removed, moved or displayed elsewhere: all menus are rebuilt
+    locations: bool = False
+    # Projects renamed: only their menus are updated, with the configuration
+    # already loaded
+    renamed: bool = False
+    # Layer tooltips of loaded configurations must be resolved again
+    tooltips: bool = False
+    # Projects to load again
+    reload_projects: List[Project] = field(default_factory=list)
+    # Projects to load again whose source changed, their cache is obsolete
+    source_projects: List[Project] = field(default_factory=list)
+
+    @property
+    def rebuild_menus(self) -> bool:
+        """True if all menus must be rebuilt"""
+        return self.display or self.locations
+
+
+# ############################################################################
+# ########## Functions #############
+# ##################################
+
+
+def _changed(previous: object, current: object, names: tuple) -> bool:
+    """Check if an attribute changed
+
+    :param previous: previous object
+    :type previous: object
+    :param current: current object
+    :type current: object
+    :param names: attribute names
+    :type names: tuple
+    :return: True if one of the attributes changed
+    :rtype: bool
+    """
+    return any(getattr(previous, name) != getattr(current, name) for name in names)
+
+
+def get_settings_changes(
+    previous: PlgSettingsStructure, current: PlgSettingsStructure
+) -> SettingsChanges:
+    """Classify changes between previous and current plugin settings
+
+    :param previous: settings used for current menus
+    :type previous: PlgSettingsStructure
+    :param current: current settings
+    :type current: PlgSettingsStructure
+    :return: settings changes
+    :rtype: SettingsChanges
+    """
+    changes = SettingsChanges()
+    if _changed(previous, current, RELOAD_SETTINGS):
+        changes.reload_all = True
+        return changes
+
+    changes.display = _changed(previous, current, DISPLAY_SETTINGS)
+    changes.tooltips = current.optionTooltip and _changed(
+        previous, current, TOOLTIP_SETTINGS
+    )
+    changes.locations = [project.id for project in previous.projects] != [
+        project.id for project in current.projects
+    ]
+
+    previous_projects = {project.id: project for project in previous.projects}
+    for project in current.projects:
+        previous_project = previous_projects.get(project.id)
+        if previous_project is None:
+            changes.reload_projects.append(project)
+            continue
+        # Without name, project name is read from project file
+        if _changed(previous_project, project, PROJECT_SOURCE_FIELDS) or (
+            previous_project.name and not project.name
+        ):
+            changes.reload_projects.append(project)
+            changes.source_projects.append(project)
+        elif _changed(previous_project, project, PROJECT_LOAD_FIELDS):
+            changes.reload_projects.append(project)
+        elif previous_project.name != project.name:
+            changes.renamed = True
+        if _changed(previous_project, project, PROJECT_LOCATION_FIELDS):
+            changes.locations = True
+
+    return changes
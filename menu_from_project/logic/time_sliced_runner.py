@@ -0,0 +1,93 @@
+#! python3  # noqa: E265
+
+"""
+Cooperative execution of GUI thread work in time slices.
+
+Work is given as an iterator of steps. Steps are run until the time budget of the
+slice is spent, then remaining steps are run in a later event loop iteration, so
+that QGIS keeps repainting and handling user input during a long construction.
+"""
+
+# Standard library
+import itertools
+import time
+from typing import Iterator, Optional
+
+# PyQGIS
+from qgis.PyQt.QtCore import QObject, QTimer, pyqtSignal
+
+# ############################################################################
+# ########## Classes ###############
+# ##################################
+
+
+class TimeSlicedRunner(QObject):
+    """Run steps of an iterator on GUI thread, in slices of limited duration"""
+
+    # Emitted when all steps are run
+    finished = pyqtSignal()
+
+    def __init__(
+        self, steps: Iterator, budget_ms: int, parent: Optional[QObject] = None
+    ) -> None:
+        """Constructor
+
+        :param steps: iterator running a step of the work on each iteration
+        :type steps: Iterator
+        :param budget_ms: time budget of a slice in ms, all steps are run in one \
+        slice if 0
+        :type budget_ms: int
+        :param parent: parent object, runner is stopped with it, defaults to None
+        :type parent: Optional[QObject], optional
+        """
+        super().__init__(parent)
+        self.steps = steps
+        self.budget_ms = budget_ms
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.run_slice)
+        self._running = False
+
+    def start(self) -> None:
+        """Run first slice immediately, next slices are scheduled in event loop"""
+        self._running = True
+        self.run_slice()
+
+    def add_steps(self, steps: Iterator) -> None:
+        """Add steps run after current remaining steps. Runner is started if not
+        running.
+
+        :param steps: iterator running a step of the work on each iteration
+        :type steps: Iterator
+        """
+        if self._running:
+            self.steps = itertools.chain(self.steps, steps)
+        else:
+            self.steps = steps
+            self.start()
+
+    def cancel(self) -> None:
+        """Stop running steps, remaining steps are never run"""
+        self._running = False
+        self.timer.stop()
+        self.steps = iter(())
+
+    def is_running(self) -> bool:
+        """Check if steps remain to be run
+
+        :return: True if runner is started and not finished or canceled
+        :rtype: bool
+        """
+        return self._running
+
+    def run_slice(self) -> None:
+        """Run steps until the time budget is spent, then schedule next slice"""
+        if not self._running:
+            return
+        deadline = time.perf_counter() + self.budget_ms / 1000.0
+        for _ in self.steps:
+            if self.budget_ms > 0 and time.perf_counter() >= deadline:
+                self.timer.start(0)
+                return
+        self._running = False
+        self.finished.emit()
@@ -1,5 +1,3 @@
-from typing import Optional
-
 # PyQGIS
 from qgis.PyQt.QtXml import QDomNode
 
@@ -17,14 +15,3 @@ def getFirstChildByAttrValue(elt, tagName, key, value):
             return node
 
     return None
-
-
-def getFirstChildByTagNameValue(elt, tagName, key, value) -> Optional[QDomNode]:
-    nodes = elt.elementsByTagName(tagName)
-    for node in (nodes.at(i) for i in range(nodes.size())):
-        nd = node.namedItem(key)
-        if nd and value == nd.firstChild().toText().data():
-            # layer founds
-            return node
-
-    return None
@@ -20,9 +20,10 @@ email                : xavier.culos@eau-adour-garonne.fr
 
 # Standard library
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from functools import partial
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
 from qgis.core import QgsApplication, QgsMessageLog, QgsSettings, QgsTask
 from qgis.gui import QgisInterface
@@ -45,16 +46,31 @@ from menu_from_project.datamodel.project_config import (
     MenuLayerConfig,
     MenuProjectConfig,
 )
+from menu_from_project.logic.cache_housekeeping import CacheCleanReport, clean_cache
 from menu_from_project.logic.cache_manager import CacheManager
+from menu_from_project.logic.cache_store import CACHE_STORAGE_SQLITE, get_cache_store
+from menu_from_project.logic.embedded_groups import EmbeddedGroupConfigs
 from menu_from_project.logic.layer_load import LayerLoad
-from menu_from_project.logic.project_read import get_project_menu_config
+from menu_from_project.logic.layer_tooltip import resolve_group_tooltips
+from menu_from_project.logic.project_load import (
+    apply_project_name,
+    download_remote_files,
+    load_project_config,
+    read_cache_validations,
+)
 from menu_from_project.logic.qgs_manager import (
     QgsDomManager,
-    read_from_file,
-    read_from_http,
+    clean_legacy_unzip_folders,
+    document_cache,
+    get_open_project_archive_dir,
 )
+from menu_from_project.logic.settings_changes import get_settings_changes
+from menu_from_project.logic.time_sliced_runner import TimeSlicedRunner
 from menu_from_project.logic.tools import icon_per_layer_type
-from menu_from_project.toolbelt.preferences import PlgOptionsManager
+from menu_from_project.toolbelt.preferences import (
+    PlgOptionsManager,
+    PlgSettingsStructure,
+)
 from menu_from_project.ui.dlg_settings import MenuConfDialog
 from menu_from_project.ui.menu_layer_data_item_provider import MenuLayerProvider
 from menu_from_project.ui.wdg_settings import PlgOptionsFactory
@@ -77,6 +93,9 @@ class MenuFromProject:
         :type iface: QgsInterface
         """
         self.task = None
+        self.housekeeping_task = None
+        # Legacy temporary folders are cleaned once per plugin start
+        self.legacy_unzip_cleaned = False
         self.path = QFileInfo(os.path.realpath(__file__)).path()
 
         # initialize the locale
@@ -100,6 +119,15 @@ class MenuFromProject:
         self.qgs_dom_manager = QgsDomManager()
         self.menubarActions = []
         self.layerMenubarActions = []
+        # Enabled projects with their menu config and menus, in menus order
+        self.project_menus: List[
+            Tuple[Project, MenuProjectConfig, Tuple[Optional[QMenu], Optional[QMenu]]]
+        ] = []
+        # Loaded project configs and settings used for current menus
+        self.project_configs: List[Tuple[Project, MenuProjectConfig]] = []
+        self.applied_settings: Optional[PlgSettingsStructure] = None
+        # Cooperative construction of project menus
+        self.menu_builder: Optional[TimeSlicedRunner] = None
         self.canvas = self.iface.mapCanvas()
 
         self.mapLayerIds = {}
@@ -132,6 +160,39 @@ class MenuFromProject:
         )
 
     def initMenus(self):
+        self.remove_project_menus()
+
+        settings = self.plg_settings.get_settings_snapshot()
+        document_cache.set_max_bytes(settings.document_cache_max_size_mb * 1024 * 1024)
+
+        if settings.stale_while_revalidate:
+            # Menus are created from available caches first, then refreshed
+            self.task = QgsTask.fromFunction(
+                self.tr("Load cached projects menu configuration"),
+                self.load_all_cached_project_config,
+                settings,
+                on_finished=partial(
+                    self.cached_project_config_loaded, settings=settings
+                ),
+                flags=QgsTask.Flag.Silent,
+            )
+        else:
+            self.task = QgsTask.fromFunction(
+                self.tr("Load projects menu configuration"),
+                self.load_all_project_config,
+                settings,
+                on_finished=self.project_config_loaded,
+                flags=QgsTask.Flag.Silent,
+            )
+
+        QgsApplication.taskManager().addTask(self.task)
+
+    def remove_project_menus(self) -> None:
+        """Remove project menus from QGIS instance"""
+        if self.menu_builder:
+            self.menu_builder.cancel()
+            self.menu_builder = None
+
         menuBar = self.iface.editMenu().parentWidget()
         for action in self.menubarActions:
             menuBar.removeAction(action)
@@ -145,43 +206,164 @@ class MenuFromProject:
             del action
 
         self.layerMenubarActions = []
+        self.project_menus = []
+
+    def load_all_cached_project_config(
+        self, task: QgsTask, settings: PlgSettingsStructure
+    ) -> List[Tuple[Project, MenuProjectConfig]]:
+        """Load all project config available in cache, even expired, in a task.
+        Nothing is downloaded and no project is read.
+
+        :param task: task where the function is run
+        :type task: QgsTask
+        :param settings: plugin settings
+        :type settings: PlgSettingsStructure
+        :return: list of tuple of project and cached project menu config
+        :rtype: List[Tuple[Project, MenuProjectConfig]]
+        """
+        cache_store = None
+        if settings.cache_storage == CACHE_STORAGE_SQLITE:
+            cache_store = get_cache_store()
+        cache_manager = CacheManager(
+            self.iface,
+            cache_store=cache_store,
+            shared_cache_dir=(
+                Path(settings.shared_cache_dir) if settings.shared_cache_dir else None
+            ),
+        )
+
+        result = []
+        for project in settings.projects:
+            if task.isCanceled():
+                break
+            if not project.valid:
+                continue
+            try:
+                project_config = cache_manager.get_stale_project_menu_config(project)
+            except Exception as e:
+                self.log(self.tr(f"Can't read cache of project {project.name} : {e}"))
+                continue
+            if project_config:
+                if settings.optionTooltip:
+                    resolve_group_tooltips(
+                        project_config.root_group, settings.optionSourceMD
+                    )
+                result.append((project, apply_project_name(project, project_config)))
+        return result
+
+    def cached_project_config_loaded(
+        self,
+        exception: Any,
+        project_configs: List[Tuple[Project, MenuProjectConfig]],
+        settings: PlgSettingsStructure,
+    ) -> None:
+        """Add menus from cached project configurations, then refresh project
+        configurations in a task
+
+        :param exception: possible exception raised during load
+        :type exception: Any
+        :param project_configs: list of tuple of project and cached project menu config
+        :type project_configs: List[Tuple[Project, MenuProjectConfig]]
+        :param settings: plugin settings used to load cached configurations
+        :type settings: PlgSettingsStructure
+        """
+        if project_configs:
+            self.add_project_menus(project_configs)
 
         self.task = QgsTask.fromFunction(
-            self.tr("Load projects menu configuration"),
+            self.tr("Refresh projects menu configuration"),
             self.load_all_project_config,
-            on_finished=self.project_config_loaded,
+            settings,
+            on_finished=self.project_config_refreshed,
             flags=QgsTask.Flag.Silent,
         )
-
         QgsApplication.taskManager().addTask(self.task)
 
     def load_all_project_config(
-        self, task: QgsTask
+        self,
+        task: QgsTask,
+        settings: PlgSettingsStructure,
+        projects: Optional[List[Project]] = None,
     ) -> List[Tuple[Any, MenuProjectConfig]]:
         """Load all project config in a task
 
         :param task: task where the function is run
         :type task: QgsTask
+        :param settings: plugin settings
+        :type settings: PlgSettingsStructure
+        :param projects: projects to load, defaults to all projects in settings
+        :type projects: Optional[List[Project]], optional
         :return: list of tuple of project dict and project menu config
         :rtype: List[Tuple[Any, MenuProjectConfig]]
         """
         result = []
-        settings = self.plg_settings.get_plg_settings()
-        nb_projects = len(settings.projects)
-        for i, project in enumerate(settings.projects):
-            if not project.valid:
-                continue
-            task.setProgress(i * 100.0 / nb_projects)
-            cache_manager = CacheManager(self.iface)
-            # Try to get project configuration from cache
-            project_config = cache_manager.get_project_menu_config(project)
-            if not project_config:
-                # Create project menu configuration from QgsProject
-                project_config = get_project_menu_config(project, self.qgs_dom_manager)
-                if project_config:
-                    # Save in cache
-                    cache_manager.save_project_menu_config(project, project_config)
+        if projects is None:
+            projects = settings.projects
+        projects = [project for project in projects if project.valid]
+        nb_projects = len(projects)
+
+        # Remote files are downloaded first, all at once
+        downloaded_files = download_remote_files(
+            projects,
+            lambda nb_finished, nb_downloads: task.setProgress(
+                nb_finished * 50.0 / nb_downloads
+            ),
+        )
+        progress_start = 50.0 if downloaded_files else 0.0
+        if task.isCanceled():
+            return result
+
+        # Embedded groups and cache validation files are read once for all projects
+        embedded_groups = EmbeddedGroupConfigs()
+        cache_validations = read_cache_validations(projects, downloaded_files)
+
+        cache_store = None
+        if settings.cache_storage == CACHE_STORAGE_SQLITE:
+            cache_store = get_cache_store()
+
+        # Projects are loaded concurrently, results are kept in configured order
+        with ThreadPoolExecutor(
+            max_workers=max(1, settings.load_max_workers)
+        ) as executor:
+            futures = [
+                executor.submit(
+                    load_project_config,
+                    project,
+                    settings,
+                    downloaded_files.get(project.id),
+                    embedded_groups,
+                    cache_store,
+                    cache_validations=cache_validations,
+                )
+                for project in projects
+            ]
+            for i, _ in enumerate(as_completed(futures)):
+                task.setProgress(
+                    progress_start
+                    + (i + 1) * (100.0 - progress_start) / nb_projects
+                )
+                if task.isCanceled():
+                    for future in futures:
+                        future.cancel()
+                    break
+
+        for project, future in zip(projects, futures):
+            project_config = None
+            if not future.cancelled():
+                try:
+                    project_config = future.result()
+                except Exception as e:
+                    self.log(
+                        self.tr(
+                            f"Error during configuration load for project {project.name} : {e}"
+                        )
+                    )
             if project_config:
+                if settings.optionTooltip:
+                    # Menus and browser only assign resolved tooltips
+                    resolve_group_tooltips(
+                        project_config.root_group, settings.optionSourceMD
+                    )
                 result.append((project, project_config))
             else:
                 self.log(
@@ -189,8 +371,45 @@ class MenuFromProject:
                         f"Can't define project configuration for project {project.name}"
                     )
                 )
+
+        if settings.debug_mode:
+            self.log(self.tr(f"Project documents cache : {document_cache.stats()}"))
         return result
 
+    def reload_project_config(
+        self,
+        task: QgsTask,
+        settings: PlgSettingsStructure,
+        projects: List[Project],
+        project_configs: List[Tuple[Project, MenuProjectConfig]],
+    ) -> List[Tuple[Project, MenuProjectConfig]]:
+        """Load some project configs and resolve again layer tooltips of loaded
+        project configs in a task
+
+        :param task: task where the function is run
+        :type task: QgsTask
+        :param settings: plugin settings
+        :type settings: PlgSettingsStructure
+        :param projects: projects to load
+        :type projects: List[Project]
+        :param project_configs: loaded project configs whose layer tooltips must \
+        be resolved again
+        :type project_configs: List[Tuple[Project, MenuProjectConfig]]
+        :return: list of tuple of project and loaded project menu config
+        :rtype: List[Tuple[Project, MenuProjectConfig]]
+        """
+        # Tooltips of loaded projects are resolved with their load
+        project_ids = {project.id for project in projects}
+        for project, project_config in project_configs:
+            if task.isCanceled():
+                return []
+            if project.id in project_ids:
+                continue
+            resolve_group_tooltips(project_config.root_group, settings.optionSourceMD)
+        if not projects:
+            return []
+        return self.load_all_project_config(task, settings, projects)
+
     def project_config_loaded(
         self, exception: Any, project_configs: List[Tuple[Project, MenuProjectConfig]]
     ) -> None:
@@ -201,26 +420,242 @@ class MenuFromProject:
         :param project_configs: list of tuple of project dict and project menu config
         :type project_configs: List[Tuple[Any, MenuProjectConfig]]
         """
-        QgsApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        self.add_project_menus(project_configs)
+        self.start_cache_housekeeping()
+
+    def project_config_refreshed(
+        self,
+        exception: Any,
+        project_configs: List[Tuple[Project, MenuProjectConfig]],
+        rebuild: bool = False,
+    ) -> None:
+        """Update menus after refresh of some project configurations.
+        Only menus of changed project configurations are rebuilt. Current
+        configuration is kept for projects that couldn't be refreshed.
+
+        :param exception: possible exception raised during refresh
+        :type exception: Any
+        :param project_configs: list of tuple of project and refreshed project config
+        :type project_configs: List[Tuple[Project, MenuProjectConfig]]
+        :param rebuild: rebuild all menus, defaults to False
+        :type rebuild: bool, optional
+        """
+        configs_by_id = {
+            project.id: project_config
+            for project, project_config in self.project_configs
+        }
+        configs_by_id.update(
+            {project.id: project_config for project, project_config in project_configs}
+        )
+        settings = self.plg_settings.get_settings_snapshot()
+        # Renamed projects keep their configuration
+        project_configs = [
+            (project, apply_project_name(project, configs_by_id[project.id]))
+            for project in settings.projects
+            if project.valid and project.id in configs_by_id
+        ]
+
+        enabled_ids = [project.id for project, _ in project_configs if project.enable]
+        menu_ids = [project.id for project, _, _ in self.project_menus]
+        if rebuild or enabled_ids != menu_ids:
+            # Projects were added to menus or displayed elsewhere: all menus are
+            # created again
+            self.remove_project_menus()
+            self.add_project_menus(project_configs)
+        else:
+            self.update_project_menus(project_configs)
+        self.start_cache_housekeeping()
 
+    def add_project_menus(
+        self, project_configs: List[Tuple[Project, MenuProjectConfig]]
+    ) -> None:
+        """Add project menus and browser provider to QGIS instance
+
+        :param project_configs: list of tuple of project and project menu config
+        :type project_configs: List[Tuple[Project, MenuProjectConfig]]
+        """
+        settings = self.plg_settings.get_settings_snapshot()
         if self.provider:
             self.registry.removeProvider(self.provider)
-        self.provider = MenuLayerProvider(project_configs)
+        self.provider = MenuLayerProvider(project_configs, settings)
+        self.registry.addProvider(self.provider)
+
+        self.project_configs = project_configs
+        self.applied_settings = settings
+        # Menus are created in time slices, QGIS stays responsive with many projects
+        self.menu_builder = TimeSlicedRunner(
+            self.build_project_menus(project_configs, settings),
+            settings.menu_build_slice_ms,
+        )
+        self.menu_builder.start()
 
+    def build_project_menus(
+        self,
+        project_configs: List[Tuple[Project, MenuProjectConfig]],
+        settings: PlgSettingsStructure,
+    ) -> Iterator[None]:
+        """Add menus of enabled projects, one project at each iteration
+
+        :param project_configs: list of tuple of project and project menu config
+        :type project_configs: List[Tuple[Project, MenuProjectConfig]]
+        :param settings: plugin settings
+        :type settings: PlgSettingsStructure
+        """
         previous = None, None
         for project, project_config in project_configs:
             if project.enable:
                 # Add to QGIS instance
-                previous = self.add_project_config(project, project_config, previous)
+                previous = self.add_project_config(
+                    project, project_config, previous, settings
+                )
+                self.project_menus.append((project, project_config, previous))
+                yield
+
+    def update_project_menus(
+        self, project_configs: List[Tuple[Project, MenuProjectConfig]]
+    ) -> None:
+        """Rebuild content of menus whose project configuration changed. A menu
+        merging several projects is rebuilt for all its projects.
+
+        :param project_configs: list of tuple of project and project menu config, \
+        with the same enabled projects than current menus
+        :type project_configs: List[Tuple[Project, MenuProjectConfig]]
+        """
+        self.project_configs = project_configs
+        new_projects = {project.id: project for project, _ in project_configs}
+        new_configs = {
+            project.id: project_config for project, project_config in project_configs
+        }
+        changed_menus = [
+            menus
+            for project, project_config, menus in self.project_menus
+            if new_configs[project.id] != project_config
+        ]
+        if not changed_menus:
+            return
+
+        QgsApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+
+        settings = self.plg_settings.get_settings_snapshot()
+        if self.provider:
+            self.registry.removeProvider(self.provider)
+        self.provider = MenuLayerProvider(project_configs, settings)
+
+        project_menus = []
+        cleared_menus = []
+        for project, _, menus in self.project_menus:
+            project = new_projects[project.id]
+            project_config = new_configs[project.id]
+            project_menus.append((project, project_config, menus))
+            if menus not in changed_menus:
+                continue
+            for menu in menus:
+                if not menu:
+                    continue
+                merged = menu in cleared_menus
+                if not merged:
+                    # Menu not shown yet must not be populated with previous config
+                    try:
+                        menu.aboutToShow.disconnect()
+                    except TypeError:
+                        pass
+                    # Neither menus being populated
+                    for runner in menu.findChildren(TimeSlicedRunner):
+                        runner.cancel()
+                        runner.deleteLater()
+                    for submenu in menu.findChildren(
+                        QMenu, options=Qt.FindChildOption.FindDirectChildrenOnly
+                    ):
+                        submenu.deleteLater()
+                    menu.clear()
+                    menu.setTitle("&" + project_config.project_name)
+                    cleared_menus.append(menu)
+                self.populate_on_first_show(
+                    menu,
+                    partial(
+                        self.add_project_group_childs,
+                        project_config.root_group,
+                        menu,
+                        merged,
+                        settings,
+                    ),
+                    settings,
+                )
+        self.project_menus = project_menus
 
         self.registry.addProvider(self.provider)
         QgsApplication.restoreOverrideCursor()
 
+    def start_cache_housekeeping(self) -> None:
+        """Clean projects cache in a task"""
+        # Cache is cleaned once menus are available
+        settings = self.plg_settings.get_settings_snapshot()
+        legacy_excluded_dirs = None
+        if not self.legacy_unzip_cleaned:
+            self.legacy_unzip_cleaned = True
+            archive_dir = get_open_project_archive_dir()
+            legacy_excluded_dirs = [archive_dir] if archive_dir else []
+        self.housekeeping_task = QgsTask.fromFunction(
+            self.tr("Clean projects menu cache"),
+            self.run_cache_housekeeping,
+            list(settings.projects),
+            settings.cache_max_size_mb,
+            legacy_excluded_dirs,
+            on_finished=self.cache_housekeeping_done,
+            flags=QgsTask.Flag.Silent,
+        )
+        QgsApplication.taskManager().addTask(self.housekeeping_task)
+
+    def run_cache_housekeeping(
+        self,
+        task: QgsTask,
+        projects: List[Project],
+        max_size_mb: int,
+        legacy_excluded_dirs: Optional[List[Path]] = None,
+    ) -> CacheCleanReport:
+        """Clean projects cache in a task
+
+        :param task: task where the function is run
+        :type task: QgsTask
+        :param projects: projects in settings, caches of other projects are removed
+        :type projects: List[Project]
+        :param max_size_mb: maximum size of project caches in MB, no limit if 0
+        :type max_size_mb: int
+        :param legacy_excluded_dirs: folders kept when removing .qgz extraction \
+        folders left by previous plugin versions, no removal if None
+        :type legacy_excluded_dirs: Optional[List[Path]], optional
+        :return: report of removed caches and reclaimed space
+        :rtype: CacheCleanReport
+        """
+        if legacy_excluded_dirs is not None:
+            nb_removed = clean_legacy_unzip_folders(excluded_dirs=legacy_excluded_dirs)
+            if nb_removed:
+                self.log(
+                    self.tr(f"{nb_removed} temporary project folders removed from disk")
+                )
+        return clean_cache(projects, max_size_mb)
+
+    def cache_housekeeping_done(
+        self, exception: Any, report: Optional[CacheCleanReport]
+    ) -> None:
+        """Log what was reclaimed by cache housekeeping
+
+        :param exception: possible exception raised during housekeeping
+        :type exception: Any
+        :param report: report of removed caches and reclaimed space
+        :type report: Optional[CacheCleanReport]
+        """
+        if exception:
+            self.log(self.tr(f"Error during cache housekeeping : {exception}"))
+        elif report and report.reclaimed_bytes:
+            self.log(self.tr(f"Cache housekeeping : {report}"))
+
     def add_project_config(
         self,
         project: Project,
         project_config: MenuProjectConfig,
         previous: Tuple[Optional[QMenu], Optional[QMenu]],
+        settings: PlgSettingsStructure,
     ) -> Tuple[Optional[QMenu], Optional[QMenu]]:
         """Add a project menu configuration to current QGIS instance
 
@@ -232,24 +667,99 @@ class MenuFromProject:
         :type project_config: MenuProjectConfig
         :param previous: previous created menus
         :type previous: Tuple[Optional[QMenu], Optional[QMenu]]
+        :param settings: plugin settings
+        :type settings: PlgSettingsStructure
         :return: created menus
         :rtype: Tuple[Optional[QMenu], Optional[QMenu]]
         """
         project_menu = self.create_project_menu(
-            menu_name=project_config.project_name, project=project, previous=previous
+            menu_name=project_config.project_name,
+            project=project,
+            previous=previous,
+            settings=settings,
         )
-        if project_menu[0]:
-            self.add_group_childs(project_config.root_group, project_menu[0])
-        if project_menu[1]:
-            self.add_group_childs(project_config.root_group, project_menu[1])
+        # Menu content is only created when needed
+        for menu in project_menu:
+            if menu:
+                self.populate_on_first_show(
+                    menu,
+                    partial(
+                        self.add_project_group_childs,
+                        project_config.root_group,
+                        menu,
+                        project.location == "merge",
+                        settings,
+                    ),
+                    settings,
+                )
 
         return project_menu
 
+    def populate_on_first_show(
+        self,
+        menu: QMenu,
+        populate: Callable[[], Iterator[None]],
+        settings: PlgSettingsStructure,
+    ) -> None:
+        """Populate a menu just before it is shown for the first time. Populated
+        menu is kept.
+
+        Menu content is added in time slices: first slice is added before the menu
+        is shown, the rest while it is displayed. Contents of a menu shared by
+        several projects are added one after the other.
+
+        :param menu: menu to populate
+        :type menu: QMenu
+        :param populate: function returning an iterator adding an item of menu \
+        content at each iteration
+        :type populate: Callable[[], Iterator[None]]
+        :param settings: plugin settings
+        :type settings: PlgSettingsStructure
+        """
+
+        def on_about_to_show() -> None:
+            menu.aboutToShow.disconnect(on_about_to_show)
+            for runner in menu.findChildren(
+                TimeSlicedRunner, options=Qt.FindChildOption.FindDirectChildrenOnly
+            ):
+                if runner.is_running():
+                    runner.add_steps(populate())
+                    return
+            runner = TimeSlicedRunner(populate(), settings.menu_build_slice_ms, menu)
+            runner.finished.connect(runner.deleteLater)
+            runner.start()
+
+        menu.aboutToShow.connect(on_about_to_show)
+
+    def add_project_group_childs(
+        self,
+        group: MenuGroupConfig,
+        menu: QMenu,
+        merged: bool,
+        settings: PlgSettingsStructure,
+    ) -> Iterator[None]:
+        """Add all childs of a project root group config, one child at each iteration
+
+        :param group: project root group menu configuration
+        :type group: MenuGroupConfig
+        :param menu: project menu
+        :type menu: QMenu
+        :param merged: True if project is merged in the menu of previous project, \
+        a separator is inserted before project childs
+        :type merged: bool
+        :param settings: plugin settings
+        :type settings: PlgSettingsStructure
+        """
+        if merged:
+            menu.addSeparator()
+        yield from self.add_group_childs(group, menu, settings, [])
+
     def create_project_menu(
         self,
         menu_name: str,
         project: Project,
         previous: Tuple[Optional[QMenu], Optional[QMenu]],
+        settings: PlgSettingsStructure,
     ) -> Tuple[Optional[QMenu], Optional[QMenu]]:
         """Create project menus for project locations and add it to QGIS instance
 
@@ -259,26 +769,22 @@ class MenuFromProject:
         :type project: Project
         :param previous: previous created menus
         :type previous: Tuple[Optional[QMenu], Optional[QMenu]]
+        :param settings: plugin settings
+        :type settings: PlgSettingsStructure
         :return: created menus
         :rtype: Tuple[Optional[QMenu], Optional[QMenu]]
         """
         location = project.location
 
-        # For merge, only add separator on previous menu
+        # For merge, previous menu is used. Separator is inserted with project childs
         if location == "merge" and previous:
-            if previous[0]:
-                previous[0].addSeparator()
-            if previous[1]:
-                previous[1].addSeparator()
             return previous
 
         project_menu_layer = None
         if location.count("layer") != 0:
             menu_bar = self.iface.addLayerMenu()
             project_menu_layer = QMenu("&" + menu_name, menu_bar)
-            project_menu_layer.setToolTipsVisible(
-                self.plg_settings.get_plg_settings().optionTooltip
-            )
+            project_menu_layer.setToolTipsVisible(settings.optionTooltip)
             project_action = menu_bar.addMenu(project_menu_layer)
             self.layerMenubarActions.append(project_action)
 
@@ -286,18 +792,20 @@ class MenuFromProject:
         if location.count("new") != 0:
             menu_bar = self.iface.editMenu().parentWidget()
             project_menu_new = QMenu("&" + menu_name, menu_bar)
-            project_menu_new.setToolTipsVisible(
-                self.plg_settings.get_plg_settings().optionTooltip
-            )
+            project_menu_new.setToolTipsVisible(settings.optionTooltip)
             project_action = menu_bar.addMenu(project_menu_new)
             self.menubarActions.append(project_action)
 
         return project_menu_layer, project_menu_new
 
     def add_group_childs(
-        self, group: MenuGroupConfig, grp_menu: QMenu
-    ) -> List[MenuLayerConfig]:
-        """Add all childs of a group config
+        self,
+        group: MenuGroupConfig,
+        grp_menu: QMenu,
+        settings: PlgSettingsStructure,
+        layer_inserted: List[MenuLayerConfig],
+    ) -> Iterator[None]:
+        """Add all childs of a group config, one child at each iteration
 
         :param uri: initial uri of project (can be from local file / http / postgres)
         :type uri: str
@@ -305,38 +813,33 @@ class MenuFromProject:
         :type group: MenuGroupConfig
         :param grp_menu: menu for group
         :type grp_menu: QMenu
-        :return: list of inserted layer configuration
-        :rtype: List[MenuLayerConfig]
+        :param settings: plugin settings
+        :type settings: PlgSettingsStructure
+        :param layer_inserted: list where inserted layer configurations are added
+        :type layer_inserted: List[MenuLayerConfig]
         """
-        layer_inserted = []
-        layer_name_inserted = []
-        for child in group.childs:
+        # Each layer name is displayed once
+        for child in group.menu_childs:
             if isinstance(child, MenuGroupConfig):
-                self.add_group(child, grp_menu)
+                self.add_group(child, grp_menu, settings)
             elif isinstance(child, MenuLayerConfig):
-                # Check if this layer name was already inserted
-                if child.name not in layer_name_inserted:
-                    layer_name_list = group.get_layer_configs_from_name(child.name)
-                    if len(layer_name_list) > 1:
-                        # Multiple version of format available, must use a layer dict to create menu
-                        layer_dict = MenuGroupConfig.sort_layer_list_by_version(
-                            layer_name_list
-                        )
-                        layer_inserted.append(
-                            self.add_layer_dict(
-                                child.name, layer_dict, grp_menu, group.name
-                            )
+                layer_dict = group.layer_versions.get(child.name)
+                if layer_dict:
+                    # Multiple version of format available, must use a layer dict to create menu
+                    layer_inserted.append(
+                        self.add_layer_dict(
+                            child.name, layer_dict, grp_menu, group.name, settings
                         )
-                    else:
-                        # Only one version or format
-                        self.add_layer(child, grp_menu, group.name, child.name)
-                        layer_inserted.append(child)
-
-                    # Indicate that this layer name was added
-                    layer_name_inserted.append(child.name)
-        return layer_inserted
+                    )
+                else:
+                    # Only one version or format
+                    self.add_layer(child, grp_menu, group.name, child.name, settings)
+                    layer_inserted.append(child)
+            yield
 
-    def add_group(self, group: MenuGroupConfig, menu: QMenu) -> None:
+    def add_group(
+        self, group: MenuGroupConfig, menu: QMenu, settings: PlgSettingsStructure
+    ) -> None:
         """Add group menu configuration to a menu
 
         :param uri: initial uri of project (can be from local file / http / postgres)
@@ -345,12 +848,12 @@ class MenuFromProject:
         :type group: MenuGroupConfig
         :param menu: input menu
         :type menu: QMenu
+        :param settings: plugin settings
+        :type settings: PlgSettingsStructure
         """
 
         name = group.name
 
-        settings = self.plg_settings.get_plg_settings()
-
         # Special cases for separator and title
         # "-" => insert a separator
         if name == "-":
@@ -366,18 +869,42 @@ class MenuFromProject:
         else:
             grp_menu = menu.addMenu("&" + name)
             grp_menu.setToolTipsVisible(settings.optionTooltip)
+            # Group childs are only created when the group menu is opened
+            self.populate_on_first_show(
+                grp_menu,
+                partial(self.populate_group_menu, group, grp_menu, settings),
+                settings,
+            )
+
+    def populate_group_menu(
+        self, group: MenuGroupConfig, grp_menu: QMenu, settings: PlgSettingsStructure
+    ) -> Iterator[None]:
+        """Add all childs of a group config to the group menu, one child at each
+        iteration, then an action to load all group layers
+
+        :param group: group menu configuration
+        :type group: MenuGroupConfig
+        :param grp_menu: menu for group
+        :type grp_menu: QMenu
+        :param settings: plugin settings
+        :type settings: PlgSettingsStructure
+        """
+        name = group.name
 
-            layer_inserted = self.add_group_childs(group=group, grp_menu=grp_menu)
+        layer_inserted = []
+        yield from self.add_group_childs(group, grp_menu, settings, layer_inserted)
 
-            if len(layer_inserted) and settings.optionLoadAll:
-                action = QAction(self.tr("Load all"), self.iface.mainWindow())
-                font = QFont()
-                font.setBold(True)
-                action.setFont(font)
-                grp_menu.addAction(action)
-                action.triggered.connect(
-                    lambda checked: LayerLoad().load_layer_list(layer_inserted, name)
+        if len(layer_inserted) and settings.optionLoadAll:
+            action = QAction(self.tr("Load all"), self.iface.mainWindow())
+            font = QFont()
+            font.setBold(True)
+            action.setFont(font)
+            grp_menu.addAction(action)
+            action.triggered.connect(
+                lambda checked: LayerLoad(self.qgs_dom_manager).load_layer_list(
+                    layer_inserted, name
                 )
+            )
 
     def add_layer_dict(
         self,
@@ -385,6 +912,7 @@ class MenuFromProject:
         layer_dict: Dict[str, List[MenuLayerConfig]],
         menu: QMenu,
         group_name: str,
+        settings: PlgSettingsStructure,
     ) -> MenuLayerConfig:
         """Add a layer dict containing all versions and format of a layer
 
@@ -400,15 +928,18 @@ class MenuFromProject:
         :type menu: QMenu
         :param group_name: name of the group
         :type group_name: str
+        :param settings: plugin settings
+        :type settings: PlgSettingsStructure
         :return: first available layer config for this layer name
         :rtype: MenuLayerConfig
         """
-        settings = self.plg_settings.get_plg_settings()
         layer_menu = menu.addMenu(layer_name)
         layer_menu.setToolTipsVisible(settings.optionTooltip)
 
         first_layer = list(layer_dict.values())[0][0]
-        self.add_layer(first_layer, layer_menu, group_name, self.tr("Display layer"))
+        self.add_layer(
+            first_layer, layer_menu, group_name, self.tr("Display layer"), settings
+        )
         all_version_menu = layer_menu.addMenu(self.tr("Versions"))
         all_version_menu.setToolTipsVisible(settings.optionTooltip)
 
@@ -419,12 +950,17 @@ class MenuFromProject:
 
             # Create action for each format
             for layer in format_list:
-                self.add_layer(layer, version_menu, group_name, layer.format)
+                self.add_layer(layer, version_menu, group_name, layer.format, settings)
 
         return first_layer
 
     def add_layer(
-        self, layer: MenuLayerConfig, menu: QMenu, group_name: str, action_text: str
+        self,
+        layer: MenuLayerConfig,
+        menu: QMenu,
+        group_name: str,
+        action_text: str,
+        settings: PlgSettingsStructure,
     ) -> None:
         """Add layer menu configuration to a menu
 
@@ -436,13 +972,18 @@ class MenuFromProject:
         :type group_name: str
         :param menu: input menu
         :type menu: QMenu
+        :param action_text: text of the action
+        :type action_text: str
+        :param settings: plugin settings
+        :type settings: PlgSettingsStructure
         """
-        settings = self.plg_settings.get_plg_settings()
         action = QAction(action_text, self.iface.mainWindow())
 
         # add menu item
         action.triggered.connect(
-            lambda checked: LayerLoad().load_layer(layer, group_name)
+            lambda checked: LayerLoad(self.qgs_dom_manager).load_layer(
+                layer, group_name
+            )
         )
         action.setIcon(
             icon_per_layer_type(layer.is_spatial, layer.layer_type, layer.geometry_type)
@@ -453,7 +994,7 @@ class MenuFromProject:
         menu.addAction(action)
 
     def initGui(self):
-        settings = self.plg_settings.get_plg_settings()
+        settings = self.plg_settings.get_settings_snapshot()
         if settings.is_setup_visible:
             # settings page within the QGIS preferences menu
             if not self.options_factory:
@@ -500,32 +1041,55 @@ class MenuFromProject:
         self.iface.initializationCompleted.connect(self._apply_settings)
 
     def _apply_settings(self) -> None:
-        """Apply current settings"""
-        # clear web projects cache
-        try:
-            self.qgs_dom_manager.cache_clear()
-            read_from_http.cache_clear()
-            read_from_file.cache_clear()
-        except Exception:
-            pass
-        # Rebuild menus and browser
-        self.initMenus()
+        """Apply current settings. Only projects and menus affected by settings
+        changes are reloaded and rebuilt."""
+        settings = self.plg_settings.get_settings_snapshot()
+        if self.applied_settings is None:
+            changes = None
+        else:
+            changes = get_settings_changes(self.applied_settings, settings)
+
+        if changes is None or changes.reload_all:
+            # clear projects documents cache
+            document_cache.clear()
+            # Rebuild menus and browser
+            self.initMenus()
+            return
+
+        document_cache.set_max_bytes(settings.document_cache_max_size_mb * 1024 * 1024)
+        self.applied_settings = settings
+
+        if changes.source_projects:
+            # Cached configurations were read from previous sources
+            cache_store = None
+            if settings.cache_storage == CACHE_STORAGE_SQLITE:
+                cache_store = get_cache_store()
+            cache_manager = CacheManager(self.iface, cache_store=cache_store)
+            for project in changes.source_projects:
+                cache_manager.clear_project_cache(project)
+
+        if changes.reload_projects or changes.tooltips:
+            # Layer tooltips of loaded configurations are resolved in the task too
+            self.task = QgsTask.fromFunction(
+                self.tr("Reload projects menu configuration"),
+                self.reload_project_config,
+                settings,
+                changes.reload_projects,
+                self.project_configs if changes.tooltips else [],
+                on_finished=partial(
+                    self.project_config_refreshed, rebuild=changes.rebuild_menus
+                ),
+                flags=QgsTask.Flag.Silent,
+            )
+            QgsApplication.taskManager().addTask(self.task)
+        elif changes.rebuild_menus or changes.renamed:
+            # Menus are rebuilt or updated from loaded configurations
+            self.project_config_refreshed(None, [], rebuild=changes.rebuild_menus)
 
     def unload(self):
-        menuBar = self.iface.editMenu().parentWidget()
-        for action in self.menubarActions:
-            menuBar.removeAction(action)
-            del action
-
-        menuBar = self.iface.addLayerMenu()
-        for action in self.layerMenubarActions:
-            menuBar.removeAction(action)
-            del action
-
-        self.menubarActions = []
-        self.layerMenubarActions = []
+        self.remove_project_menus()
 
-        settings = self.plg_settings.get_plg_settings()
+        settings = self.plg_settings.get_settings_snapshot()
         if settings.is_setup_visible:
             # -- Clean up preferences panel in QGIS settings
             if self.options_factory:
@@ -4,11 +4,12 @@
 Plugin settings.
 """
 
+import threading
 import uuid
 
 # standard
-from dataclasses import dataclass, field
-from typing import List
+from dataclasses import FrozenInstanceError, dataclass, field, fields
+from typing import Any, List, Optional
 
 # PyQGIS
 from qgis.core import QgsSettings
@@ -17,17 +18,23 @@ from qgis.core import QgsSettings
 from menu_from_project.__about__ import __version__
 from menu_from_project.datamodel.project import Project, ProjectCacheConfig
 from menu_from_project.datamodel.project_config import MenuLayerConfig
-from menu_from_project.logic.qgs_manager import QgsDomManager
+from menu_from_project.logic.cache_store import CACHE_STORAGE_FILES
+from menu_from_project.logic.layer_tooltip import (  # noqa: F401
+    SOURCE_MD_LAYER,
+    SOURCE_MD_NOTE,
+    SOURCE_MD_OGC,
+    get_layer_tooltip,
+)
+from menu_from_project.logic.qgs_manager import (
+    DEFAULT_DOCUMENT_CACHE_SIZE_MB,
+    QgsDomManager,
+)
 from menu_from_project.logic.tools import guess_type_from_uri
 
 # ############################################################################
 # ########## Classes ###############
 # ##################################
 
-SOURCE_MD_OGC = "ogc"
-SOURCE_MD_LAYER = "layer"
-SOURCE_MD_NOTE = "note"
-
 
 @dataclass
 class PlgSettingsStructure:
@@ -54,56 +61,102 @@ class PlgSettingsStructure:
 
     # Internal option
     is_setup_visible: bool = True
+    # Project read engine : "stream", "dom" or "verify" (both, differences logged)
+    project_read_engine: str = "stream"
+    # Maximum number of projects loaded concurrently
+    load_max_workers: int = 4
+    # Memory budget of project XML documents cache, in MB
+    document_cache_max_size_mb: int = DEFAULT_DOCUMENT_CACHE_SIZE_MB
+    # Project menu cache storage : "files" (one folder by project) or "sqlite"
+    cache_storage: str = CACHE_STORAGE_FILES
+    # Read-only project menu cache shared by workstations, used before local cache
+    shared_cache_dir: str = ""
+    # Maximum size of project caches in MB, least recently used are evicted. 0: no
+    # limit
+    cache_max_size_mb: int = 1024
+    # Menus created from available caches, even expired, then refreshed in background
+    stale_while_revalidate: bool = False
+    # Time budget in ms of each menu construction slice, events are processed
+    # between slices. 0: menus are built at once
+    menu_build_slice_ms: int = 10
 
     def tooltip_for_layer(self, layer_config: MenuLayerConfig) -> str:
-        """Define tooltip from layer configuration and current settings
+        """Define tooltip from layer configuration and current settings. Tooltip
+        resolved when loading configuration is used if metadata sources didn't change.
 
         :param layer_config: layer configuration
         :type layer_config: MenuLayerConfig
         :return: tooltip
         :rtype: str
         """
-        abstract = ""
-        title = ""
-        for oSource in self.optionSourceMD:
-            if oSource == SOURCE_MD_OGC:
-                abstract = layer_config.abstract if abstract == "" else abstract
-                title = title or layer_config.title
-
-            if oSource == SOURCE_MD_LAYER:
-                abstract = (
-                    layer_config.metadata_abstract if abstract == "" else abstract
-                )
-                title = title or layer_config.metadata_title
+        return get_layer_tooltip(layer_config, self.optionSourceMD).tooltip
+
+
+class PlgSettingsSnapshot(PlgSettingsStructure):
+    """Immutable copy of plugin settings, lists are stored as tuples.
+
+    :param settings: plugin settings
+    :type settings: PlgSettingsStructure
+    """
+
+    def __init__(self, settings: PlgSettingsStructure) -> None:
+        for settings_field in fields(settings):
+            value = getattr(settings, settings_field.name)
+            if isinstance(value, list):
+                value = tuple(value)
+            object.__setattr__(self, settings_field.name, value)
 
-            if oSource == SOURCE_MD_NOTE:
-                abstract = layer_config.layer_notes if abstract == "" else abstract
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise FrozenInstanceError(f"cannot assign to field '{name}'")
 
-        if (abstract != "") and (title == ""):
-            tooltip = "<p>{}</p>".format(abstract)
-        else:
-            if abstract != "" or title != "":
-                tooltip = "<b>{}</b><br/>{}".format(title, abstract)
-            else:
-                tooltip = ""
-        return tooltip
+    def __delattr__(self, name: str) -> None:
+        raise FrozenInstanceError(f"cannot delete field '{name}'")
 
 
 class PlgOptionsManager:
+    # Settings read once and shared, until settings are saved
+    _snapshot: Optional[PlgSettingsSnapshot] = None
+    _snapshot_lock = threading.Lock()
+
+    @classmethod
+    def get_settings_snapshot(cls) -> PlgSettingsSnapshot:
+        """Return current plugin settings, read once and shared until settings are
+        saved. Use it in code called for each menu or browser item.
+
+        :return: immutable plugin settings
+        :rtype: PlgSettingsSnapshot
+        """
+        with cls._snapshot_lock:
+            if cls._snapshot is None:
+                cls._snapshot = PlgSettingsSnapshot(cls.get_plg_settings())
+            return cls._snapshot
+
+    @classmethod
+    def invalidate_settings_snapshot(cls) -> None:
+        """Read settings again on next snapshot request"""
+        with cls._snapshot_lock:
+            cls._snapshot = None
+
     @staticmethod
-    def get_plg_settings() -> PlgSettingsStructure:
+    def get_plg_settings(
+        settings: Optional[QgsSettings] = None,
+    ) -> PlgSettingsStructure:
         """Load and return plugin settings as a dictionary. \
         Useful to get user preferences across plugin logic.
 
+        :param settings: settings to read, for example an exported INI file, \
+        defaults to current QGIS settings
+        :type settings: Optional[QgsSettings], optional
         :return: plugin settings
         :rtype: PlgSettingsStructure
         """
         # instanciate new settings object
         options = PlgSettingsStructure()
 
-        s = QgsSettings()
+        s = QgsSettings() if settings is None else settings
 
-        if s.value("menu_from_project/is_setup_visible") is None:
+        # Settings given as parameter are not modified
+        if settings is None and s.value("menu_from_project/is_setup_visible") is None:
             # This setting does not exist. We add it by default.
             s.setValue("menu_from_project/is_setup_visible", True)
 
@@ -161,7 +214,38 @@ class PlgOptionsManager:
                         SOURCE_MD_OGC,
                     ]
 
+                options.debug_mode = s.value(
+                    "debug_mode", options.debug_mode, type=bool
+                )
                 options.browser_name = s.value("browser_name", options.browser_name)
+                options.project_read_engine = s.value(
+                    "project_read_engine", options.project_read_engine, type=str
+                )
+                options.load_max_workers = s.value(
+                    "load_max_workers", options.load_max_workers, type=int
+                )
+                options.document_cache_max_size_mb = s.value(
+                    "document_cache_max_size_mb",
+                    options.document_cache_max_size_mb,
+                    type=int,
+                )
+                options.cache_storage = s.value(
+                    "cache_storage", options.cache_storage, type=str
+                )
+                options.shared_cache_dir = s.value(
+                    "shared_cache_dir", options.shared_cache_dir, type=str
+                )
+                options.cache_max_size_mb = s.value(
+                    "cache_max_size_mb", options.cache_max_size_mb, type=int
+                )
+                options.stale_while_revalidate = s.value(
+                    "stale_while_revalidate",
+                    options.stale_while_revalidate,
+                    type=bool,
+                )
+                options.menu_build_slice_ms = s.value(
+                    "menu_build_slice_ms", options.menu_build_slice_ms, type=int
+                )
 
                 size = s.beginReadArray("projects")
                 try:
@@ -228,6 +312,21 @@ class PlgOptionsManager:
             s.setValue("optionSourceMD", ",".join(plugin_settings_obj.optionSourceMD))
 
             s.setValue("browser_name", plugin_settings_obj.browser_name)
+            s.setValue(
+                "project_read_engine", plugin_settings_obj.project_read_engine
+            )
+            s.setValue("load_max_workers", plugin_settings_obj.load_max_workers)
+            s.setValue(
+                "document_cache_max_size_mb",
+                plugin_settings_obj.document_cache_max_size_mb,
+            )
+            s.setValue("cache_storage", plugin_settings_obj.cache_storage)
+            s.setValue("shared_cache_dir", plugin_settings_obj.shared_cache_dir)
+            s.setValue("cache_max_size_mb", plugin_settings_obj.cache_max_size_mb)
+            s.setValue(
+                "stale_while_revalidate", plugin_settings_obj.stale_while_revalidate
+            )
+            s.setValue("menu_build_slice_ms", plugin_settings_obj.menu_build_slice_ms)
 
             s.remove("projects")
             s.beginWriteArray("projects", len(plugin_settings_obj.projects))
@@ -257,3 +356,4 @@ class PlgOptionsManager:
                 s.endArray()
         finally:
             s.endGroup()
+            cls.invalidate_settings_snapshot()
@@ -22,7 +22,7 @@ from menu_from_project.logic.project_read import (
     MenuProjectConfig,
 )
 from menu_from_project.logic.tools import icon_per_layer_type
-from menu_from_project.toolbelt.preferences import PlgOptionsManager
+from menu_from_project.toolbelt.preferences import PlgSettingsStructure
 
 
 class MenuLayerProvider(QgsDataItemProvider):
@@ -31,14 +31,21 @@ class MenuLayerProvider(QgsDataItemProvider):
     """class-level counter for sorting items in the order in which they were created"""
     k = 0
 
-    def __init__(self, project_configs: List[Tuple[Project, MenuProjectConfig]]):
+    def __init__(
+        self,
+        project_configs: List[Tuple[Project, MenuProjectConfig]],
+        settings: PlgSettingsStructure,
+    ):
         """Constructor for provider
 
         :param project_configs: list of project configuration
         :type project_configs: List[MenuProjectConfig]
+        :param settings: plugin settings
+        :type settings: PlgSettingsStructure
         """
         QgsDataItemProvider.__init__(self)
         self.project_configs = project_configs
+        self.settings = settings
 
     def name(self) -> str:
         """Human readable name
@@ -66,7 +73,11 @@ class MenuLayerProvider(QgsDataItemProvider):
         :return: RootCollection data item
         :rtype: QgsDataItem
         """
-        return RootCollection(parent=parentItem, project_configs=self.project_configs)
+        return RootCollection(
+            parent=parentItem,
+            project_configs=self.project_configs,
+            settings=self.settings,
+        )
 
     @classmethod
     def getNewKey(cls):
@@ -86,6 +97,7 @@ class RootCollection(QgsDataCollectionItem):
         self,
         parent: QgsDataItem,
         project_configs: List[Tuple[Project, MenuProjectConfig]],
+        settings: PlgSettingsStructure,
     ):
         """_summary_
 
@@ -93,15 +105,17 @@ class RootCollection(QgsDataCollectionItem):
         :type parent: QgsDataItem
         :param project_configs: list of project configuration
         :type project_configs: List[Tuple[Project, MenuProjectConfig]]
+        :param settings: plugin settings
+        :type settings: PlgSettingsStructure
         """
         self.key = MenuLayerProvider.getNewKey()
 
-        settings = PlgOptionsManager().get_plg_settings()
         QgsDataCollectionItem.__init__(
             self, parent, settings.browser_name, "/MenuLayer"
         )
         # TODO : define icon
         self.project_configs = project_configs
+        self.settings = settings
 
     def sortKey(self):
         """Get the sort key for the item
@@ -123,12 +137,16 @@ class RootCollection(QgsDataCollectionItem):
             if project.enable:
                 if project.location == "merge" and previous:
                     pfc = ProjectCollection(
-                        parent=previous, project_menu_config=project_config
+                        parent=previous,
+                        project_menu_config=project_config,
+                        settings=self.settings,
                     )
                     previous.merged_project.append(pfc)
                 elif project.location.count("browser"):
                     previous = ProjectCollection(
-                        parent=self, project_menu_config=project_config
+                        parent=self,
+                        project_menu_config=project_config,
+                        settings=self.settings,
                     )
                     children.append(previous)
                 else:
@@ -139,13 +157,20 @@ class RootCollection(QgsDataCollectionItem):
 class ProjectCollection(QgsDataCollectionItem):
     """QgsDataCollectionItem to add all group and layer available in a project"""
 
-    def __init__(self, parent: QgsDataItem, project_menu_config: MenuProjectConfig):
+    def __init__(
+        self,
+        parent: QgsDataItem,
+        project_menu_config: MenuProjectConfig,
+        settings: PlgSettingsStructure,
+    ):
         """Constructor for a project QgsDataCollectionItem
 
         :param parent: parent
         :type parent: QgsDataItem
         :param project_menu_config: project configuration
         :type project_menu_config: MenuProjectConfig
+        :param settings: plugin settings
+        :type settings: PlgSettingsStructure
         """
         self.key = MenuLayerProvider.getNewKey()
 
@@ -155,6 +180,7 @@ class ProjectCollection(QgsDataCollectionItem):
             self, parent, project_menu_config.project_name, self.path
         )
         self.project_menu_config = project_menu_config
+        self.settings = settings
         self.setName(project_menu_config.project_name)
         self.setIcon(QIcon(QgsApplication.iconPath("mIconFolderProject.svg")))
 
@@ -175,7 +201,9 @@ class ProjectCollection(QgsDataCollectionItem):
         :rtype: List[QgsDataItem]
         """
         root_group = GroupItem(
-            parent=self, group_config=self.project_menu_config.root_group
+            parent=self,
+            group_config=self.project_menu_config.root_group,
+            settings=self.settings,
         )
         children = root_group.createChildren()
 
@@ -188,25 +216,41 @@ class ProjectCollection(QgsDataCollectionItem):
 class GroupItem(QgsDataCollectionItem):
     """QgsDataCollectionItem to add all group and layer available in a group"""
 
-    def __init__(self, parent: QgsDataItem, group_config: MenuGroupConfig):
+    def __init__(
+        self,
+        parent: QgsDataItem,
+        group_config: MenuGroupConfig,
+        settings: PlgSettingsStructure,
+    ):
         """Constructor for a group QgsDataCollectionItem
 
         :param parent: parent
         :type parent: QgsDataItem
         :param group_config: group configuration
         :type group_config: MenuGroupConfig
+        :param settings: plugin settings
+        :type settings: PlgSettingsStructure
         """
         self.key = MenuLayerProvider.getNewKey()
 
         self.path = os.path.join(parent.path, group_config.name)
         self.group_config = group_config
+        self.settings = settings
         QgsDataCollectionItem.__init__(self, parent, group_config.name, self.path)
         self.setIcon(QIcon(QgsApplication.iconPath("mIconFolder.svg")))
 
-        self.layer_inserted = []
-        for child in self.group_config.childs:
-            if isinstance(child, MenuLayerConfig):
-                self.layer_inserted.append(child)
+    @property
+    def layer_inserted(self) -> List[MenuLayerConfig]:
+        """Layers of the group, group childs are only read when needed
+
+        :return: list of layer configuration
+        :rtype: List[MenuLayerConfig]
+        """
+        return [
+            child
+            for child in self.group_config.childs
+            if isinstance(child, MenuLayerConfig)
+        ]
 
     def sortKey(self):
         return self.key
@@ -218,44 +262,43 @@ class GroupItem(QgsDataCollectionItem):
         :rtype: List[QgsDataItem]
         """
         children = []
-        layer_name_inserted = []
-        for child in self.group_config.childs:
+        # Each layer name is displayed once
+        for child in self.group_config.menu_childs:
             if isinstance(child, MenuGroupConfig):
                 name = child.name
                 # If group name is - it should be a separator but it's not supported in browser
                 if name != "-" and name.startswith("-"):
-                    children.insert(0, SeparatorItem(parent=self, group_config=child))
+                    children.append(SeparatorItem(parent=self, group_config=child))
                 if name != "-" and not name.startswith("-"):
-                    children.insert(0, GroupItem(parent=self, group_config=child))
-            elif isinstance(child, MenuLayerConfig):
-                # Check if this layer name was already inserted
-                if child.name not in layer_name_inserted:
-                    layer_name_list = self.group_config.get_layer_configs_from_name(
-                        child.name
-                    )
-                    if len(layer_name_list) > 1:
-                        # Multiple version of format available, must use a layer dict to create children
-                        layer_dict = MenuGroupConfig.sort_layer_list_by_version(
-                            layer_name_list
+                    children.append(
+                        GroupItem(
+                            parent=self, group_config=child, settings=self.settings
                         )
-                        item = LayerDictItem(
+                    )
+            elif isinstance(child, MenuLayerConfig):
+                layer_dict = self.group_config.layer_versions.get(child.name)
+                if layer_dict:
+                    # Multiple version of format available, must use a layer dict to create children
+                    children.append(
+                        LayerDictItem(
                             parent=self,
                             layer_dict=layer_dict,
                             group_name=self.group_config.name,
+                            settings=self.settings,
                         )
-                        children.insert(0, item)
-                    else:
-                        # Only one version or format
-                        children.insert(
-                            0,
-                            LayerItem(
-                                parent=self,
-                                layer_config=child,
-                                group_name=self.group_config.name,
-                            ),
+                    )
+                else:
+                    # Only one version or format
+                    children.append(
+                        LayerItem(
+                            parent=self,
+                            layer_config=child,
+                            group_name=self.group_config.name,
+                            settings=self.settings,
                         )
-                    # Indicate that this layer name was added
-                    layer_name_inserted.append(child.name)
+                    )
+        # Children are returned last first, display order is given by sortKey
+        children.reverse()
         return children
 
     def actions(self, parent: QWidget) -> List[QAction]:
@@ -266,9 +309,7 @@ class GroupItem(QgsDataCollectionItem):
         :return: list of available actions
         :rtype: List[QAction]
         """
-        settings = PlgOptionsManager().get_plg_settings()
-
-        if len(self.layer_inserted) != 0 and settings.optionLoadAll:
+        if len(self.layer_inserted) != 0 and self.settings.optionLoadAll:
             ac_show_layer = QAction(self.tr("Load all"), parent)
             ac_show_layer.triggered.connect(self._add_layer_inserted)
             return [ac_show_layer]
@@ -280,11 +321,14 @@ class GroupItem(QgsDataCollectionItem):
 
 
 def create_add_layer_action(
-    layer: MenuLayerConfig, action_text: str, group_name: str, parent: QWidget
+    layer: MenuLayerConfig,
+    action_text: str,
+    group_name: str,
+    parent: QWidget,
+    settings: PlgSettingsStructure,
 ) -> QAction:
     action = QAction(action_text, parent)
     action.triggered.connect(lambda checked: LayerLoad().load_layer(layer, group_name))
-    settings = PlgOptionsManager().get_plg_settings()
 
     if settings.optionTooltip:
         action.setToolTip(settings.tooltip_for_layer(layer))
@@ -307,6 +351,7 @@ class LayerDictItem(QgsDataItem):
         parent: QgsDataItem,
         layer_dict: Dict[str, List[MenuLayerConfig]],
         group_name: str,
+        settings: PlgSettingsStructure,
     ):
         """Constructor of a layer dict
 
@@ -316,6 +361,8 @@ class LayerDictItem(QgsDataItem):
         :type layer_dict: Dict[str, List[MenuLayerConfig]]
         :param group_name: group name
         :type group_name: str
+        :param settings: plugin settings
+        :type settings: PlgSettingsStructure
         """
         self.key = MenuLayerProvider.getNewKey()
 
@@ -323,13 +370,12 @@ class LayerDictItem(QgsDataItem):
         self.path = os.path.join(parent.path, self.first_layer.name)
         self.layer_dict = layer_dict
         self.group_name = group_name
+        self.settings = settings
         QgsDataItem.__init__(
             self, QgsDataItem.Custom, parent, self.first_layer.name, self.path
         )
         self.setState(QgsDataItem.Populated)  # no children
 
-        settings = PlgOptionsManager().get_plg_settings()
-
         if settings.optionTooltip:
             self.setToolTip(settings.tooltip_for_layer(self.first_layer))
         self.setIcon(
@@ -364,17 +410,19 @@ class LayerDictItem(QgsDataItem):
         actions = []
         actions.append(
             create_add_layer_action(
-                self.first_layer, self.tr("Display layer"), self.group_name, parent
+                self.first_layer,
+                self.tr("Display layer"),
+                self.group_name,
+                parent,
+                self.settings,
             )
         )
 
-        settings = PlgOptionsManager().get_plg_settings()
-
         # Add menu for all version
         versions_str = self.tr("Versions")
         ac_all_version = QAction(versions_str, parent)
         all_version_menu = QMenu(versions_str, parent)
-        all_version_menu.setToolTipsVisible(settings.optionTooltip)
+        all_version_menu.setToolTipsVisible(self.settings.optionTooltip)
         ac_all_version.setMenu(all_version_menu)
         actions.append(ac_all_version)
 
@@ -389,7 +437,7 @@ class LayerDictItem(QgsDataItem):
 
             for layer in format_list:
                 ac_layer = create_add_layer_action(
-                    layer, layer.format, self.group_name, parent
+                    layer, layer.format, self.group_name, parent, self.settings
                 )
                 version_menu.addAction(ac_layer)
         return actions
@@ -399,7 +447,11 @@ class LayerItem(QgsDataItem):
     """QgsDataItem for layer"""
 
     def __init__(
-        self, parent: QgsDataItem, layer_config: MenuLayerConfig, group_name: str
+        self,
+        parent: QgsDataItem,
+        layer_config: MenuLayerConfig,
+        group_name: str,
+        settings: PlgSettingsStructure,
     ):
         """Constructor for a QgsDataItem to display layer configuration
 
@@ -409,18 +461,19 @@ class LayerItem(QgsDataItem):
         :type layer_config: MenuLayerConfig
         :param group_name: group name
         :type group_name: str
+        :param settings: plugin settings
+        :type settings: PlgSettingsStructure
         """
         self.key = MenuLayerProvider.getNewKey()
         self.layer_config = layer_config
         self.group_name = group_name
+        self.settings = settings
         self.path = os.path.join(parent.path, layer_config.name)
         QgsDataItem.__init__(
             self, QgsDataItem.Custom, parent, layer_config.name, self.path
         )
         self.setState(QgsDataItem.Populated)  # no children
 
-        settings = PlgOptionsManager().get_plg_settings()
-
         if settings.optionTooltip:
             self.setToolTip(settings.tooltip_for_layer(layer_config))
         self.setIcon(
@@ -446,7 +499,11 @@ class LayerItem(QgsDataItem):
         """
         return [
             create_add_layer_action(
-                self.layer_config, self.tr("Display layer"), self.group_name, parent
+                self.layer_config,
+                self.tr("Display layer"),
+                self.group_name,
+                parent,
+                self.settings,
             )
         ]
 
@@ -18,8 +18,10 @@ from qgis.utils import iface
 from menu_from_project.__about__ import __title__
 from menu_from_project.datamodel.project import Project, ProjectCacheConfig
 from menu_from_project.logic.cache_manager import CacheManager
+from menu_from_project.logic.cache_store import CACHE_STORAGE_SQLITE, get_cache_store
 from menu_from_project.logic.qgs_manager import QgsDomManager
 from menu_from_project.logic.tools import icon_per_storage_type
+from menu_from_project.toolbelt.preferences import PlgOptionsManager
 
 
 # ############################################################################
@@ -311,7 +313,11 @@ class ProjectWidget(QWidget):
 
     def _delete_project_cache(self) -> None:
         """Delete displayed project cache"""
-        cache_manager = CacheManager(iface)
+        cache_store = None
+        settings = PlgOptionsManager().get_plg_settings()
+        if settings.cache_storage == CACHE_STORAGE_SQLITE:
+            cache_store = get_cache_store()
+        cache_manager = CacheManager(iface, cache_store=cache_store)
         cache_manager.clear_project_cache(project=self.get_project())
 
     def _open_project_cache_folder(self) -> None:
@@ -11,7 +11,7 @@ from typing import Optional
 
 # PyQGIS
 from qgis.core import QgsApplication, QgsMessageLog
-from qgis.gui import QgsOptionsPageWidget, QgsOptionsWidgetFactory
+from qgis.gui import QgsFileWidget, QgsOptionsPageWidget, QgsOptionsWidgetFactory
 from qgis.PyQt import QtCore, uic
 from qgis.PyQt.QtCore import Qt
 from qgis.PyQt.QtGui import QIcon
@@ -25,11 +25,16 @@ from menu_from_project.__about__ import (
     __uri_homepage__,
 )
 from menu_from_project.datamodel.project import Project
+from menu_from_project.logic.cache_store import (
+    CACHE_STORAGE_FILES,
+    CACHE_STORAGE_SQLITE,
+)
 from menu_from_project.toolbelt.preferences import (
     SOURCE_MD_LAYER,
     SOURCE_MD_NOTE,
     SOURCE_MD_OGC,
     PlgOptionsManager,
+    PlgSettingsStructure,
 )
 from menu_from_project.ui.project_list_model import ProjectListModel
 
@@ -136,6 +141,36 @@ class SettingsWidget(FORM_CLASS, QgsOptionsPageWidget):
 
         self.lne_browser_name.setText(settings.browser_name)
 
+        # -- Performance and cache
+        self.sbx_load_max_workers.setClearValue(PlgSettingsStructure.load_max_workers)
+        self.sbx_load_max_workers.setValue(settings.load_max_workers)
+
+        self.sbx_document_cache_max_size.setClearValue(
+            PlgSettingsStructure.document_cache_max_size_mb
+        )
+        self.sbx_document_cache_max_size.setValue(settings.document_cache_max_size_mb)
+
+        self.sbx_menu_build_slice.setClearValue(
+            PlgSettingsStructure.menu_build_slice_ms
+        )
+        self.sbx_menu_build_slice.setValue(settings.menu_build_slice_ms)
+
+        self.cbb_cache_storage.addItem(self.tr("Files"), CACHE_STORAGE_FILES)
+        self.cbb_cache_storage.addItem(self.tr("SQLite database"), CACHE_STORAGE_SQLITE)
+        self.cbb_cache_storage.setCurrentIndex(
+            max(0, self.cbb_cache_storage.findData(settings.cache_storage))
+        )
+
+        self.sbx_cache_max_size.setClearValue(PlgSettingsStructure.cache_max_size_mb)
+        self.sbx_cache_max_size.setValue(settings.cache_max_size_mb)
+
+        self.qfile_shared_cache_dir.setStorageMode(
+            QgsFileWidget.StorageMode.GetDirectory
+        )
+        self.qfile_shared_cache_dir.setFilePath(settings.shared_cache_dir)
+
+        self.cbx_stale_while_revalidate.setChecked(settings.stale_while_revalidate)
+
         self.projetListModel = ProjectListModel(self)
         self.projetListModel.set_project_list(settings.projects)
         self.projectTableView.setModel(self.projetListModel)
@@ -222,6 +257,14 @@ class SettingsWidget(FORM_CLASS, QgsOptionsPageWidget):
 
         settings.browser_name = self.lne_browser_name.text()
 
+        settings.load_max_workers = self.sbx_load_max_workers.value()
+        settings.document_cache_max_size_mb = self.sbx_document_cache_max_size.value()
+        settings.menu_build_slice_ms = self.sbx_menu_build_slice.value()
+        settings.cache_storage = self.cbb_cache_storage.currentData()
+        settings.cache_max_size_mb = self.sbx_cache_max_size.value()
+        settings.shared_cache_dir = self.qfile_shared_cache_dir.filePath()
+        settings.stale_while_revalidate = self.cbx_stale_while_revalidate.isChecked()
+
         PlgOptionsManager().save_from_object(settings)
 
         self.settingsApplied.emit()
@@ -0,0 +1,128 @@
+#! python3  # noqa: E265
+
+"""
+Compare JSON and binary formats of project menu configuration cache.
+
+Run from the repo root folder, with QGIS Python environment:
+
+.. code-block:: bash
+
+    python -m scripts.benchmark_cache_format --layers 8000
+"""
+
+# Standard library
+import argparse
+import json
+import timeit
+from dataclasses import asdict
+
+# PyQGIS
+from qgis.core import QgsMapLayerType, QgsWkbTypes
+
+# project
+from menu_from_project.datamodel.project_config import (
+    MenuGroupConfig,
+    MenuLayerConfig,
+    MenuProjectConfig,
+)
+from menu_from_project.logic.cache_format import (
+    decode_project_menu_config,
+    encode_project_menu_config,
+)
+
+
+def create_project_config(nb_layers: int, layers_by_group: int) -> MenuProjectConfig:
+    """Create a catalog like project menu configuration
+
+    :param nb_layers: number of layers
+    :type nb_layers: int
+    :param layers_by_group: number of layers in each group
+    :type layers_by_group: int
+    :return: project menu configuration
+    :rtype: MenuProjectConfig
+    """
+    groups = []
+    for group_index in range(0, nb_layers, layers_by_group):
+        layers = [
+            MenuLayerConfig(
+                name=f"layer {i}",
+                layer_id=f"layer_{i:06d}_0123456789abcdef",
+                filename=f"/data/catalog/basemap_{group_index % 3}.qgz",
+                visible=True,
+                expanded=False,
+                embedded=True,
+                is_spatial=True,
+                layer_type=QgsMapLayerType.VectorLayer,
+                metadata_abstract=f"Abstract of layer {i}",
+                metadata_title=f"Layer {i}",
+                layer_notes="",
+                abstract="",
+                title=f"Layer {i}",
+                geometry_type=QgsWkbTypes.GeometryType.PolygonGeometry,
+                version="",
+                format="PostgreSQL",
+            )
+            for i in range(group_index, min(group_index + layers_by_group, nb_layers))
+        ]
+        groups.append(
+            MenuGroupConfig(
+                name=f"group {group_index}",
+                filename="/data/catalog/master.qgz",
+                childs=layers,
+                embedded=False,
+            )
+        )
+    return MenuProjectConfig(
+        project_name="catalog",
+        filename="/data/catalog/master.qgz",
+        uri="/data/catalog/master.qgz",
+        root_group=MenuGroupConfig(
+            name="", filename="/data/catalog/master.qgz", childs=groups, embedded=False
+        ),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--layers", type=int, default=8000)
+    parser.add_argument("--layers-by-group", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    project_config = create_project_config(args.layers, args.layers_by_group)
+    json_data = json.dumps(asdict(project_config), indent=4)
+    binary_data = encode_project_menu_config(project_config)
+
+    def best_time(function) -> float:
+        return min(timeit.repeat(function, number=1, repeat=args.repeat))
+
+    results = {
+        "json": (
+            len(json_data.encode("UTF-8")),
+            best_time(lambda: json.dumps(asdict(project_config), indent=4)),
+            best_time(lambda: MenuProjectConfig.from_dict(json.loads(json_data))),
+        ),
+        "binary": (
+            len(binary_data),
+            best_time(lambda: encode_project_menu_config(project_config)),
+            best_time(lambda: decode_project_menu_config(binary_data)),
+        ),
+        # only top-level groups decoded
+        "lazy": (
+            len(binary_data),
+            best_time(lambda: encode_project_menu_config(project_config)),
+            best_time(lambda: decode_project_menu_config(binary_data, lazy=True)),
+        ),
+    }
+
+    print(f"{args.layers} layers, {args.layers_by_group} layers by group")
+    print(f"{'format':<8}{'size (kB)':>12}{'write (ms)':>12}{'read (ms)':>12}")
+    for name, (size, write_time, read_time) in results.items():
+        print(
+            f"{name:<8}{size / 1024:>12.0f}"
+            f"{write_time * 1000:>12.1f}{read_time * 1000:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
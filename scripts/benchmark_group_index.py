@@ -0,0 +1,140 @@
+#! python3  # noqa: E265
+
+"""
+Compare layer grouping by name and version of a group, by scanning group childs
+for each layer or with the group layer index.
+
+Run from the repo root folder, with QGIS Python environment:
+
+.. code-block:: bash
+
+    python -m scripts.benchmark_group_index --layers 2500
+"""
+
+# Standard library
+import argparse
+import timeit
+from typing import Any, List, Tuple
+
+# project
+from menu_from_project.datamodel.project_config import (
+    MenuGroupConfig,
+    MenuLayerConfig,
+)
+
+
+def create_flat_group(nb_layers: int, nb_versions: int) -> MenuGroupConfig:
+    """Create a flat group of layers, some layers available in several versions
+
+    :param nb_layers: number of layers
+    :type nb_layers: int
+    :param nb_versions: number of versions of each layer name
+    :type nb_versions: int
+    :return: group configuration
+    :rtype: MenuGroupConfig
+    """
+    layers = [
+        MenuLayerConfig(
+            name=f"dataset {i // nb_versions}",
+            layer_id=f"layer_{i:06d}_0123456789abcdef",
+            filename="/data/catalog/datasets.qgz",
+            visible=True,
+            expanded=False,
+            embedded=False,
+            is_spatial=True,
+            layer_type=0,
+            metadata_abstract="",
+            metadata_title="",
+            layer_notes="",
+            abstract="",
+            title="",
+            geometry_type=2,
+            version=f"v{i % nb_versions}",
+            format="PostgreSQL",
+        )
+        for i in range(nb_layers)
+    ]
+    return MenuGroupConfig(
+        name="All datasets",
+        filename="/data/catalog/datasets.qgz",
+        childs=layers,
+        embedded=False,
+    )
+
+
+def group_layers_by_scan(group: MenuGroupConfig) -> List[Tuple[str, Any]]:
+    """Group layers by name and version, scanning group childs for each layer
+
+    :param group: group configuration
+    :type group: MenuGroupConfig
+    :return: layer, or layer dict by version, for each layer name
+    :rtype: List[Tuple[str, Any]]
+    """
+    result = []
+    layer_name_inserted = []
+    for child in group.childs:
+        if child.name not in layer_name_inserted:
+            layer_name_list = [
+                layer
+                for layer in group.childs
+                if isinstance(layer, MenuLayerConfig) and layer.name == child.name
+            ]
+            if len(layer_name_list) > 1:
+                result.append(
+                    (
+                        child.name,
+                        MenuGroupConfig.sort_layer_list_by_version(layer_name_list),
+                    )
+                )
+            else:
+                result.append((child.name, child))
+            layer_name_inserted.append(child.name)
+    return result
+
+
+def group_layers_by_index(group: MenuGroupConfig) -> List[Tuple[str, Any]]:
+    """Group layers by name and version with the group layer index
+
+    :param group: group configuration
+    :type group: MenuGroupConfig
+    :return: layer, or layer dict by version, for each layer name
+    :rtype: List[Tuple[str, Any]]
+    """
+    return [
+        (child.name, group.layer_versions.get(child.name) or child)
+        for child in group.menu_childs
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--layers", type=int, default=2500)
+    parser.add_argument("--versions", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    def best_time(function) -> float:
+        return min(timeit.repeat(function, number=1, repeat=args.repeat))
+
+    group = create_flat_group(args.layers, args.versions)
+    assert group_layers_by_scan(group) == group_layers_by_index(group)
+
+    def group_layers_with_new_index() -> None:
+        # index is computed on each run, as for a group displayed once
+        for index in ("layer_index", "layer_versions", "menu_childs"):
+            group.__dict__.pop(index, None)
+        group_layers_by_index(group)
+
+    results = {
+        "scan": best_time(lambda: group_layers_by_scan(group)),
+        "index": best_time(group_layers_with_new_index),
+    }
+
+    print(f"{args.layers} layers, {args.versions} versions by layer name")
+    print(f"{'method':<8}{'time (ms)':>12}")
+    for name, duration in results.items():
+        print(f"{name:<8}{duration * 1000:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Usage from the repo root folder:
+
+.. code-block:: bash
+
+    # for whole tests
+    python -m unittest tests.qgis.test_cache_format
+    # for specific test
+    python -m unittest tests.qgis.test_cache_format.TestCacheFormat.test_round_trip
+"""
+
+# standard library
+
+import json
+from dataclasses import asdict
+from pathlib import Path
+
+# PyQGIS
+from qgis.core import QgsMapLayerType, QgsWkbTypes
+from qgis.testing import unittest
+
+from menu_from_project.datamodel.project import Project
+from menu_from_project.datamodel.project_config import (
+    LazyMenuGroupConfig,
+    MenuProjectConfig,
+)
+from menu_from_project.logic.cache_format import (
+    CACHE_FORMAT_HEADER,
+    CACHE_FORMAT_MAGIC,
+    CACHE_FORMAT_VERSION,
+    decode_project_menu_config,
+    encode_project_menu_config,
+)
+from menu_from_project.logic.project_stream_read import read_project_menu_config
+from menu_from_project.logic.qgs_manager import QgsDomManager
+from scripts.benchmark_cache_format import create_project_config
+
+PROJECTS_DIR = Path(__file__).parent / ".." / "projects"
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class TestCacheFormat(unittest.TestCase):
+    def test_round_trip(self):
+        """Binary cache gives the same configuration as JSON cache"""
+        project_config = create_project_config(nb_layers=120, layers_by_group=50)
+
+        json_config = MenuProjectConfig.from_dict(
+            json.loads(json.dumps(asdict(project_config)))
+        )
+        binary_data = encode_project_menu_config(project_config)
+
+        self.assertEqual(decode_project_menu_config(binary_data), json_config)
+
+    def test_lazy_decode(self):
+        """Subgroups are decoded on first access"""
+        project_config = create_project_config(nb_layers=120, layers_by_group=50)
+        binary_data = encode_project_menu_config(project_config)
+
+        lazy_config = decode_project_menu_config(binary_data, lazy=True)
+        groups = lazy_config.root_group.childs
+        self.assertTrue(all(isinstance(group, LazyMenuGroupConfig) for group in groups))
+        self.assertFalse(any(group.loaded for group in groups))
+        # Groups not decoded are compared and encoded from their source
+        self.assertEqual(
+            decode_project_menu_config(binary_data, lazy=True), lazy_config
+        )
+        self.assertEqual(
+            decode_project_menu_config(encode_project_menu_config(lazy_config)),
+            project_config,
+        )
+        self.assertFalse(any(group.loaded for group in groups))
+
+        self.assertEqual(groups[0].childs, project_config.root_group.childs[0].childs)
+        self.assertTrue(groups[0].loaded)
+        self.assertFalse(groups[1].loaded)
+        self.assertEqual(lazy_config, project_config)
+
+    def test_lazy_from_dict(self):
+        """Subgroups are converted from dict on first access"""
+        project_config = create_project_config(nb_layers=120, layers_by_group=50)
+        data = json.loads(json.dumps(asdict(project_config)))
+
+        lazy_config = MenuProjectConfig.from_dict(data, lazy=True)
+
+        self.assertFalse(lazy_config.root_group.childs[0].loaded)
+        self.assertEqual(lazy_config, MenuProjectConfig.from_dict(data))
+
+    def test_parsed_project(self):
+        """Configuration decoded from cache is equal to the parsed one"""
+        filename = str(PROJECTS_DIR / "aeag-tiny.qgz")
+        project = Project(
+            name="",
+            location="layer",
+            file=filename,
+            type_storage="file",
+            id="aeag-tiny",
+        )
+        project_config = read_project_menu_config(project, QgsDomManager())
+        binary_data = encode_project_menu_config(project_config)
+
+        decoded_config = decode_project_menu_config(binary_data)
+        self.assertEqual(decoded_config, project_config)
+        self.assertEqual(
+            decode_project_menu_config(binary_data, lazy=True), project_config
+        )
+
+        layer, raster_layer = decoded_config.root_group.childs[:2]
+        self.assertEqual(layer.layer_type, QgsMapLayerType.VectorLayer)
+        self.assertIsInstance(layer.layer_type, QgsMapLayerType)
+        self.assertEqual(layer.geometry_type, QgsWkbTypes.GeometryType.PointGeometry)
+        self.assertIsInstance(layer.geometry_type, QgsWkbTypes.GeometryType)
+        self.assertEqual(raster_layer.layer_type, QgsMapLayerType.RasterLayer)
+        self.assertIsNone(raster_layer.geometry_type)
+
+    def test_invalid_payload(self):
+        """Cache with an invalid payload is ignored"""
+        project_config = create_project_config(nb_layers=10, layers_by_group=5)
+        binary_data = encode_project_menu_config(project_config)
+        header = CACHE_FORMAT_HEADER.pack(CACHE_FORMAT_MAGIC, CACHE_FORMAT_VERSION)
+        payload = json.loads(binary_data[CACHE_FORMAT_HEADER.size :])
+
+        def encode(value) -> bytes:
+            return header + json.dumps(value).encode("UTF-8")
+
+        self.assertIsNotNone(decode_project_menu_config(encode(payload)))
+        self.assertIsNone(decode_project_menu_config(header + b"\x80invalid"))
+        self.assertIsNone(decode_project_menu_config(encode(payload[:-1])))
+
+        strings, nodes = payload[-1][-1][0][-1]
+        invalid_nodes = [
+            # string index out of table
+            [nodes[0][0], len(strings), *nodes[0][2:]],
+            # boolean expected
+            [*nodes[0][:4], 1, *nodes[0][5:]],
+            # unknown layer type
+            [*nodes[0][:8], 1000, *nodes[0][9:]],
+            # unknown node
+            [2, *nodes[0][1:]],
+        ]
+        for invalid_node in invalid_nodes:
+            payload[-1][-1][0][-1] = [strings, [invalid_node, *nodes[1:]]]
+            self.assertIsNone(
+                decode_project_menu_config(encode(payload), lazy=True), invalid_node
+            )
+
+    def test_other_version(self):
+        """Cache with another format version is ignored"""
+        project_config = create_project_config(nb_layers=10, layers_by_group=5)
+        binary_data = encode_project_menu_config(project_config)
+        other_version = (
+            CACHE_FORMAT_HEADER.pack(CACHE_FORMAT_MAGIC, 0)
+            + binary_data[CACHE_FORMAT_HEADER.size :]
+        )
+
+        self.assertIsNone(decode_project_menu_config(other_version))
+        self.assertIsNone(decode_project_menu_config(b""))
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
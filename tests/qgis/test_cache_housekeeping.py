@@ -0,0 +1,171 @@
+"""
+Usage from the repo root folder:
+
+.. code-block:: bash
+
+    # for whole tests
+    python -m unittest tests.qgis.test_cache_housekeeping
+    # for specific test
+    python -m unittest tests.qgis.test_cache_housekeeping.TestCacheHousekeeping.test_lru_eviction
+"""
+
+# standard library
+
+import os
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
+
+# PyQGIS
+from qgis.core import QgsApplication
+from qgis.testing import unittest
+
+from menu_from_project.datamodel.project import Project
+from menu_from_project.logic.cache_housekeeping import clean_cache
+from menu_from_project.logic.cache_manager import CacheManager, get_local_cache_dir
+from menu_from_project.logic.cache_store import get_cache_store
+from menu_from_project.logic.http_download import get_validators_path
+from scripts.benchmark_cache_format import create_project_config
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class TestCacheHousekeeping(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.settings_dir_patch = mock.patch.object(
+            QgsApplication, "qgisSettingsDirPath", return_value=self.tmp_dir.name
+        )
+        self.settings_dir_patch.start()
+        self.cache_dir = get_local_cache_dir()
+        # fallback download folder
+        self.fallback_dir = Path(self.tmp_dir.name) / "fallback"
+        self.fallback_dir.mkdir()
+        self.fallback_dir_patch = mock.patch(
+            "menu_from_project.logic.cache_housekeeping.cache_folder",
+            self.fallback_dir,
+        )
+        self.fallback_dir_patch.start()
+
+    def tearDown(self):
+        self.fallback_dir_patch.stop()
+        self.settings_dir_patch.stop()
+        self.tmp_dir.cleanup()
+
+    def _create_cache(
+        self, project_id: str, size: int, age_days: int = 0, download_size: int = 0
+    ):
+        project_dir = self.cache_dir / project_id
+        (project_dir / "downloads").mkdir(parents=True)
+        (project_dir / "downloads" / "project.qgz").write_bytes(b"0" * download_size)
+        (project_dir / "project_config.bin").write_bytes(b"0" * size)
+        last_use = time.time() - age_days * 86400
+        os.utime(project_dir, (last_use, last_use))
+        return project_dir
+
+    def _project(self, project_id: str) -> Project:
+        return Project(
+            id=project_id, name=project_id, location="new", file="", type_storage=""
+        )
+
+    def test_unknown_projects(self):
+        """Caches of projects no longer in settings are removed"""
+        known = self._create_cache("known", 100)
+        unknown = self._create_cache("unknown", 200)
+        (self.cache_dir / "unknown.lock").write_text("")
+        leftover = self.cache_dir / "known" / ".project_config.bin.1234.tmp"
+        leftover.write_text("partial")
+        os.utime(leftover, (0, 0))
+        old_export = self.fallback_dir / "export.qgz"
+        old_export.write_bytes(b"0" * 50)
+        os.utime(old_export, (0, 0))
+        recent_export = self.fallback_dir / "recent.qgz"
+        recent_export.write_bytes(b"0" * 50)
+
+        report = clean_cache([self._project("known")])
+
+        self.assertTrue(known.exists())
+        self.assertFalse(unknown.exists())
+        self.assertFalse((self.cache_dir / "unknown.lock").exists())
+        self.assertFalse(leftover.exists())
+        self.assertFalse(old_export.exists())
+        self.assertTrue(recent_export.exists())
+        self.assertEqual(report.removed_projects, ["unknown"])
+        self.assertEqual(report.nb_removed_files, 2)
+        self.assertEqual(report.reclaimed_bytes, 200 + len("partial") + 50)
+
+    def test_fallback_revalidated(self):
+        """Files of fallback download folder are removed by last validation"""
+        revalidated = self.fallback_dir / "revalidated.qgz"
+        revalidated.write_bytes(b"0" * 50)
+        get_validators_path(revalidated).write_text('{"etag": "1"}')
+        os.utime(revalidated, (0, 0))
+        expired = self.fallback_dir / "expired.qgz"
+        expired.write_bytes(b"0" * 50)
+        get_validators_path(expired).write_text('{"etag": "2"}')
+        for path in (expired, get_validators_path(expired)):
+            os.utime(path, (0, 0))
+
+        report = clean_cache([])
+
+        self.assertTrue(revalidated.exists())
+        self.assertTrue(get_validators_path(revalidated).exists())
+        self.assertFalse(expired.exists())
+        self.assertFalse(get_validators_path(expired).exists())
+        self.assertEqual(report.nb_removed_files, 2)
+
+    def test_lru_eviction(self):
+        """Least recently used caches are evicted over size limit, downloaded
+        files are kept"""
+        old = self._create_cache(
+            "old", 600 * 1024, age_days=10, download_size=2 * 1024 * 1024
+        )
+        recent = self._create_cache("recent", 600 * 1024, age_days=1)
+
+        report = clean_cache(
+            [self._project("old"), self._project("recent")], max_size_mb=1
+        )
+
+        self.assertFalse((old / "project_config.bin").exists())
+        self.assertTrue((old / "downloads" / "project.qgz").exists())
+        self.assertTrue((recent / "project_config.bin").exists())
+        self.assertEqual(report.evicted_projects, ["old"])
+        self.assertEqual(report.reclaimed_bytes, 600 * 1024)
+
+    def test_lru_eviction_sqlite(self):
+        """Size limit applies to projects in SQLite store, without project
+        directories"""
+        cache_store = get_cache_store()
+        self.addCleanup(cache_store.close)
+        cache_manager = CacheManager(None, cache_store=cache_store)
+        for project_id in ("old", "recent"):
+            project = self._project(project_id)
+            cache_manager.save_project_menu_config(
+                project, create_project_config(nb_layers=2000, layers_by_group=50)
+            )
+            cache_manager.touch_project_cache(project)
+            time.sleep(0.01)
+
+        self.assertEqual(list(self.cache_dir.glob("*/")), [])
+        sizes = {
+            project_id: size
+            for project_id, _, size in cache_store.get_project_usages()
+        }
+        report = clean_cache(
+            [self._project("old"), self._project("recent")],
+            max_size_mb=(sizes["old"] + sizes["recent"] - 1) / (1024 * 1024),
+        )
+
+        self.assertEqual(report.evicted_projects, ["old"])
+        self.assertEqual(report.reclaimed_bytes, sizes["old"])
+        self.assertEqual(cache_store.get_project_ids(), ["recent"])
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,177 @@
+"""
+Usage from the repo root folder:
+
+.. code-block:: bash
+
+    # for whole tests
+    python -m unittest tests.qgis.test_cache_lock
+    # for specific test
+    python -m unittest tests.qgis.test_cache_lock.TestCacheLock.test_single_refresh
+"""
+
+# standard library
+
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Tuple
+from unittest import mock
+
+# PyQGIS
+from qgis.core import QgsApplication
+from qgis.testing import unittest
+
+from menu_from_project.datamodel.project import Project, ProjectCacheConfig
+from menu_from_project.logic.atomic_file import DEFAULT_FILE_MODE, atomic_write_bytes
+from menu_from_project.logic.cache_format import decode_project_menu_config
+from menu_from_project.logic.cache_manager import CacheManager
+from scripts.benchmark_cache_format import create_project_config
+
+# ############################################################################
+# ########## Globals #############
+# ################################
+
+# Number of QGIS instances simulated
+NB_PROCESSES = 6
+
+# ############################################################################
+# ########## Functions #############
+# ################################
+
+
+def patch_settings_dir(settings_dir: str):
+    """Use the same settings directory in all processes"""
+    return mock.patch.object(
+        QgsApplication, "qgisSettingsDirPath", return_value=settings_dir
+    )
+
+
+def create_project() -> Project:
+    return Project(
+        id="test_cache_lock",
+        name="test",
+        location="new",
+        file="project.qgs",
+        type_storage="file",
+        cache_config=ProjectCacheConfig(enable=True, refresh_days_period=1),
+    )
+
+
+def refresh_project(settings_dir: str) -> Tuple[bool, bool]:
+    """Load project configuration like a starting QGIS instance
+
+    :return: project read from source, project configuration available
+    """
+    read = []
+
+    def read_project_config():
+        # slow project read, so that other instances start during refresh
+        time.sleep(0.5)
+        read.append(True)
+        return create_project_config(nb_layers=2000, layers_by_group=50)
+
+    with patch_settings_dir(settings_dir):
+        project_config = CacheManager(None).get_or_create_project_menu_config(
+            create_project(), read_project_config
+        )
+    return bool(read), project_config is not None
+
+
+def write_cache(settings_dir: str, nb_writes: int) -> None:
+    """Save project cache several times"""
+    project_config = create_project_config(nb_layers=2000, layers_by_group=50)
+    with patch_settings_dir(settings_dir):
+        cache_manager = CacheManager(None)
+        for _ in range(nb_writes):
+            cache_manager.save_project_menu_config(create_project(), project_config)
+
+
+def read_cache(settings_dir: str, duration: float) -> int:
+    """Read project cache files during a duration
+
+    :return: number of invalid reads
+    """
+    with patch_settings_dir(settings_dir):
+        cache_dir = CacheManager(None).get_project_cache_dir(create_project())
+    invalid_reads = 0
+    end = time.monotonic() + duration
+    while time.monotonic() < end:
+        try:
+            data = (cache_dir / "project_config.bin").read_bytes()
+            cache_info = (cache_dir / "cache_info.json").read_text(encoding="UTF-8")
+        except FileNotFoundError:
+            continue
+        if decode_project_menu_config(data) is None:
+            invalid_reads += 1
+        try:
+            json.loads(cache_info)
+        except ValueError:
+            invalid_reads += 1
+    return invalid_reads
+
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class TestCacheLock(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.settings_dir = self.tmp_dir.name
+        # spawn: processes don't share any state, like QGIS instances
+        self.context = multiprocessing.get_context("spawn")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_single_refresh(self):
+        """Project is read by a single instance, others reuse its cache"""
+        with self.context.Pool(NB_PROCESSES) as pool:
+            results = pool.map(refresh_project, [self.settings_dir] * NB_PROCESSES)
+
+        self.assertEqual(sum(read for read, _ in results), 1)
+        self.assertTrue(all(available for _, available in results))
+
+    def test_atomic_writes(self):
+        """Cache files being written are never read partially"""
+        with self.context.Pool(NB_PROCESSES) as pool:
+            readers = [
+                pool.apply_async(read_cache, (self.settings_dir, 3.0))
+                for _ in range(NB_PROCESSES // 2)
+            ]
+            writers = [
+                pool.apply_async(write_cache, (self.settings_dir, 20))
+                for _ in range(NB_PROCESSES - NB_PROCESSES // 2)
+            ]
+            for writer in writers:
+                writer.get()
+            self.assertEqual([reader.get() for reader in readers], [0] * len(readers))
+
+        # No temporary file left
+        cache_dir = Path(self.settings_dir) / "cache" / "menu_from_project"
+        self.assertEqual(list(cache_dir.glob("**/*.tmp")), [])
+
+    @unittest.skipIf(os.name == "nt", "POSIX file modes")
+    def test_atomic_write_mode(self):
+        """Written files are readable by other accounts, as with open()"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "project_config.bin"
+            atomic_write_bytes(path, b"config")
+            self.assertEqual(path.stat().st_mode & 0o777, DEFAULT_FILE_MODE)
+
+            # Mode of replaced file is kept
+            path.chmod(0o640)
+            atomic_write_bytes(path, b"new config")
+            self.assertEqual(path.stat().st_mode & 0o777, 0o640)
+            self.assertEqual(path.read_bytes(), b"new config")
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,251 @@
+"""
+Usage from the repo root folder:
+
+.. code-block:: bash
+
+    # for whole tests
+    python -m unittest tests.qgis.test_cache_manager
+    # for specific test
+    python -m unittest tests.qgis.test_cache_manager.TestCacheManager.test_expired_cache_extended
+"""
+
+# standard library
+
+import tempfile
+from dataclasses import replace
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest import mock
+
+# PyQGIS
+from qgis.core import QgsApplication
+from qgis.testing import unittest
+
+from menu_from_project.datamodel.project import Project, ProjectCacheConfig
+from menu_from_project.datamodel.project_config import MenuGroupConfig
+from menu_from_project.logic.cache_manager import (
+    CacheManager,
+    compute_source_digest,
+    get_uri_project_id,
+)
+from scripts.benchmark_cache_format import create_project_config
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class TestCacheManager(unittest.TestCase):
+    def setUp(self):
+        self.cache_manager = CacheManager(None)
+        self.project = Project(
+            id="test_cache_manager",
+            name="test",
+            location="new",
+            file="project.qgs",
+            type_storage="file",
+            cache_config=ProjectCacheConfig(enable=True, refresh_days_period=1),
+        )
+
+    def tearDown(self):
+        self.cache_manager.clear_project_cache(self.project)
+
+    def _save_expired_cache_info(self, source_digest: str) -> None:
+        last_refresh = datetime.now() - timedelta(days=2)
+        cache_info_path = (
+            self.cache_manager.get_project_cache_dir(self.project) / "cache_info.json"
+        )
+        cache_info_path.write_text(
+            f'{{"source_digest": "{source_digest}", "source_files": [], '
+            f'"last_refresh": "{last_refresh.strftime(CacheManager.DATETIME_FORMAT)}"}}'
+        )
+
+    def test_expired_cache_extended(self):
+        """Expired cache is kept if project file didn't change"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            project_path = Path(tmp_dir) / "project.qgs"
+            project_path.write_text("<qgis/>")
+            self._save_expired_cache_info(compute_source_digest([str(project_path)]))
+
+            self.assertTrue(
+                self.cache_manager.check_if_cache_enabled(
+                    self.project, lambda: str(project_path)
+                )
+            )
+            # Cache lifetime was extended
+            self.assertTrue(self.cache_manager.check_if_cache_enabled(self.project))
+
+    def test_expired_cache_changed_project(self):
+        """Expired cache is not used if project file changed"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            project_path = Path(tmp_dir) / "project.qgs"
+            project_path.write_text("<qgis/>")
+            self._save_expired_cache_info(compute_source_digest([str(project_path)]))
+            project_path.write_text("<qgis><title>changed</title></qgis>")
+
+            self.assertFalse(
+                self.cache_manager.check_if_cache_enabled(
+                    self.project, lambda: str(project_path)
+                )
+            )
+
+    def test_stale_cache(self):
+        """Expired cache is available for stale menus"""
+        project_config = create_project_config(nb_layers=10, layers_by_group=5)
+        self.cache_manager.save_project_menu_config(self.project, project_config)
+        self._save_expired_cache_info("")
+
+        self.assertIsNone(self.cache_manager.get_project_menu_config(self.project))
+        self.assertEqual(
+            self.cache_manager.get_stale_project_menu_config(self.project),
+            project_config,
+        )
+
+    def test_shared_cache(self):
+        """Shared cache is used if up to date, local cache is rebuilt otherwise"""
+        with tempfile.TemporaryDirectory() as shared_dir:
+            shared_config = create_project_config(nb_layers=10, layers_by_group=5)
+            CacheManager(None, cache_dir=Path(shared_dir)).save_project_menu_config(
+                self.project, shared_config
+            )
+            local_config = create_project_config(nb_layers=5, layers_by_group=5)
+            cache_manager = CacheManager(None, shared_cache_dir=Path(shared_dir))
+
+            self.assertEqual(
+                cache_manager.get_or_create_project_menu_config(
+                    self.project, lambda: local_config
+                ),
+                shared_config,
+            )
+
+            # Shared cache outdated by a new release
+            shared_refresh = datetime.now() - timedelta(hours=1)
+            (Path(shared_dir) / self.project.id / "cache_info.json").write_text(
+                f'{{"last_refresh": '
+                f'"{shared_refresh.strftime(CacheManager.DATETIME_FORMAT)}"}}'
+            )
+            validation_path = Path(shared_dir) / "last_release.json"
+            last_release = datetime.now() - timedelta(minutes=1)
+            validation_path.write_text(
+                f'{{"last_release": '
+                f'"{last_release.strftime(CacheManager.DATETIME_FORMAT)}"}}'
+            )
+            self.project.cache_config.cache_validation_uri = str(validation_path)
+
+            self.assertEqual(
+                cache_manager.get_or_create_project_menu_config(
+                    self.project, lambda: local_config
+                ),
+                local_config,
+            )
+            self.assertEqual(
+                CacheManager(None).get_project_menu_config(self.project), local_config
+            )
+
+    def test_shared_cache_by_uri(self):
+        """Shared cache prebuilt for a project URI is found with another id"""
+        with tempfile.TemporaryDirectory() as shared_dir:
+            shared_config = create_project_config(nb_layers=10, layers_by_group=5)
+            uri_project = replace(
+                self.project, id=get_uri_project_id(self.project.file)
+            )
+            CacheManager(None, cache_dir=Path(shared_dir)).save_project_menu_config(
+                uri_project, shared_config
+            )
+            cache_manager = CacheManager(None, shared_cache_dir=Path(shared_dir))
+
+            self.assertEqual(
+                cache_manager.get_or_create_project_menu_config(
+                    self.project, lambda: None
+                ),
+                shared_config,
+            )
+
+    def _set_filenames(self, group_config: MenuGroupConfig, filename: str) -> None:
+        group_config.filename = filename
+        for child in group_config.childs:
+            if isinstance(child, MenuGroupConfig):
+                self._set_filenames(child, filename)
+            else:
+                child.filename = filename
+
+    def test_shared_cache_downloads(self):
+        """Downloaded project files of a shared cache are resolved in the download
+        directory of the workstation using the cache, downloaded if missing"""
+        project = replace(
+            self.project,
+            file="https://example.com/projects/catalog.qgz",
+            type_storage="http",
+        )
+        uri_project = replace(project, id=get_uri_project_id(project.file))
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            shared_dir = Path(tmp_dir) / "shared"
+            # Cache built by another workstation
+            with mock.patch.object(
+                QgsApplication,
+                "qgisSettingsDirPath",
+                return_value=str(Path(tmp_dir) / "builder"),
+            ):
+                builder_path = str(
+                    CacheManager(None).get_project_download_dir(uri_project)
+                    / "catalog.qgz"
+                )
+                shared_config = create_project_config(nb_layers=10, layers_by_group=5)
+                self._set_filenames(shared_config.root_group, builder_path)
+                shared_config.filename = builder_path
+                CacheManager(None, cache_dir=shared_dir).save_project_menu_config(
+                    uri_project, shared_config
+                )
+
+            with mock.patch.object(
+                QgsApplication,
+                "qgisSettingsDirPath",
+                return_value=str(Path(tmp_dir) / "workstation"),
+            ):
+                cache_manager = CacheManager(None, shared_cache_dir=shared_dir)
+                local_path = (
+                    cache_manager.get_project_download_dir(project) / "catalog.qgz"
+                )
+
+                def download() -> str:
+                    local_path.write_text("<qgis/>")
+                    return str(local_path)
+
+                project_config = cache_manager.get_or_create_project_menu_config(
+                    project, lambda: None, download
+                )
+
+                self.assertTrue(local_path.exists())
+                self.assertEqual(project_config.filename, str(local_path))
+                expected_config = create_project_config(
+                    nb_layers=10, layers_by_group=5
+                )
+                self._set_filenames(expected_config.root_group, str(local_path))
+                expected_config.filename = str(local_path)
+                self.assertEqual(project_config, expected_config)
+                cache_manager.clear_project_cache(project)
+
+    def test_cache_validations_shared(self):
+        """A cache validation file is read once for all projects"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            validation_path = Path(tmp_dir) / "release.json"
+            validation_path.write_text('{"last_release": "01/01/2024 00:00:00"}')
+            cache_validations = {}
+
+            first = CacheManager(
+                None, cache_validations=cache_validations
+            ).get_cache_validation(str(validation_path))
+            validation_path.unlink()
+            second = CacheManager(
+                None, cache_validations=cache_validations
+            ).get_cache_validation(str(validation_path))
+
+            self.assertEqual(first, {"last_release": "01/01/2024 00:00:00"})
+            self.assertIs(first, second)
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+"""
+Usage from the repo root folder:
+
+.. code-block:: bash
+
+    # for whole tests
+    python -m unittest tests.qgis.test_cache_prebuild
+    # for specific test
+    python -m unittest tests.qgis.test_cache_prebuild.TestCachePrebuild.test_prebuild_caches
+"""
+
+# standard library
+
+import tempfile
+from pathlib import Path
+
+# PyQGIS
+from qgis.testing import unittest
+
+from menu_from_project.cache_prebuild import get_uri_project, prebuild_caches
+from menu_from_project.logic.cache_manager import CacheManager
+from menu_from_project.toolbelt.preferences import PlgSettingsStructure
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+PROJECTS_DIR = Path(__file__).parent / ".." / "projects"
+
+
+class TestCachePrebuild(unittest.TestCase):
+    def test_prebuild_caches(self):
+        """Prebuilt caches are the ones read by the plugin"""
+        projects = [
+            get_uri_project(str(filename))
+            for filename in sorted(PROJECTS_DIR.glob("*.qgz"))
+        ]
+        projects.append(get_uri_project(str(PROJECTS_DIR / "missing.qgz")))
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            results = prebuild_caches(
+                projects, PlgSettingsStructure(), cache_dir=Path(cache_dir)
+            )
+            cache_manager = CacheManager(None, cache_dir=Path(cache_dir))
+
+            self.assertEqual([result.project for result in results], projects)
+            for result in results[:-1]:
+                self.assertEqual(result.error, "")
+                self.assertGreater(result.nb_layers, 0)
+                self.assertIsNotNone(
+                    cache_manager.get_project_menu_config(result.project)
+                )
+            self.assertNotEqual(results[-1].error, "")
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+"""
+Usage from the repo root folder:
+
+.. code-block:: bash
+
+    # for whole tests
+    python -m unittest tests.qgis.test_cache_store
+    # for specific test
+    python -m unittest tests.qgis.test_cache_store.TestSqliteCacheStore.test_round_trip
+"""
+
+# standard library
+
+import json
+import tempfile
+from dataclasses import asdict
+from pathlib import Path
+
+# PyQGIS
+from qgis.testing import unittest
+
+from menu_from_project.datamodel.project_config import MenuProjectConfig
+from menu_from_project.logic.cache_store import SqliteCacheStore
+from scripts.benchmark_cache_format import create_project_config
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class TestSqliteCacheStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.store = SqliteCacheStore(Path(self.tmp_dir.name) / "cache.sqlite")
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp_dir.cleanup()
+
+    def test_round_trip(self):
+        """SQLite cache gives the same configuration as JSON cache"""
+        project_config = create_project_config(nb_layers=120, layers_by_group=50)
+        json_config = MenuProjectConfig.from_dict(
+            json.loads(json.dumps(asdict(project_config)))
+        )
+
+        self.store.save_project_menu_config("project", project_config, {})
+
+        self.assertEqual(self.store.get_project_menu_config("project"), json_config)
+        self.assertEqual(self.store.get_cache_info("project"), {})
+
+    def test_replace(self):
+        """Saving a project replaces its rows only"""
+        self.store.save_project_menu_config(
+            "first", create_project_config(nb_layers=20, layers_by_group=5), {}
+        )
+        other_config = create_project_config(nb_layers=10, layers_by_group=5)
+        self.store.save_project_menu_config("second", other_config, {})
+        replaced_config = create_project_config(nb_layers=5, layers_by_group=5)
+        self.store.save_project_menu_config(
+            "first", replaced_config, {"last_refresh": "now"}
+        )
+
+        self.assertEqual(self.store.get_project_menu_config("first"), replaced_config)
+        self.assertEqual(self.store.get_project_menu_config("second"), other_config)
+        self.assertEqual(self.store.get_cache_info("first"), {"last_refresh": "now"})
+
+    def test_layer_lookup_and_remove(self):
+        """Layers are read from id, removed with their project"""
+        project_config = create_project_config(nb_layers=10, layers_by_group=5)
+        layer = project_config.root_group.childs[0].childs[0]
+        self.store.save_project_menu_config("project", project_config, {})
+
+        self.assertEqual(
+            self.store.get_layer_config("project", layer.layer_id), layer
+        )
+
+        self.store.remove_project("project")
+
+        self.assertIsNone(self.store.get_project_menu_config("project"))
+        self.assertIsNone(self.store.get_layer_config("project", layer.layer_id))
+        self.assertEqual(self.store.get_cache_info("project"), {})
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+"""
+Usage from the repo root folder:
+
+.. code-block:: bash
+
+    # for whole tests
+    python -m unittest tests.qgis.test_concurrent_load
+    # for specific test
+    python -m unittest tests.qgis.test_concurrent_load.TestConcurrentLoad.test_order_and_errors
+"""
+
+# standard library
+
+import time
+from unittest import mock
+
+# PyQGIS
+from qgis.testing import unittest
+
+from menu_from_project.datamodel.project import Project
+from menu_from_project.datamodel.project_config import (
+    MenuGroupConfig,
+    MenuProjectConfig,
+)
+from menu_from_project.menu_from_project import MenuFromProject
+from menu_from_project.toolbelt.preferences import PlgSettingsStructure
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class TestConcurrentLoad(unittest.TestCase):
+    def _load_project_config(self, project: Project, *args, **kwargs):
+        """Load a project config, first projects are the slowest"""
+        time.sleep(self.delays[project.id])
+        if project.id == "failing":
+            raise ValueError("invalid project")
+        return MenuProjectConfig(
+            project_name=project.name,
+            filename=project.file,
+            uri=project.file,
+            root_group=MenuGroupConfig(
+                name="", filename=project.file, childs=[], embedded=False
+            ),
+        )
+
+    def test_order_and_errors(self):
+        """Configs are returned in projects order, a failing project is skipped"""
+        self.delays = {"slow": 0.2, "failing": 0.1, "medium": 0.05, "fast": 0}
+        projects = [
+            Project(
+                name=project_id,
+                location="new",
+                file=f"{project_id}.qgs",
+                type_storage="file",
+                id=project_id,
+            )
+            for project_id in self.delays
+        ]
+        settings = PlgSettingsStructure(projects=projects, load_max_workers=4)
+        task = mock.Mock()
+        task.isCanceled.return_value = False
+
+        # Plugin state is not used to load projects
+        plugin = MenuFromProject.__new__(MenuFromProject)
+        with mock.patch(
+            "menu_from_project.menu_from_project.download_remote_files",
+            return_value={},
+        ), mock.patch(
+            "menu_from_project.menu_from_project.load_project_config",
+            side_effect=self._load_project_config,
+        ) as load_project_config, mock.patch.object(
+            MenuFromProject, "log"
+        ) as log:
+            result = plugin.load_all_project_config(task, settings)
+
+        self.assertEqual(load_project_config.call_count, 4)
+        self.assertEqual(
+            [(project.id, config.project_name) for project, config in result],
+            [("slow", "slow"), ("medium", "medium"), ("fast", "fast")],
+        )
+        messages = [call.args[0] for call in log.call_args_list]
+        self.assertTrue(
+            any(
+                "failing" in message and "invalid project" in message
+                for message in messages
+            )
+        )
+        self.assertEqual(task.setProgress.call_count, 4)
+        self.assertEqual(task.setProgress.call_args.args[0], 100.0)
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+"""
+Usage from the repo root folder:
+
+.. code-block:: bash
+
+    # for whole tests
+    python -m unittest tests.qgis.test_document_cache
+    # for specific test
+    python -m unittest tests.qgis.test_document_cache.TestDocumentCache.test_eviction
+"""
+
+# standard library
+
+import tempfile
+from pathlib import Path
+
+# PyQGIS
+from qgis.PyQt import QtXml
+from qgis.testing import unittest
+
+from menu_from_project.logic.document_cache import (
+    DOM_SIZE_FACTOR,
+    CachedDocument,
+    DocumentCache,
+    estimate_document_size,
+    file_fingerprint,
+)
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class TestDocumentCache(unittest.TestCase):
+    def _document(self, size: int) -> CachedDocument:
+        return CachedDocument(
+            doc=QtXml.QDomDocument(), project_path="project.qgs", size=size
+        )
+
+    def test_eviction(self):
+        """Least recently used documents are evicted when budget is exceeded"""
+        cache = DocumentCache(max_bytes=100)
+        cache.put("a", self._document(40))
+        cache.put("b", self._document(40))
+        self.assertIsNotNone(cache.get("a"))
+        cache.put("c", self._document(40))
+
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNotNone(cache.get("c"))
+
+        stats = cache.stats()
+        self.assertEqual(stats["evictions"], 1)
+        self.assertEqual(stats["hits"], 3)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["entries"], 2)
+        self.assertEqual(stats["size"], 80)
+
+    def test_last_document_kept(self):
+        """A document bigger than budget is kept until next document"""
+        cache = DocumentCache(max_bytes=10)
+        cache.put("a", self._document(40))
+        self.assertIsNotNone(cache.get("a"))
+
+        cache.set_max_bytes(0)
+        self.assertIsNotNone(cache.get("a"))
+
+        cache.clear()
+        self.assertEqual(cache.stats()["size"], 0)
+
+    def test_fingerprint_invalidation(self):
+        """A document is read again only if its file changed"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = Path(tmp_dir) / "project.qgs"
+            filename.write_text("<qgis/>")
+            fingerprint = file_fingerprint(str(filename))
+
+            cache = DocumentCache(max_bytes=100)
+            document = self._document(10)
+            document.fingerprint = fingerprint
+            cache.put("a", document)
+            self.assertIsNotNone(cache.get("a", file_fingerprint(str(filename))))
+
+            filename.write_text("<qgis><title>changed</title></qgis>")
+            self.assertIsNone(cache.get("a", file_fingerprint(str(filename))))
+
+            stats = cache.stats()
+            self.assertEqual(stats["invalidations"], 1)
+            self.assertEqual(stats["entries"], 0)
+            self.assertIsNone(file_fingerprint(str(Path(tmp_dir) / "missing.qgs")))
+
+    def test_estimate_document_size(self):
+        """Size estimation uses uncompressed .qgs size"""
+        filename = str(Path(__file__).parent / ".." / "projects" / "aeag-tiny.qgz")
+        self.assertEqual(estimate_document_size(filename), 112267 * DOM_SIZE_FACTOR)
+        self.assertEqual(estimate_document_size("not_available.qgs"), 0)
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
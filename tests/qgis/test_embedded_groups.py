@@ -0,0 +1,72 @@
+"""
+Usage from the repo root folder:
+
+.. code-block:: bash
+
+    # for whole tests
+    python -m unittest tests.qgis.test_embedded_groups
+    # for specific test
+    python -m unittest tests.qgis.test_embedded_groups.TestEmbeddedGroupConfigs.test_cycle
+"""
+
+# standard library
+
+# PyQGIS
+from qgis.testing import unittest
+
+from menu_from_project.datamodel.project_config import MenuGroupConfig
+from menu_from_project.logic.embedded_groups import EmbeddedGroupConfigs
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class TestEmbeddedGroupConfigs(unittest.TestCase):
+    def test_memoise(self):
+        """A group is read once, whatever the path used for its project"""
+        embedded_groups = EmbeddedGroupConfigs()
+        reads = []
+
+        def read_group():
+            reads.append(1)
+            return MenuGroupConfig(
+                name="basemap", filename="base.qgs", childs=[], embedded=False
+            )
+
+        first = embedded_groups.get("base.qgs", "basemap", read_group)
+        second = embedded_groups.get("./sub/../base.qgs", "basemap", read_group)
+
+        self.assertIs(first, second)
+        self.assertEqual(len(reads), 1)
+
+    def test_cycle(self):
+        """Projects embedding each other are resolved without infinite recursion"""
+        embedded_groups = EmbeddedGroupConfigs()
+
+        def read_a():
+            child = embedded_groups.get("b.qgs", "group", read_b)
+            return MenuGroupConfig(
+                name="group", filename="a.qgs", childs=[child], embedded=True
+            )
+
+        def read_b():
+            child = embedded_groups.get("a.qgs", "group", read_a)
+            return MenuGroupConfig(
+                name="group",
+                filename="b.qgs",
+                childs=[child] if child else [],
+                embedded=True,
+            )
+
+        group = embedded_groups.get("a.qgs", "group", read_a)
+
+        self.assertEqual(group.childs[0].filename, "b.qgs")
+        self.assertEqual(group.childs[0].childs, [])
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
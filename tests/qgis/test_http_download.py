@@ -0,0 +1,152 @@
+"""
+Usage from the repo root folder:
+
+.. code-block:: bash
+
+    # for whole tests
+    python -m unittest tests.qgis.test_http_download
+    # for specific test
+    python -m unittest tests.qgis.test_http_download.TestHttpDownload.test_conditional_download
+"""
+
+# standard library
+
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# PyQGIS
+from qgis.testing import unittest
+
+from menu_from_project.logic.http_download import (
+    DownloadManager,
+    conditional_download,
+    get_last_validation,
+    get_validators_path,
+    read_validators,
+)
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class ProjectRequestHandler(BaseHTTPRequestHandler):
+    """Serve a fixed content with an ETag, answer 304 if ETag matches"""
+
+    content = b"<qgis/>"
+    etag = '"v1"'
+    statuses = []
+
+    def do_GET(self):
+        if self.path == "/moved.qgs":
+            self.statuses.append(302)
+            self.send_response(302)
+            self.send_header("Location", "/project.qgs")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.path == "/accepted.qgs":
+            self.statuses.append(202)
+            self.send_response(202)
+            self.send_header("ETag", '"accepted"')
+            self.send_header("Content-Length", "8")
+            self.end_headers()
+            self.wfile.write(b"accepted")
+            return
+        if self.headers.get("If-None-Match") == self.etag:
+            self.statuses.append(304)
+            self.send_response(304)
+            self.send_header("ETag", self.etag)
+            self.end_headers()
+            return
+        self.statuses.append(200)
+        self.send_response(200)
+        self.send_header("ETag", self.etag)
+        self.send_header("Last-Modified", "Wed, 21 Oct 2026 07:28:00 GMT")
+        self.send_header("Content-Length", str(len(self.content)))
+        self.end_headers()
+        self.wfile.write(self.content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestHttpDownload(unittest.TestCase):
+    def setUp(self):
+        ProjectRequestHandler.statuses = []
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), ProjectRequestHandler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}/project.qgs"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_conditional_download(self):
+        """Local copy is kept when server answers 304"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filepath = Path(tmp_dir) / "project.qgs"
+
+            self.assertTrue(conditional_download(self.url, filepath))
+            self.assertEqual(filepath.read_bytes(), b"<qgis/>")
+            self.assertTrue(get_validators_path(filepath).exists())
+            self.assertEqual(read_validators(filepath)["etag"], '"v1"')
+
+            for path in (filepath, get_validators_path(filepath)):
+                os.utime(path, (0, 0))
+            self.assertFalse(conditional_download(self.url, filepath))
+            self.assertEqual(filepath.read_bytes(), b"<qgis/>")
+            # Revalidation is recorded
+            self.assertGreater(get_last_validation(filepath), 0)
+
+            # Validators are ignored if local copy was removed
+            filepath.unlink()
+            self.assertTrue(conditional_download(self.url, filepath))
+
+        self.assertEqual(ProjectRequestHandler.statuses, [200, 304, 200])
+
+    def test_redirect_and_unexpected_status(self):
+        """Redirects are followed, local copy is kept on other statuses than 200"""
+        base_url = self.url.rsplit("/", 1)[0]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filepath = Path(tmp_dir) / "project.qgs"
+
+            self.assertTrue(conditional_download(f"{base_url}/moved.qgs", filepath))
+            self.assertEqual(filepath.read_bytes(), b"<qgis/>")
+
+            self.assertFalse(conditional_download(f"{base_url}/accepted.qgs", filepath))
+            self.assertEqual(filepath.read_bytes(), b"<qgis/>")
+            self.assertEqual(read_validators(filepath)["etag"], '"v1"')
+
+        self.assertEqual(ProjectRequestHandler.statuses, [302, 200, 202])
+
+    def test_download_manager(self):
+        """Many downloads are run with a single wait"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            download_manager = DownloadManager(max_connections_per_host=2)
+            progress = []
+            download_manager.progress.connect(
+                lambda nb_finished, nb_downloads: progress.append(nb_finished)
+            )
+            downloads = [
+                download_manager.add(self.url, Path(tmp_dir) / f"project_{i}.qgs")
+                for i in range(5)
+            ]
+            download_manager.wait()
+
+            for download in downloads:
+                self.assertTrue(download.finished)
+                self.assertTrue(download.modified)
+                self.assertEqual(download.filepath.read_bytes(), b"<qgis/>")
+        self.assertEqual(progress, [1, 2, 3, 4, 5])
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
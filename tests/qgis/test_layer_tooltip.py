@@ -0,0 +1,107 @@
+"""
+Usage from the repo root folder:
+
+.. code-block:: bash
+
+    # for whole tests
+    python -m unittest tests.qgis.test_layer_tooltip
+    # for specific test
+    python -m unittest tests.qgis.test_layer_tooltip.TestLayerTooltip.test_source_priority
+"""
+
+# standard library
+
+from dataclasses import replace
+
+# PyQGIS
+from qgis.testing import unittest
+
+from menu_from_project.datamodel.project_config import LazyMenuGroupConfig
+from menu_from_project.logic.layer_tooltip import (
+    SOURCE_MD_LAYER,
+    SOURCE_MD_NOTE,
+    SOURCE_MD_OGC,
+    get_layer_tooltip,
+    resolve_group_tooltips,
+    resolve_layer_tooltip,
+)
+from menu_from_project.toolbelt.preferences import PlgSettingsStructure
+from scripts.benchmark_group_index import create_flat_group
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class TestLayerTooltip(unittest.TestCase):
+    def setUp(self):
+        self.group = create_flat_group(nb_layers=4, nb_versions=1)
+        self.layer = replace(
+            self.group.childs[0],
+            title="OGC title",
+            abstract="",
+            metadata_title="Layer title",
+            metadata_abstract="Layer abstract",
+            layer_notes="Notes",
+        )
+        self.group.childs[0] = self.layer
+
+    def test_source_priority(self):
+        """First available title and abstract are used, by source priority"""
+        resolved = resolve_layer_tooltip(
+            self.layer, [SOURCE_MD_OGC, SOURCE_MD_LAYER, SOURCE_MD_NOTE]
+        )
+        self.assertEqual(resolved.title, "OGC title")
+        self.assertEqual(resolved.abstract, "Layer abstract")
+        self.assertEqual(resolved.tooltip, "<b>OGC title</b><br/>Layer abstract")
+
+        resolved = resolve_layer_tooltip(self.layer, [SOURCE_MD_NOTE, SOURCE_MD_OGC])
+        self.assertEqual(resolved.tooltip, "<b>OGC title</b><br/>Notes")
+
+        resolved = resolve_layer_tooltip(self.group.childs[1], [SOURCE_MD_OGC])
+        self.assertEqual(resolved.tooltip, "")
+
+    def test_resolved_once(self):
+        """Resolved tooltip is kept until metadata sources change"""
+        settings = PlgSettingsStructure()
+        resolve_group_tooltips(self.group, settings.optionSourceMD)
+        resolved = self.layer.resolved_tooltip
+
+        self.assertIsNotNone(resolved)
+        self.assertIs(
+            get_layer_tooltip(self.layer, tuple(settings.optionSourceMD)), resolved
+        )
+        self.assertEqual(settings.tooltip_for_layer(self.layer), resolved.tooltip)
+        # Not part of layer configuration
+        self.assertEqual(self.layer, replace(self.layer))
+
+        settings.optionSourceMD = [SOURCE_MD_NOTE, SOURCE_MD_OGC, SOURCE_MD_LAYER]
+        self.assertEqual(
+            settings.tooltip_for_layer(self.layer), "<b>OGC title</b><br/>Notes"
+        )
+        self.assertIsNot(self.layer.resolved_tooltip, resolved)
+
+    def test_lazy_group(self):
+        """Childs of lazy groups not decoded are not resolved"""
+        layers = list(self.group.childs)
+        lazy_group = LazyMenuGroupConfig(
+            name="lazy",
+            filename="",
+            embedded=False,
+            source=layers[2:],
+            decode_childs=list,
+        )
+        self.group.childs = [*layers[:2], lazy_group]
+
+        resolve_group_tooltips(self.group, [SOURCE_MD_OGC])
+
+        self.assertFalse(lazy_group.loaded)
+        self.assertIsNotNone(layers[1].resolved_tooltip)
+        self.assertIsNone(layers[2].resolved_tooltip)
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+"""
+Usage from the repo root folder:
+
+.. code-block:: bash
+
+    # for whole tests
+    python -m unittest tests.qgis.test_legacy_unzip
+    # for specific test
+    python -m unittest tests.qgis.test_legacy_unzip.TestLegacyUnzip.test_clean
+"""
+
+# standard library
+
+import os
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
+
+# PyQGIS
+from qgis.PyQt.QtCore import QCoreApplication, QDir
+from qgis.testing import unittest
+
+from menu_from_project.logic.qgs_manager import clean_legacy_unzip_folders
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class TestLegacyUnzip(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.temp_path_patch = mock.patch.object(
+            QDir, "tempPath", return_value=self.tmp_dir.name
+        )
+        self.temp_path_patch.start()
+        self.app_name_patch = mock.patch.object(
+            QCoreApplication, "applicationName", return_value="QGIS3"
+        )
+        self.app_name_patch.start()
+
+    def tearDown(self):
+        self.app_name_patch.stop()
+        self.temp_path_patch.stop()
+        self.tmp_dir.cleanup()
+
+    def _create_folder(self, name: str, filenames, age_days: int = 2) -> Path:
+        path = Path(self.tmp_dir.name) / name
+        path.mkdir()
+        for filename in filenames:
+            (path / filename).write_text("content")
+        mtime = time.time() - age_days * 86400
+        os.utime(path, (mtime, mtime))
+        return path
+
+    def test_clean(self):
+        """Only old folders with extracted project files are removed"""
+        legacy = self._create_folder("QGIS3-aB12cD", ["project.qgs", "project.qgd"])
+        recent = self._create_folder("QGIS3-eF34gH", ["project.qgs"], age_days=0)
+        locked = self._create_folder(
+            "QGIS3-iJ56kL", ["project.qgs", "project.qgd", "project.qgd-journal"]
+        )
+        no_project = self._create_folder("QGIS3-mN78oP", ["data.db"])
+        other_name = self._create_folder("other-qR90sT", ["project.qgs"])
+
+        self.assertEqual(clean_legacy_unzip_folders(), 1)
+
+        self.assertFalse(legacy.exists())
+        for path in (recent, locked, no_project, other_name):
+            self.assertTrue(path.exists(), path.name)
+
+    def test_excluded_dirs(self):
+        """Folder of the open project is kept"""
+        open_project = self._create_folder(
+            "QGIS3-aB12cD", ["project.qgs", "project.qgd"]
+        )
+        legacy = self._create_folder("QGIS3-eF34gH", ["project.qgs"])
+
+        removed = clean_legacy_unzip_folders(excluded_dirs=[open_project])
+
+        self.assertEqual(removed, 1)
+        self.assertTrue((open_project / "project.qgd").exists())
+        self.assertFalse(legacy.exists())
+
+    def test_project_file_removed_last(self):
+        """Project file is kept if another file of the folder can't be removed"""
+        path = self._create_folder("QGIS3-aB12cD", ["project.qgs", "project.qgd"])
+        unlink = Path.unlink
+
+        def unlink_in_use(child: Path, *args, **kwargs):
+            if child.suffix == ".qgd":
+                raise PermissionError("file in use")
+            unlink(child, *args, **kwargs)
+
+        with mock.patch.object(Path, "unlink", unlink_in_use):
+            self.assertEqual(clean_legacy_unzip_folders(), 0)
+
+        self.assertTrue((path / "project.qgs").exists())
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
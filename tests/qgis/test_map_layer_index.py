@@ -0,0 +1,89 @@
+"""
+Usage from the repo root folder:
+
+.. code-block:: bash
+
+    # for whole tests
+    python -m unittest tests.qgis.test_map_layer_index
+    # for specific test
+    python -m unittest tests.qgis.test_map_layer_index.TestMapLayerIndex.test_lookup
+"""
+
+# standard library
+
+from pathlib import Path
+
+# PyQGIS
+from qgis.PyQt import QtXml
+from qgis.testing import unittest
+
+from menu_from_project.logic.qgs_manager import QgsDomManager, create_map_layer_dict
+
+# ############################################################################
+# ########## Globals #############
+# ################################
+
+PROJECT_FILENAME = str(Path(__file__).parent / ".." / "projects" / "aeag-tiny.qgz")
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class TestMapLayerIndex(unittest.TestCase):
+    def test_lookup(self):
+        """Layer nodes of a project are found by id"""
+        qgs_dom_manager = QgsDomManager()
+
+        node = qgs_dom_manager.getMapLayerDomFromQgs(
+            PROJECT_FILENAME, "L35ecffe715c74f15bec52340aa3c9e3f"
+        )
+
+        self.assertIsNotNone(node)
+        self.assertEqual(
+            node.namedItem("layername").firstChild().toText().data(), "Cours d'eau"
+        )
+        index = qgs_dom_manager.get_map_layer_index(PROJECT_FILENAME)
+        self.assertEqual(
+            sorted(index.keys()),
+            [
+                "L35ecffe715c74f15bec52340aa3c9e3f",
+                "L8150cde67501427eade1e787479c2f70",
+                "Lbd28399787e349488c2f7bb0298b370d",
+            ],
+        )
+        # Index is built once for a cached document
+        self.assertIs(qgs_dom_manager.get_map_layer_index(PROJECT_FILENAME), index)
+
+    def test_missing_id(self):
+        """No node is returned for an unknown layer id"""
+        qgs_dom_manager = QgsDomManager()
+
+        self.assertIsNone(
+            qgs_dom_manager.getMapLayerDomFromQgs(PROJECT_FILENAME, "missing_id")
+        )
+
+    def test_duplicate_ids(self):
+        """First layer node is kept for duplicated layer ids"""
+        doc = QtXml.QDomDocument()
+        doc.setContent(
+            "<qgis><projectlayers>"
+            "<maplayer><id>layer</id><layername>first</layername></maplayer>"
+            "<maplayer><id>layer</id><layername>second</layername></maplayer>"
+            "</projectlayers></qgis>"
+        )
+
+        index = create_map_layer_dict(doc)
+
+        self.assertEqual(list(index.keys()), ["layer"])
+        self.assertEqual(
+            index["layer"].namedItem("layername").firstChild().toText().data(),
+            "first",
+        )
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+"""
+Usage from the repo root folder:
+
+.. code-block:: bash
+
+    # for whole tests
+    python -m unittest tests.qgis.test_preferences
+    # for specific test
+    python -m unittest tests.qgis.test_preferences.TestPreferences.test_settings_snapshot
+"""
+
+# standard library
+
+from dataclasses import FrozenInstanceError
+
+# PyQGIS
+from qgis.testing import unittest
+
+from menu_from_project.toolbelt.preferences import PlgOptionsManager
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class TestPreferences(unittest.TestCase):
+    def test_settings_snapshot(self):
+        """Settings snapshot is shared and can't be modified"""
+        snapshot = PlgOptionsManager.get_settings_snapshot()
+
+        self.assertIs(PlgOptionsManager.get_settings_snapshot(), snapshot)
+        self.assertIsInstance(snapshot.projects, tuple)
+        with self.assertRaises(FrozenInstanceError):
+            snapshot.optionTooltip = not snapshot.optionTooltip
+
+    def test_settings_snapshot_invalidated(self):
+        """Settings are read again after save"""
+        snapshot = PlgOptionsManager.get_settings_snapshot()
+
+        PlgOptionsManager.save_from_object(PlgOptionsManager.get_plg_settings())
+
+        self.assertIsNot(PlgOptionsManager.get_settings_snapshot(), snapshot)
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
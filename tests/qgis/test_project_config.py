@@ -0,0 +1,62 @@
+"""
+Usage from the repo root folder:
+
+.. code-block:: bash
+
+    # for whole tests
+    python -m unittest tests.qgis.test_project_config
+    # for specific test
+    python -m unittest tests.qgis.test_project_config.TestProjectConfig.test_layer_index
+"""
+
+# standard library
+
+from dataclasses import replace
+
+# PyQGIS
+from qgis.testing import unittest
+
+from scripts.benchmark_group_index import (
+    create_flat_group,
+    group_layers_by_index,
+    group_layers_by_scan,
+)
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class TestProjectConfig(unittest.TestCase):
+    def test_layer_index(self):
+        """Each layer name is displayed once, with its versions"""
+        group = create_flat_group(nb_layers=6, nb_versions=2)
+        layers = list(group.childs)
+        subgroup = replace(group, name="subgroup", childs=[])
+        other_format = replace(layers[0], format="GeoPackage")
+        group.childs = [layers[0], subgroup, *layers[1:], other_format]
+
+        self.assertEqual(group.menu_childs, [layers[0], subgroup, layers[2], layers[4]])
+        self.assertEqual(
+            group.get_layer_configs_from_name("dataset 0"),
+            [layers[0], layers[1], other_format],
+        )
+        self.assertEqual(group.get_layer_configs_from_name("missing"), [])
+        self.assertEqual(
+            group.layer_versions["dataset 0"],
+            {"v0": [layers[0], other_format], "v1": [layers[1]]},
+        )
+
+    def test_flat_group(self):
+        """Layer index gives the same grouping than childs scan"""
+        group = create_flat_group(nb_layers=300, nb_versions=3)
+        group.childs.append(replace(group.childs[0], name="single"))
+
+        self.assertEqual(group_layers_by_index(group), group_layers_by_scan(group))
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+"""
+Usage from the repo root folder:
+
+.. code-block:: bash
+
+    # for whole tests
+    python -m unittest tests.qgis.test_project_stream_read
+    # for specific test
+    python -m unittest tests.qgis.test_project_stream_read.TestProjectStreamRead.test_verify_read_engines
+"""
+
+# standard library
+
+from pathlib import Path
+
+# PyQGIS
+from qgis.testing import unittest
+
+from menu_from_project.datamodel.project import Project
+from menu_from_project.logic.project_stream_read import (
+    READ_ENGINE_DOM,
+    READ_ENGINE_STREAM,
+    read_project_menu_config,
+    scan_project,
+    verify_read_engines,
+)
+from menu_from_project.logic.qgs_manager import QgsDomManager
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+PROJECTS_DIR = Path(__file__).parent / ".." / "projects"
+
+
+class TestProjectStreamRead(unittest.TestCase):
+    def _corpus(self):
+        return [
+            Project(
+                name="",
+                location="layer",
+                file=str(filename),
+                type_storage="file",
+                id=filename.stem,
+            )
+            for filename in sorted(PROJECTS_DIR.glob("*.qgz"))
+        ]
+
+    def test_scan_project(self):
+        """Scan a sample project and check kept informations"""
+        scan = scan_project(str(PROJECTS_DIR / "aeag-tiny.qgz"))
+
+        self.assertEqual(scan.title, "")
+        self.assertFalse(scan.absolute)
+        self.assertEqual(len(scan.maplayers), 3)
+        self.assertEqual(
+            scan.maplayers["L8150cde67501427eade1e787479c2f70"].provider, "WFS"
+        )
+        self.assertEqual(
+            len(list(scan.layer_tree.iter("layer-tree-layer"))),
+            3,
+        )
+
+    def test_verify_read_engines(self):
+        """QDom and streaming engines give same configuration on test projects"""
+        differences = verify_read_engines(self._corpus(), QgsDomManager())
+
+        self.assertTrue(len(differences) > 0)
+        for uri, project_differences in differences.items():
+            self.assertEqual(project_differences, [], uri)
+
+    def test_read_engines(self):
+        """Read engine can be selected"""
+        for project in self._corpus():
+            dom_config = read_project_menu_config(
+                project, QgsDomManager(), READ_ENGINE_DOM
+            )
+            stream_config = read_project_menu_config(
+                project, QgsDomManager(), READ_ENGINE_STREAM
+            )
+            self.assertIsNotNone(stream_config)
+            self.assertEqual(dom_config, stream_config)
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+"""
+Usage from the repo root folder:
+
+.. code-block:: bash
+
+    # for whole tests
+    python -m unittest tests.qgis.test_project_tooltip
+    # for specific test
+    python -m unittest tests.qgis.test_project_tooltip.TestProjectTooltip.test_source_md
+"""
+
+# standard library
+
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+from unittest import mock
+
+# PyQGIS
+from qgis.core import QgsApplication
+from qgis.testing import unittest
+
+from menu_from_project.datamodel.project import Project, ProjectCacheConfig
+from menu_from_project.datamodel.project_config import MenuLayerConfig
+from menu_from_project.menu_from_project import MenuFromProject
+from menu_from_project.toolbelt.preferences import (
+    SOURCE_MD_LAYER,
+    SOURCE_MD_NOTE,
+    SOURCE_MD_OGC,
+    PlgSettingsStructure,
+)
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class TestProjectTooltip(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.settings_dir_patch = mock.patch.object(
+            QgsApplication, "qgisSettingsDirPath", return_value=self.tmp_dir.name
+        )
+        self.settings_dir_patch.start()
+        filename = str(Path(__file__).parent / ".." / "projects" / "aeag-tiny.qgz")
+        self.project = Project(
+            name="test_tooltip",
+            location="layer",
+            file=filename,
+            type_storage="file",
+            id="unique_id",
+            cache_config=ProjectCacheConfig(enable=False),
+        )
+
+    def tearDown(self):
+        self.settings_dir_patch.stop()
+        self.tmp_dir.cleanup()
+
+    def _load_layers(
+        self, option_tooltip: bool, source_md: List[str]
+    ) -> Dict[str, MenuLayerConfig]:
+        """Load the project configuration as menus do, return layers by name"""
+        settings = PlgSettingsStructure(
+            projects=[self.project],
+            optionTooltip=option_tooltip,
+            optionSourceMD=source_md,
+        )
+        task = mock.Mock()
+        task.isCanceled.return_value = False
+
+        # Plugin state is not used to load projects
+        plugin = MenuFromProject.__new__(MenuFromProject)
+        result = plugin.load_all_project_config(task, settings)
+
+        self.assertEqual(len(result), 1)
+        _, project_config = result[0]
+        return {layer.name: layer for layer in project_config.root_group.childs}
+
+    def test_tooltip_disabled(self):
+        """Tooltips are not resolved when they are not displayed"""
+        layers = self._load_layers(False, [SOURCE_MD_OGC, SOURCE_MD_LAYER])
+
+        self.assertEqual(len(layers), 3)
+        for layer in layers.values():
+            self.assertIsNone(layer.resolved_tooltip, layer.name)
+
+    def test_source_md(self):
+        """Tooltips are resolved at load for metadata sources order"""
+        source_md = [SOURCE_MD_OGC, SOURCE_MD_LAYER, SOURCE_MD_NOTE]
+        layers = self._load_layers(True, source_md)
+
+        # OGC metadata available
+        stations = layers["Sites de mesure qualité (cours d'eau)"]
+        self.assertEqual(stations.resolved_tooltip.source_md, tuple(source_md))
+        self.assertEqual(
+            stations.resolved_tooltip.tooltip,
+            f"<b>{stations.title}</b><br/>{stations.abstract}",
+        )
+        # Only layer metadata available
+        rivers = layers["Cours d'eau"]
+        self.assertEqual(rivers.title, "")
+        self.assertEqual(
+            rivers.resolved_tooltip.tooltip,
+            f"<b>{rivers.metadata_title}</b><br/>{rivers.metadata_abstract}",
+        )
+
+        # Settings return the resolved tooltip
+        settings = PlgSettingsStructure(optionTooltip=True, optionSourceMD=source_md)
+        self.assertEqual(
+            settings.tooltip_for_layer(rivers), rivers.resolved_tooltip.tooltip
+        )
+
+    def test_source_md_order(self):
+        """Notes are used first when they have priority"""
+        source_md = [SOURCE_MD_NOTE, SOURCE_MD_LAYER, SOURCE_MD_OGC]
+        layers = self._load_layers(True, source_md)
+
+        stations = layers["Sites de mesure qualité (cours d'eau)"]
+        self.assertNotEqual(stations.layer_notes, "")
+        self.assertEqual(
+            stations.resolved_tooltip.tooltip,
+            f"<b>{stations.metadata_title}</b><br/>{stations.layer_notes}",
+        )
+        rivers = layers["Cours d'eau"]
+        self.assertEqual(
+            rivers.resolved_tooltip.tooltip,
+            f"<b>{rivers.metadata_title}</b><br/>{rivers.metadata_abstract}",
+        )
+
+    def test_missing_source_md(self):
+        """Tooltip is empty when metadata sources are not available"""
+        layers = self._load_layers(True, [SOURCE_MD_OGC])
+
+        stations = layers["Sites de mesure qualité (cours d'eau)"]
+        self.assertEqual(
+            stations.resolved_tooltip.tooltip,
+            f"<b>{stations.title}</b><br/>{stations.abstract}",
+        )
+        self.assertEqual(layers["Cours d'eau"].resolved_tooltip.tooltip, "")
+        self.assertEqual(layers["Bassin Hydrographique"].resolved_tooltip.tooltip, "")
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+"""
+Usage from the repo root folder:
+
+.. code-block:: bash
+
+    # for whole tests
+    python -m unittest tests.qgis.test_settings_changes
+    # for specific test
+    python -m unittest tests.qgis.test_settings_changes.TestSettingsChanges.test_project_changes
+"""
+
+# standard library
+
+from dataclasses import replace
+
+# PyQGIS
+from qgis.testing import unittest
+
+from menu_from_project.datamodel.project import Project
+from menu_from_project.logic.settings_changes import get_settings_changes
+from menu_from_project.toolbelt.preferences import (
+    PlgSettingsSnapshot,
+    PlgSettingsStructure,
+)
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class TestSettingsChanges(unittest.TestCase):
+    def setUp(self):
+        self.projects = [
+            Project(
+                id=f"project_{i}",
+                name=f"project {i}",
+                location="new",
+                file=f"/data/project_{i}.qgz",
+                type_storage="file",
+            )
+            for i in range(3)
+        ]
+        self.settings = PlgSettingsStructure(projects=self.projects)
+
+    def _changes(self, **kwargs):
+        return get_settings_changes(
+            PlgSettingsSnapshot(self.settings),
+            PlgSettingsSnapshot(replace(self.settings, **kwargs)),
+        )
+
+    def test_no_change(self):
+        """Project comment doesn't change menus"""
+        projects = list(self.projects)
+        projects[0] = replace(projects[0], comment="new comment")
+
+        changes = self._changes(projects=projects, optionCreateGroup=True)
+
+        self.assertFalse(changes.reload_all)
+        self.assertFalse(changes.rebuild_menus)
+        self.assertEqual(changes.reload_projects, [])
+
+    def test_display_change(self):
+        """Display options rebuild menus without reloading projects"""
+        changes = self._changes(optionTooltip=not self.settings.optionTooltip)
+
+        self.assertTrue(changes.display)
+        self.assertFalse(changes.locations)
+        self.assertEqual(changes.reload_projects, [])
+
+    def test_tooltip_changes(self):
+        """Layer tooltips are resolved again only if displayed with other sources"""
+        source_md = list(reversed(self.settings.optionSourceMD))
+
+        self.assertFalse(self._changes(optionSourceMD=source_md).tooltips)
+        self.settings.optionTooltip = True
+        changes = self._changes(optionSourceMD=source_md)
+        self.assertTrue(changes.tooltips)
+        self.assertTrue(changes.rebuild_menus)
+        self.assertFalse(self._changes(optionLoadAll=True).tooltips)
+
+    def test_project_changes(self):
+        """Only projects with another source are reloaded"""
+        projects = list(self.projects)
+        projects[0] = replace(projects[0], file="/data/other.qgz")
+        projects[1] = replace(projects[1], location="layer")
+        new_project = replace(projects[2], id="new_project")
+        projects.append(new_project)
+
+        changes = self._changes(projects=projects)
+
+        self.assertFalse(changes.display)
+        self.assertTrue(changes.locations)
+        self.assertEqual(changes.reload_projects, [projects[0], new_project])
+        self.assertEqual(changes.source_projects, [projects[0]])
+
+    def test_rename(self):
+        """Renamed projects are not reloaded, unless named from project file"""
+        projects = list(self.projects)
+        projects[0] = replace(projects[0], name="renamed")
+        projects[1] = replace(projects[1], name="")
+
+        changes = self._changes(projects=projects)
+
+        self.assertTrue(changes.renamed)
+        self.assertFalse(changes.rebuild_menus)
+        self.assertEqual(changes.reload_projects, [projects[1]])
+        self.assertEqual(changes.source_projects, [projects[1]])
+
+    def test_reload_all(self):
+        """Project read engine change reloads all projects"""
+        changes = self._changes(project_read_engine="dom")
+
+        self.assertTrue(changes.reload_all)
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+"""
+Usage from the repo root folder:
+
+.. code-block:: bash
+
+    # for whole tests
+    python -m unittest tests.qgis.test_time_sliced_runner
+    # for specific test
+    python -m unittest tests.qgis.test_time_sliced_runner.TestTimeSlicedRunner.test_slices
+"""
+
+# standard library
+import time
+from typing import Iterator, List
+
+# PyQGIS
+from qgis.PyQt.QtCore import QCoreApplication
+from qgis.testing import unittest
+
+from menu_from_project.logic.time_sliced_runner import TimeSlicedRunner
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class TestTimeSlicedRunner(unittest.TestCase):
+    def _steps(self, done: List[int], nb_steps: int, duration: float) -> Iterator:
+        for i in range(nb_steps):
+            time.sleep(duration)
+            done.append(i)
+            yield
+
+    def _wait(self, runner: TimeSlicedRunner) -> None:
+        timeout = time.perf_counter() + 5
+        while runner.is_running() and time.perf_counter() < timeout:
+            QCoreApplication.processEvents()
+
+    def test_no_budget(self):
+        """All steps are run at once without time budget"""
+        done = []
+        finished = []
+        runner = TimeSlicedRunner(self._steps(done, 10, 0.001), 0)
+        runner.finished.connect(lambda: finished.append(True))
+
+        runner.start()
+
+        self.assertEqual(done, list(range(10)))
+        self.assertFalse(runner.is_running())
+        self.assertEqual(finished, [True])
+
+    def test_slices(self):
+        """Steps over time budget are run in next event loop iterations"""
+        done = []
+        finished = []
+        runner = TimeSlicedRunner(self._steps(done, 20, 0.005), 10)
+        runner.finished.connect(lambda: finished.append(True))
+
+        runner.start()
+
+        self.assertLess(len(done), 20)
+        self.assertTrue(runner.is_running())
+        self.assertEqual(finished, [])
+
+        self._wait(runner)
+        self.assertEqual(done, list(range(20)))
+        self.assertEqual(finished, [True])
+
+    def test_add_steps(self):
+        """Added steps are run after remaining steps"""
+        done = []
+        runner = TimeSlicedRunner(self._steps(done, 5, 0.005), 1)
+        runner.start()
+        runner.add_steps(self._steps(done, 5, 0.0))
+
+        self._wait(runner)
+        self.assertEqual(done, [*range(5), *range(5)])
+
+    def test_cancel(self):
+        """Remaining steps are not run once canceled"""
+        done = []
+        finished = []
+        runner = TimeSlicedRunner(self._steps(done, 20, 0.005), 1)
+        runner.finished.connect(lambda: finished.append(True))
+        runner.start()
+
+        runner.cancel()
+        nb_done = len(done)
+        for _ in range(10):
+            QCoreApplication.processEvents()
+
+        self.assertEqual(len(done), nb_done)
+        self.assertFalse(runner.is_running())
+        self.assertEqual(finished, [])
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()